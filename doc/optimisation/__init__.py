@@ -0,0 +1,39 @@
+"""
+Optimisation de la production agroalimentaire par programmation linéaire.
+
+Paquet importable regroupant les objets métier, la construction du modèle PuLP
+et les outils de résolution non interactifs utilisés par le script "Algo v2.py".
+
+Les noms ci-dessous sont chargés à la première utilisation : importer le paquet ne charge
+ni PuLP ni le solveur, qui ne le sont qu'au moment de construire ou de résoudre un modèle.
+"""
+from importlib import import_module
+
+# Nom exporté et module qui le définit
+_EXPORTS = {
+    "Produit": "domaine", "Machine": "domaine", "Carcasse": "domaine", "Bobine": "domaine",
+    "DonneesUsine": "donnees", "donnees_reference": "donnees",
+    "Chronometre": "mesures", "Mesures": "mesures", "RapportResolution": "mesures",
+    "Modele": "modele", "construire_probleme": "modele", "extraire_resultats": "modele",
+    "resoudre_scenario": "modele",
+    "ModeleParametrique": "parametrique",
+    "StrategieResolution": "solveurs", "creer_solveur": "solveurs", "solveurs_disponibles": "solveurs",
+    "ModeleMultiPeriode": "multiperiode", "planifier": "multiperiode", "planifier_glissant": "multiperiode",
+    "ModeleStochastique": "stochastique", "resoudre_saa": "stochastique",
+    "SessionOptimisation": "session",
+    "FrontierePareto": "pareto", "surface_pareto": "pareto",
+    "analyser_sensibilite": "sensibilite",
+    "diagnostiquer": "diagnostic", "contraintes_incompatibles": "diagnostic", "relaxation_elastique": "diagnostic",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(nom):
+    if nom not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {nom!r}")
+    valeur = getattr(import_module(f".{_EXPORTS[nom]}", __name__), nom)
+    globals()[nom] = valeur
+    return valeur
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
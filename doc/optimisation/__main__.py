@@ -0,0 +1,92 @@
+"""
+Point d'entrée en ligne de commande du paquet.
+
+Utilisation :
+    python -m optimisation                          saisie interactive (comme "Algo v2.py")
+    python -m optimisation resoudre scenario.json   résolution d'un scénario, résultats en JSON
+    python -m optimisation lot scenarios.csv ...    résolution par lot (voir scenarios.py)
+    python -m optimisation benchmark ...            mesures de performances (voir benchmark.py)
+    python -m optimisation service --port 8080      service HTTP/JSON (voir service.py)
+    python -m optimisation stochastique ...         demande incertaine, SAA et CVaR (voir stochastique.py)
+    python -m optimisation pareto ...               frontière bénéfice / pertes / effectif (voir pareto.py)
+    python -m optimisation diagnostic scenario.json infaisabilité et dégénérescence (voir diagnostic.py)
+    python -m optimisation binaire entree.csv s.npy conversion au format binaire (voir binaire.py)
+    python -m optimisation sensibilite scenario.json valeurs duales et intervalles (voir sensibilite.py)
+
+Chaque commande n'importe que les modules dont elle a besoin.
+"""
+import argparse
+import json
+import sys
+
+# Commande, module et description
+COMMANDES = {
+    "interactif": ("interactif", "Saisie d'un scénario au clavier puis résolution"),
+    "resoudre": (None, "Résolution d'un scénario décrit dans un fichier JSON"),
+    "lot": ("scenarios", "Résolution par lot d'un fichier de scénarios"),
+    "benchmark": ("benchmark", "Mesure des performances du modèle"),
+    "service": ("service", "Service HTTP/JSON de résolution"),
+    "stochastique": ("stochastique", "Résolution à deux étapes sur l'incertitude de la demande"),
+    "pareto": ("pareto", "Frontière de Pareto entre bénéfice, pertes et effectif"),
+    "diagnostic": ("diagnostic", "Diagnostic d'infaisabilité et de dégénérescence d'un scénario"),
+    "binaire": ("binaire", "Conversion d'un fichier de scénarios au format binaire"),
+    "sensibilite": ("sensibilite", "Valeurs duales, coûts réduits et intervalles de validité d'un scénario"),
+}
+
+def resoudre(arguments=None):
+    """
+    Résout un scénario donné en JSON (à plat ou par sections, voir scenarios.py) et affiche
+    ses résultats en JSON. Sans fichier, le scénario par défaut est résolu.
+    """
+    from .solveurs import MODES
+    parser = argparse.ArgumentParser(prog="python -m optimisation resoudre", description=COMMANDES["resoudre"][1])
+    parser.add_argument("scenario", nargs="?", help="Fichier JSON du scénario (- pour l'entrée standard)")
+    parser.add_argument("--solveur", default="cbc", help="Solveur : cbc, highs, glpk ou nom d'un solveur PuLP installé")
+    parser.add_argument("--threads", type=int, help="Nombre de threads du solveur")
+    parser.add_argument("--delai", type=float, help="Temps de résolution maximal, en secondes")
+    parser.add_argument("--ecart", type=float, help="Écart relatif d'optimalité accepté par le solveur")
+    parser.add_argument("--mode", choices=MODES, default="exact", help="Résolution exacte ou rapide (relaxation arrondie)")
+    args = parser.parse_args(arguments)
+
+    from .scenarios import normaliser_scenario
+    if args.scenario is None:
+        donnees = {}
+    elif args.scenario == "-":
+        donnees = json.load(sys.stdin)
+    else:
+        with open(args.scenario, encoding="utf-8") as f:
+            donnees = json.load(f)
+    try:
+        scenario = normaliser_scenario(donnees)
+    except ValueError as erreur:
+        parser.error(str(erreur))
+
+    from .modele import resoudre_scenario
+    from .solveurs import StrategieResolution
+    try:
+        strategie = StrategieResolution.depuis_nom(args.solveur, args.threads, args.delai, args.ecart, args.mode)
+    except ValueError as erreur:
+        parser.error(str(erreur))
+    resultats = resoudre_scenario(scenario, strategie)
+    print(json.dumps({"id": scenario["id"], **resultats}, ensure_ascii=False, indent=2))
+
+def main(arguments=None):
+    arguments = sys.argv[1:] if arguments is None else list(arguments)
+    if not arguments or arguments[0] not in COMMANDES:
+        if arguments and arguments[0] in ("-h", "--help"):
+            print(__doc__.strip())
+            return
+        if arguments:
+            print(f"Commande inconnue : {arguments[0]} (commandes : {', '.join(COMMANDES)})", file=sys.stderr)
+            sys.exit(2)
+        arguments = ["interactif"]
+    commande, reste = arguments[0], arguments[1:]
+    module = COMMANDES[commande][0]
+    if module is None:
+        resoudre(reste)
+    else:
+        from importlib import import_module
+        import_module(f".{module}", __package__).main(reste)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""
+Mesure des performances du modèle de bénéfice selon sa taille.
+
+Chaque mesure sépare :
+- la construction du modèle (variables, expressions, contraintes) ;
+- l'écriture puis la relecture du fichier MPS échangé avec le solveur ;
+- la résolution par CBC (écriture du fichier, exécution et lecture de la solution comprises) ;
+- la lecture des résultats ;
+ainsi que la mémoire résidente maximale du processus Python et du solveur. Sous Linux, celle du
+solveur est une borne supérieure : le processus du solveur hérite du maximum atteint par le processus
+Python au moment où il est lancé.
+
+Les instances sont générées à partir de l'usine de référence (cinq produits, trois carcasses,
+deux bobines, quatre machines) : les produits sont dupliqués avec des recettes, charges, prix et
+demandes légèrement perturbés, et répartis en groupes disposant chacun de leurs propres carcasses,
+bobines et matières. Les machines restent communes à tous les groupes.
+
+Chaque instance est mesurée dans un processus neuf pour que la mémoire maximale lui soit propre.
+Les mesures sont écrites en JSON lines et peuvent être comparées à celles d'une version précédente.
+Avec plusieurs modes de résolution (voir solveurs.py), chaque instance est résolue dans chaque mode
+et le temps et le bénéfice de chaque mode sont comparés à ceux du premier (programme complet).
+
+Utilisation :
+    python -m optimisation.benchmark --produits 5 50 500 5000 -o mesures.jsonl
+    python -m optimisation.benchmark --produits 5 50 500 --reference mesures.jsonl
+    python -m optimisation.benchmark --produits 50 500 --modes exact etages --delai 60
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+
+from .domaine import SALAIRES_DEFAUT, PRIX_VENTE_DEFAUT, COUTS_MATIERES_DEFAUT, NB_COMMERCIAUX_DEFAUT
+from .donnees import DonneesUsine, donnees_reference
+from .modele import VERSION_MODELE
+from .solveurs import MODES
+
+# Phases chronométrées, dans l'ordre d'exécution
+PHASES = ("construction", "ecriture_mps", "lecture_mps", "resolution", "extraction")
+
+def donnees_synthetiques(nb_produits, nb_groupes=1, dispersion=0.1, graine=0):
+    """
+    Génère une usine de taille quelconque à partir de l'usine de référence, et le scénario associé.
+    Le produit j reprend le produit de référence j modulo 5 et appartient au groupe j modulo nb_groupes.
+    Args:
+        nb_produits (int): Nombre de produits.
+        nb_groupes (int): Nombre de groupes de carcasses, bobines et matières.
+        dispersion (float): Amplitude relative des perturbations aléatoires.
+        graine (int): Graine du générateur aléatoire.
+    Returns:
+        tuple: (DonneesUsine, scénario).
+    """
+    reference = donnees_reference()
+    alea = np.random.default_rng(graine)
+    P, M = len(reference.produits), len(reference.matieres)
+    nb_groupes = max(1, min(nb_groupes, nb_produits))
+
+    indices = np.arange(nb_produits)
+    modele = (indices // nb_groupes) % P
+    groupe = indices % nb_groupes
+    copies = np.bincount(groupe * P + modele, minlength=nb_groupes * P)[groupe * P + modele]
+
+    def perturbation(*forme):
+        return 1 + dispersion * alea.uniform(-1, 1, forme)
+
+    recettes = np.zeros((nb_produits, nb_groupes * M))
+    colonnes = groupe[:, None] * M + np.arange(M)
+    recettes[indices[:, None], colonnes] = reference.recettes[modele] * perturbation(nb_produits, M)
+    charge_produits = reference.charge_produits[:, modele] * perturbation(nb_produits)
+
+    produits = [f"{reference.produits[p]}_{j}" for j, p in zip(indices, modele)]
+    sources = [f"{s}_{g}" for g in range(nb_groupes) for s in reference.sources]
+    donnees = DonneesUsine(
+        produits, sources, [f"{m}_{g}" for g in range(nb_groupes) for m in reference.matieres],
+        reference.machines,
+        reference.poids_final[modele], reference.demande_base[modele] / copies * perturbation(nb_produits),
+        np.tile(reference.poids_sources, nb_groupes), np.tile(reference.est_carcasse, nb_groupes),
+        recettes, np.kron(np.eye(nb_groupes), reference.rendements),
+        charge_produits, np.tile(reference.charge_sources, nb_groupes),
+        reference.cout_machines, reference.ouvriers_machines, reference.limite_machines * nb_groupes,
+    )
+
+    prix = np.array([PRIX_VENTE_DEFAUT[p] for p in reference.produits])[modele] * perturbation(nb_produits)
+    scenario = {
+        "id": f"synthetique_{nb_produits}_{nb_groupes}",
+        "coefficients": {p: 1.0 for p in produits},
+        "objectif": {p: 1.0 for p in produits},
+        "prix_vente": dict(zip(produits, prix.tolist())),
+        "couts_matieres": {f"{s}_{g}": COUTS_MATIERES_DEFAUT[s] for g in range(nb_groupes) for s in reference.sources},
+        "salaires": dict(SALAIRES_DEFAUT),
+        "nb_commerciaux": NB_COMMERCIAUX_DEFAUT * nb_groupes,
+    }
+    return donnees, scenario
+
+def _rss_max_ko(qui):
+    """
+    Renvoie la mémoire résidente maximale en kilo-octets (getrusage la donne en octets sous macOS).
+    """
+    rss = resource.getrusage(qui).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+def mesurer(nb_produits, nb_groupes=1, graine=0, delai=None, ecart=None, mode="exact"):
+    """
+    Mesure les phases de construction, d'entrées-sorties et de résolution d'une instance synthétique.
+    A appeler dans un processus dédié pour que la mémoire maximale mesurée soit celle de l'instance.
+    Args:
+        nb_produits (int): Nombre de produits.
+        nb_groupes (int): Nombre de groupes de carcasses et de bobines.
+        graine (int): Graine du générateur aléatoire.
+        delai (float): Temps de résolution maximal, en secondes (None pour aucun).
+        ecart (float): Écart relatif d'optimalité accepté (None pour l'optimum exact).
+        mode (str): Mode de résolution (voir solveurs.py).
+    Returns:
+        dict: Taille de l'instance, durée de chaque phase (s), mémoire maximale (ko), statut, bénéfice
+              et borne supérieure du bénéfice (modes rapide et par étages).
+    """
+    from pulp import LpProblem, PULP_CBC_CMD
+    from .modele import construire_probleme, extraire_resultats
+    from .solveurs import StrategieResolution
+
+    donnees, scenario = donnees_synthetiques(nb_produits, nb_groupes, graine=graine)
+    rss_initial = _rss_max_ko(resource.RUSAGE_SELF)
+    temps = {}
+    dossier = tempfile.mkdtemp(prefix="optimisation_benchmark_")
+    try:
+        debut = time.perf_counter()
+        modele = construire_probleme(scenario, donnees)
+        temps["construction"] = time.perf_counter() - debut
+
+        chemin = os.path.join(dossier, "modele.mps")
+        debut = time.perf_counter()
+        modele.problem.writeMPS(chemin)
+        temps["ecriture_mps"] = time.perf_counter() - debut
+        debut = time.perf_counter()
+        LpProblem.fromMPS(chemin)
+        temps["lecture_mps"] = time.perf_counter() - debut
+
+        solveur = PULP_CBC_CMD(msg=False, timeLimit=delai, gapRel=ecart)
+        solveur.tmpDir = dossier
+        strategie = StrategieResolution(solveur, mode)
+        debut = time.perf_counter()
+        strategie.resoudre(modele)
+        temps["resolution"] = time.perf_counter() - debut
+
+        debut = time.perf_counter()
+        resultats = extraire_resultats(modele)
+        temps["extraction"] = time.perf_counter() - debut
+    finally:
+        shutil.rmtree(dossier, ignore_errors=True)
+
+    problem = modele.problem
+    return {
+        "nb_produits": nb_produits,
+        "nb_groupes": nb_groupes,
+        "graine": graine,
+        "mode": mode,
+        "taille": {
+            "variables": len(problem.variables()),
+            "contraintes": len(problem.constraints),
+            "coefficients": sum(len(c) for c in problem.constraints.values()),
+        },
+        "temps": temps,
+        "memoire": {
+            "rss_initial_ko": rss_initial,
+            "rss_max_ko": _rss_max_ko(resource.RUSAGE_SELF),
+            "rss_max_solveur_ko": _rss_max_ko(resource.RUSAGE_CHILDREN),
+        },
+        "statut": resultats["statut"],
+        "benefice": resultats["benefice"],
+        "borne": strategie.derniere_borne,
+    }
+
+def executer_benchmark(tailles, nb_groupes=None, repetitions=1, delai=None, ecart=None, modes=("exact",)):
+    """
+    Mesure chaque taille d'instance, chaque répétition et chaque mode dans un processus neuf.
+    Args:
+        tailles (list): Nombres de produits à mesurer.
+        nb_groupes (int): Nombre de groupes (par défaut un groupe pour 50 produits).
+        repetitions (int): Nombre de mesures par taille (graines différentes).
+        delai (float): Temps de résolution maximal, en secondes.
+        ecart (float): Écart relatif d'optimalité accepté.
+        modes (tuple): Modes de résolution mesurés.
+    Returns:
+        generator: Mesures, complétées de l'environnement d'exécution.
+    """
+    environnement = {
+        "version_modele": VERSION_MODELE,
+        "python": platform.python_version(),
+        "plateforme": platform.platform(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    contexte = get_context("spawn")
+    for nb_produits in tailles:
+        groupes = nb_groupes or max(1, nb_produits // 50)
+        for graine in range(repetitions):
+            for mode in modes:
+                with ProcessPoolExecutor(1, mp_context=contexte) as pool:
+                    mesure = pool.submit(mesurer, nb_produits, groupes, graine, delai, ecart, mode).result()
+                yield {**environnement, **mesure}
+
+def _cle(mesure):
+    return mesure["nb_produits"], mesure["nb_groupes"], mesure.get("mode", "exact")
+
+def comparer_modes(mesures):
+    """
+    Compare chaque mode au premier mode mesuré, instance par instance (même taille et même graine).
+    Args:
+        mesures (list): Mesures de executer_benchmark.
+    Returns:
+        list: (taille, groupes, graine, mode, rapport des temps de résolution, écart relatif du
+               bénéfice à celui du mode de référence, écart relatif à la plus petite borne supérieure
+               connue de l'instance, None sans borne).
+    """
+    references, bornes, comparaisons = {}, {}, []
+    for mesure in mesures:
+        instance = (mesure["nb_produits"], mesure["nb_groupes"], mesure["graine"])
+        references.setdefault(instance, mesure)
+        # Borne supérieure : relaxation d'un mode approché ou optimum prouvé
+        for borne in (mesure.get("borne"), mesure["benefice"] if mesure["statut"] == "Optimal" else None):
+            if borne is not None:
+                bornes[instance] = min(borne, bornes.get(instance, borne))
+    for mesure in mesures:
+        instance = (mesure["nb_produits"], mesure["nb_groupes"], mesure["graine"])
+        reference = references[instance]
+        if reference is mesure or None in (mesure["benefice"], reference["benefice"]):
+            continue
+        rapport = mesure["temps"]["resolution"] / reference["temps"]["resolution"]
+        ecart = (mesure["benefice"] - reference["benefice"]) / max(1.0, abs(reference["benefice"]))
+        borne = bornes.get(instance)
+        ecart_borne = None if borne is None else (borne - mesure["benefice"]) / max(1.0, abs(borne))
+        comparaisons.append((*instance, mesure["mode"], rapport, ecart, ecart_borne))
+    return comparaisons
+
+def comparer(anciennes, nouvelles, seuil=1.25):
+    """
+    Compare deux séries de mesures instance par instance (médiane des répétitions).
+    Args:
+        anciennes (list): Mesures de la version de référence.
+        nouvelles (list): Mesures de la version courante.
+        seuil (float): Rapport nouveau / ancien au-delà duquel une phase est en régression.
+    Returns:
+        list: Régressions (taille, groupes, indicateur, ancienne valeur, nouvelle valeur, rapport).
+    """
+    def medianes(mesures):
+        par_instance = {}
+        for mesure in mesures:
+            valeurs = {**mesure["temps"], "rss_max_ko": mesure["memoire"]["rss_max_ko"]}
+            for indicateur, valeur in valeurs.items():
+                par_instance.setdefault(_cle(mesure), {}).setdefault(indicateur, []).append(valeur)
+        return {cle: {i: float(np.median(v)) for i, v in indicateurs.items()}
+                for cle, indicateurs in par_instance.items()}
+
+    avant, apres = medianes(anciennes), medianes(nouvelles)
+    regressions = []
+    for cle in sorted(avant.keys() & apres.keys()):
+        for indicateur, ancienne in avant[cle].items():
+            nouvelle = apres[cle].get(indicateur)
+            if nouvelle is not None and ancienne > 0 and nouvelle / ancienne > seuil:
+                nom = indicateur if cle[2] == "exact" else f"{indicateur} ({cle[2]})"
+                regressions.append((*cle[:2], nom, ancienne, nouvelle, nouvelle / ancienne))
+    return regressions
+
+def main(arguments=None):
+    """
+    Point d'entrée en ligne de commande des mesures de performances.
+    """
+    parser = argparse.ArgumentParser(description="Mesure des performances du modèle de bénéfice.")
+    parser.add_argument("--produits", type=int, nargs="+", default=[5, 50, 500, 5000], help="Nombres de produits des instances")
+    parser.add_argument("--groupes", type=int, help="Nombre de groupes de carcasses et de bobines (un pour 50 produits par défaut)")
+    parser.add_argument("--repetitions", type=int, default=1, help="Nombre de mesures par taille")
+    parser.add_argument("--delai", type=float, help="Temps de résolution maximal par instance, en secondes")
+    parser.add_argument("--ecart", type=float, help="Écart relatif d'optimalité accepté par le solveur")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=["exact"],
+                        help="Modes de résolution mesurés, comparés au premier")
+    parser.add_argument("-o", "--sortie", help="Fichier JSON lines des mesures, sortie standard par défaut")
+    parser.add_argument("--reference", help="Mesures d'une version précédente à comparer")
+    parser.add_argument("--seuil", type=float, default=1.25, help="Rapport de temps ou de mémoire signalé comme régression")
+    args = parser.parse_args(arguments)
+
+    fichier = open(args.sortie, "w", encoding="utf-8") if args.sortie else sys.stdout
+    mesures = []
+    try:
+        for mesure in executer_benchmark(args.produits, args.groupes, args.repetitions, args.delai, args.ecart,
+                                         args.modes):
+            mesures.append(mesure)
+            fichier.write(json.dumps(mesure, ensure_ascii=False) + "\n")
+            fichier.flush()
+    finally:
+        if fichier is not sys.stdout:
+            fichier.close()
+
+    for nb_produits, nb_groupes, graine, mode, rapport, ecart, ecart_borne in comparer_modes(mesures):
+        borne = "" if ecart_borne is None else f", à {ecart_borne:.3%} de la borne"
+        print(f"{nb_produits} produits / {nb_groupes} groupes (graine {graine}), {mode} : résolution x{rapport:.2f}, "
+              f"bénéfice {ecart:+.3%} par rapport à {args.modes[0]}{borne}", file=sys.stderr)
+
+    if args.reference:
+        with open(args.reference, encoding="utf-8") as f:
+            anciennes = [json.loads(ligne) for ligne in f if ligne.strip()]
+        regressions = comparer(anciennes, mesures, args.seuil)
+        for nb_produits, nb_groupes, indicateur, ancienne, nouvelle, rapport in regressions:
+            print(f"Régression {nb_produits} produits / {nb_groupes} groupes, {indicateur} : "
+                  f"{ancienne:.4g} -> {nouvelle:.4g} (x{rapport:.2f})", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Format binaire des scénarios et des résultats, partagé avec les outils externes.
+
+Un fichier binaire est un fichier NumPy .npy (format 1.0) contenant un tableau d'enregistrements
+de largeur fixe, en petit-boutiste : un en-tête texte décrivant les champs (longueur multiple de
+64 octets), puis les enregistrements les uns à la suite des autres, sans séparateur. N'importe quel
+outil (Java, C...) peut donc le lire ou l'écrire avec un simple tampon d'octets, sans analyse de texte,
+et Python le projette en mémoire sans copie (np.load(chemin, mmap_mode="r")).
+
+Enregistrement d'un scénario :
+- id : entier 64 bits
+- une valeur flottante 64 bits par colonne à plat du traitement par lot (coef_<Produit>,
+  objectif_<Produit> en pourcentage, prix_<Produit>, cout_<matiere>, salaire_<Categorie>,
+  nb_commerciaux) ; NaN pour garder la valeur par défaut.
+
+Enregistrement d'un résultat :
+- id : entier 64 bits
+- statut : entier 8 bits, rang du statut dans STATUTS (-1 pour un statut inconnu)
+- une valeur flottante 64 bits par colonne numérique de colonnes_resultat ; NaN sans valeur.
+Le texte d'erreur n'a pas de largeur fixe : il n'est pas conservé. Un résultat dont l'identifiant n'est
+pas entier est écrit avec l'identifiant -1, le statut "Invalide" et des valeurs NaN.
+
+Les fichiers sont écrits en continu, par lots d'enregistrements : l'en-tête réserve la place du
+nombre d'enregistrements, complété à la fermeture.
+
+Utilisation :
+    python -m optimisation.binaire scenarios.csv scenarios.npy
+    python -m optimisation lot scenarios.npy -o resultats.npy
+"""
+import argparse
+import math
+
+import numpy as np
+from numpy.lib import format as format_npy
+
+from .scenarios import (COLONNES_TEXTE, SECTIONS, TAILLE_LOT, colonnes_resultat, lire_scenarios,
+                        normaliser_scenario, scenario_par_defaut)
+
+# Statuts des résultats, dans l'ordre de leur code
+STATUTS = ("Optimal", "Realisable", "Not Solved", "Infeasible", "Unbounded", "Undefined", "Invalide", "Erreur")
+
+# Place réservée dans l'en-tête au nombre d'enregistrements (en chiffres)
+CHIFFRES_NOMBRE = 20
+
+def colonnes_scenario():
+    """
+    Returns:
+        list: Colonnes à plat d'un scénario complet, dans l'ordre des enregistrements.
+    """
+    defaut = scenario_par_defaut()
+    colonnes = [f"{prefixe}{cle}" for section, (prefixe, _) in SECTIONS.items() for cle in defaut[section]]
+    return colonnes + ["nb_commerciaux"]
+
+def type_scenarios():
+    """
+    Returns:
+        numpy.dtype: Enregistrement d'un scénario.
+    """
+    return np.dtype([("id", "<i8")] + [(c, "<f8") for c in colonnes_scenario()])
+
+def type_resultats():
+    """
+    Returns:
+        numpy.dtype: Enregistrement d'un résultat.
+    """
+    numeriques = [c for c in colonnes_resultat() if c not in COLONNES_TEXTE]
+    return np.dtype([("id", "<i8"), ("statut", "i1")] + [(c, "<f8") for c in numeriques])
+
+def _entete(type_enregistrement, nb_enregistrements):
+    """
+    En-tête .npy de longueur fixe : la place réservée au nombre d'enregistrements ne dépend pas de sa valeur.
+    """
+    description = repr({"descr": format_npy.dtype_to_descr(type_enregistrement), "fortran_order": False,
+                        "shape": (nb_enregistrements,)})
+    longueur = len(description) + CHIFFRES_NOMBRE - len(str(nb_enregistrements)) + 1
+    longueur += -(len(format_npy.MAGIC_PREFIX) + 4 + longueur) % 64
+    texte = description.ljust(longueur - 1) + "\n"
+    return format_npy.MAGIC_PREFIX + bytes([1, 0]) + len(texte).to_bytes(2, "little") + texte.encode("latin1")
+
+def ouvrir(chemin, type_attendu=None):
+    """
+    Projette un fichier binaire en mémoire, sans le lire.
+    Args:
+        chemin (str): Fichier .npy.
+        type_attendu (numpy.dtype): Type d'enregistrement attendu (aucune vérification si None).
+    Returns:
+        numpy.memmap: Enregistrements en lecture seule ; chaque champ (tableau["benefice"]) est
+                      une vue sans copie.
+    Raises:
+        ValueError: Si les enregistrements ne sont pas du type attendu.
+    """
+    tableau = np.load(chemin, mmap_mode="r")
+    if type_attendu is not None and tableau.dtype != type_attendu:
+        raise ValueError(f"{chemin} : enregistrements de type {tableau.dtype}, {type_attendu} attendu")
+    return tableau
+
+def lire_scenarios_binaires(chemin, taille_lot=TAILLE_LOT):
+    """
+    Lit un fichier binaire de scénarios par blocs d'enregistrements.
+    Args:
+        chemin (str): Fichier .npy de scénarios.
+        taille_lot (int): Nombre d'enregistrements convertis à la fois.
+    Yields:
+        dict: Lignes à plat (les valeurs NaN sont omises), à valider par normaliser_scenario.
+    """
+    tableau = ouvrir(chemin, type_scenarios())
+    noms = tableau.dtype.names
+    for debut in range(0, len(tableau), taille_lot):
+        for enregistrement in tableau[debut:debut + taille_lot].tolist():
+            yield {nom: valeur for nom, valeur in zip(noms, enregistrement) if not math.isnan(valeur)}
+
+class EcrivainEnregistrements:
+    """
+    Écrit un fichier binaire enregistrement par enregistrement, par lots de taille_lot.
+    Le fichier doit pouvoir être repositionné : l'en-tête est réécrit à la fermeture.
+    Attributs:
+        type_enregistrement (numpy.dtype): Type des enregistrements.
+        nb_lignes (int): Nombre d'enregistrements écrits.
+    """
+    def __init__(self, fichier, type_enregistrement, taille_lot=TAILLE_LOT):
+        self.fichier = fichier
+        self.type_enregistrement = type_enregistrement
+        self.lot = np.zeros(taille_lot, dtype=type_enregistrement)
+        self.nb_lot = 0
+        self.nb_lignes = 0
+        self.fichier.write(_entete(type_enregistrement, 0))
+
+    def ajouter(self, valeurs):
+        """
+        Args:
+            valeurs (tuple): Valeurs de l'enregistrement, dans l'ordre des champs.
+        """
+        self.lot[self.nb_lot] = valeurs
+        self.nb_lot += 1
+        if self.nb_lot == len(self.lot):
+            self.vider()
+
+    def vider(self):
+        self.fichier.write(self.lot[:self.nb_lot].tobytes())
+        self.nb_lignes += self.nb_lot
+        self.nb_lot = 0
+
+    def fermer(self):
+        self.vider()
+        position = self.fichier.tell()
+        self.fichier.seek(0)
+        self.fichier.write(_entete(self.type_enregistrement, self.nb_lignes))
+        self.fichier.seek(position)
+
+def _flottant(valeur):
+    return math.nan if valeur is None else float(valeur)
+
+def _identifiant(valeur):
+    try:
+        return int(valeur)
+    except (TypeError, ValueError):
+        raise ValueError(f"Identifiant non entier : {valeur!r} (le format binaire n'accepte que des entiers)") from None
+
+class EcrivainBinaire(EcrivainEnregistrements):
+    """
+    Écrit les lignes de résultat dans un fichier binaire (même interface que les écrivains de scenarios.py).
+    """
+    def __init__(self, fichier, taille_lot=TAILLE_LOT, entete=True):
+        super().__init__(fichier, type_resultats(), taille_lot)
+        self.colonnes = self.type_enregistrement.names[2:]
+
+    def ecrire(self, ligne):
+        try:
+            identifiant = _identifiant(ligne["id"])
+        except ValueError:
+            # Une erreur levée en cours de lot laisserait un fichier incomplet : la ligne est marquée invalide
+            self.ajouter((-1, STATUTS.index("Invalide"), *(math.nan for _ in self.colonnes)))
+            return
+        statut = STATUTS.index(ligne["statut"]) if ligne.get("statut") in STATUTS else -1
+        self.ajouter((identifiant, statut, *(_flottant(ligne.get(c)) for c in self.colonnes)))
+
+def ecrire_scenarios(lignes, fichier, taille_lot=TAILLE_LOT):
+    """
+    Écrit des scénarios dans un fichier binaire, après validation (toutes les valeurs sont écrites).
+    Args:
+        lignes (iterable): Lignes brutes de scénarios (voir scenarios.py).
+        fichier: Fichier binaire ouvert en écriture.
+        taille_lot (int): Nombre d'enregistrements écrits en un bloc.
+    Returns:
+        int: Nombre de scénarios écrits.
+    Raises:
+        ValueError: Si une ligne est invalide ou si son identifiant n'est pas entier.
+    """
+    ecrivain = EcrivainEnregistrements(fichier, type_scenarios(), taille_lot)
+    colonnes = colonnes_scenario()
+    for numero, donnees in enumerate(lignes):
+        try:
+            scenario = normaliser_scenario(donnees, numero)
+        except ValueError as erreur:
+            raise ValueError(f"Ligne {numero} : {erreur}") from None
+        valeurs = {"nb_commerciaux": scenario["nb_commerciaux"]}
+        for section, (prefixe, _) in SECTIONS.items():
+            for cle, valeur in scenario[section].items():
+                valeurs[f"{prefixe}{cle}"] = valeur * 100 if section == "objectif" else valeur
+        ecrivain.ajouter((_identifiant(scenario["id"]), *(valeurs[c] for c in colonnes)))
+    ecrivain.fermer()
+    return ecrivain.nb_lignes
+
+def main(arguments=None):
+    """
+    Convertit un fichier de scénarios (CSV, JSON, JSON lines, Parquet) au format binaire.
+    """
+    parser = argparse.ArgumentParser(prog="python -m optimisation binaire",
+                                     description="Conversion d'un fichier de scénarios au format binaire.")
+    parser.add_argument("entree", help="Fichier de scénarios (.csv, .json, .jsonl, .parquet)")
+    parser.add_argument("sortie", help="Fichier binaire (.npy)")
+    args = parser.parse_args(arguments)
+    try:
+        with open(args.sortie, "wb") as fichier:
+            nombre = ecrire_scenarios(lire_scenarios(args.entree), fichier)
+    except ValueError as erreur:
+        parser.error(str(erreur))
+    print(f"{nombre} scénarios écrits dans {args.sortie}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Cache persistant des résultats de résolution.
+
+Les résultats sont rangés dans une base SQLite, indexés par une empreinte canonique du scénario
+(prix, coûts, coefficients, objectifs, salaires, nombre de commerciaux), des données de l'usine,
+de la version du modèle et de la stratégie de résolution (solveur, mode, écart, temps maximal). La base peut être partagée par plusieurs processus : SQLite sérialise
+les écritures et le mode WAL laisse les lectures se faire en parallèle.
+
+Les entrées les moins récemment utilisées sont supprimées au-delà d'un nombre d'entrées
+ou d'une taille totale maximale.
+"""
+import hashlib
+import json
+import sqlite3
+import time
+
+from .modele import VERSION_MODELE
+
+# Statuts dont la valeur ne dépend pas d'une limite de temps ou d'un arrêt du solveur
+STATUTS_MEMORISES = ("Optimal", "Infeasible", "Unbounded")
+
+def _canonique(valeur):
+    """
+    Met une valeur de scénario sous une forme canonique : nombres en flottants, clés triées.
+    """
+    if isinstance(valeur, dict):
+        return {str(cle): _canonique(v) for cle, v in sorted(valeur.items())}
+    if isinstance(valeur, (list, tuple)):
+        return [_canonique(v) for v in valeur]
+    if isinstance(valeur, bool) or valeur is None or isinstance(valeur, str):
+        return valeur
+    return float(valeur)
+
+def cle_scenario(scenario, donnees, strategie=None):
+    """
+    Calcule la clé de cache d'un scénario.
+    L'identifiant du scénario n'en fait pas partie : deux lignes identiques partagent le même résultat.
+    Args:
+        scenario (dict): Scénario normalisé.
+        donnees (DonneesUsine): Données de l'usine utilisées pour la résolution.
+        strategie (StrategieResolution): Stratégie de résolution (None si elle n'entre pas dans la clé).
+    Returns:
+        str: Empreinte SHA-256 hexadécimale.
+    """
+    entrees = {cle: valeur for cle, valeur in scenario.items() if cle != "id"}
+    reglages = strategie.empreinte() if strategie is not None else None
+    texte = json.dumps([VERSION_MODELE, donnees.empreinte(), reglages, _canonique(entrees)],
+                       sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(texte.encode("utf-8")).hexdigest()
+
+class CacheResultats:
+    """
+    Classe représentant un cache de résultats stocké dans une base SQLite.
+    Attributs:
+        chemin (str): Fichier de la base.
+        max_entrees (int): Nombre maximal de résultats conservés.
+        max_octets (int): Taille totale maximale des résultats conservés (None pour aucune limite).
+        nb_succes (int): Nombre de résultats trouvés dans le cache.
+        nb_echecs (int): Nombre de résultats absents du cache.
+    """
+    def __init__(self, chemin, max_entrees=100000, max_octets=None, delai_verrou=30):
+        self.chemin = chemin
+        self.max_entrees = max_entrees
+        self.max_octets = max_octets
+        self.nb_succes = 0
+        self.nb_echecs = 0
+        self._connexion = sqlite3.connect(chemin, timeout=delai_verrou, isolation_level=None)
+        self._connexion.execute("PRAGMA journal_mode=WAL")
+        self._connexion.execute("PRAGMA synchronous=NORMAL")
+        self._connexion.execute(
+            "CREATE TABLE IF NOT EXISTS resultats ("
+            "cle TEXT PRIMARY KEY, contenu TEXT NOT NULL, taille INTEGER NOT NULL, acces REAL NOT NULL)"
+        )
+        self._connexion.execute("CREATE INDEX IF NOT EXISTS resultats_acces ON resultats (acces)")
+
+    def obtenir(self, cle):
+        """
+        Cherche un résultat dans le cache et met à jour sa date d'utilisation.
+        Args:
+            cle (str): Clé renvoyée par cle_scenario.
+        Returns:
+            dict | None: Résultats mémorisés, ou None s'ils sont absents.
+        """
+        ligne = self._connexion.execute("SELECT contenu FROM resultats WHERE cle = ?", (cle,)).fetchone()
+        if ligne is None:
+            self.nb_echecs += 1
+            return None
+        self._connexion.execute("UPDATE resultats SET acces = ? WHERE cle = ?", (time.time(), cle))
+        self.nb_succes += 1
+        return json.loads(ligne[0])
+
+    def enregistrer(self, cle, resultats):
+        """
+        Mémorise un résultat puis supprime les entrées les plus anciennes si une limite est dépassée.
+        Les résultats obtenus sur limite de temps ne sont pas mémorisés.
+        Args:
+            cle (str): Clé renvoyée par cle_scenario.
+            resultats (dict): Résultats renvoyés par extraire_resultats.
+        """
+        if resultats["statut"] not in STATUTS_MEMORISES:
+            return
+        contenu = json.dumps(resultats, ensure_ascii=False)
+        with self._connexion:
+            self._connexion.execute("BEGIN IMMEDIATE")
+            self._connexion.execute(
+                "INSERT OR REPLACE INTO resultats (cle, contenu, taille, acces) VALUES (?, ?, ?, ?)",
+                (cle, contenu, len(contenu), time.time()),
+            )
+            self._evincer()
+
+    def _evincer(self):
+        nb_entrees = self._connexion.execute("SELECT COUNT(*) FROM resultats").fetchone()[0]
+        if nb_entrees > self.max_entrees:
+            self._connexion.execute(
+                "DELETE FROM resultats WHERE cle IN (SELECT cle FROM resultats ORDER BY acces LIMIT ?)",
+                (nb_entrees - self.max_entrees,),
+            )
+        if self.max_octets is None:
+            return
+        taille = self._connexion.execute("SELECT COALESCE(SUM(taille), 0) FROM resultats").fetchone()[0]
+        if taille > self.max_octets:
+            a_liberer = taille - self.max_octets
+            lignes = self._connexion.execute("SELECT cle, taille FROM resultats ORDER BY acces")
+            a_supprimer = []
+            for cle, taille_ligne in lignes:
+                if a_liberer <= 0:
+                    break
+                a_supprimer.append((cle,))
+                a_liberer -= taille_ligne
+            self._connexion.executemany("DELETE FROM resultats WHERE cle = ?", a_supprimer)
+
+    def vider(self):
+        """
+        Supprime tous les résultats mémorisés.
+        """
+        self._connexion.execute("DELETE FROM resultats")
+
+    def fermer(self):
+        self._connexion.close()
@@ -0,0 +1,276 @@
+"""
+Diagnostic d'un problème sans solution (infaisabilité) ou à la solution dégénérée.
+
+Lorsqu'un problème n'a pas de solution, deux informations sont calculées à partir des contraintes
+nommées du modèle (familles Encadrement_*, Capacite_*, MP_* et Limite_machines par défaut) :
+- les écarts : une variable d'écart positive est ajoutée à chaque contrainte de ces familles et leur
+  somme est minimisée (problème élastique). L'écart de chaque contrainte est le déplacement de son
+  second membre (en unités de la contrainte) qui rend le problème réalisable ;
+- un ensemble irréductible de contraintes incompatibles (IIS) : retirer n'importe laquelle de ces
+  contraintes rend le problème réalisable. Il est obtenu par filtre élastique (les contraintes à
+  écart non nul sont rendues strictes jusqu'à ce que le problème élastique n'ait plus de solution),
+  puis par filtre de suppression sur ce petit ensemble seulement.
+Les autres contraintes (demande, bornes epsilon...) et les bornes des variables restent strictes.
+Il faut quelques résolutions du modèle mensuel, assez peu pour diagnostiquer chaque scénario en
+échec d'un traitement par lot.
+
+Pour une solution trouvée, le diagnostic liste les contraintes saturées et signale une solution
+dégénérée (plus de contraintes et de bornes saturées que de variables) : des seconds membres voisins
+peuvent alors donner une solution très différente.
+
+Le modèle mensuel admet une production, une consommation et des machines négatives : il est presque
+toujours réalisable. Les infaisabilités viennent des variantes à décisions positives (planification,
+frontière de Pareto) et des bornes ajoutées par l'utilisateur.
+
+Utilisation :
+    python -m optimisation diagnostic scenario.json
+    python -m optimisation diagnostic scenario.json --positives --limite-machines -1
+"""
+import argparse
+import copy
+import json
+import sys
+
+from pulp import (LpProblem, LpMinimize, LpVariable, LpAffineExpression, LpConstraint,
+                  LpConstraintLE, LpConstraintGE, lpSum)
+
+from .modele import STATUTS_SOLUTION, construire_probleme, decisions_positives, statut_resolution
+from .solveurs import creer_solveur
+
+# Familles de contraintes pouvant être relâchées ou retenues dans un ensemble incompatible
+FAMILLES = ("Encadrement_", "Capacite_", "MP_", "Limite_machines")
+
+def _echelle(contrainte):
+    return max(1.0, abs(contrainte.constant))
+
+def _solveur_diagnostic(solveur):
+    """
+    Copie du solveur sans solution initiale ni journal : les variables ne portent pas de solution
+    réalisable et le journal d'une résolution est relu puis effacé par ModeleParametrique.
+    """
+    if solveur is None:
+        return creer_solveur()
+    if not hasattr(solveur, "optionsDict"):
+        return solveur
+    solveur = copy.copy(solveur)
+    solveur.optionsDict = {cle: valeur for cle, valeur in solveur.optionsDict.items()
+                           if cle not in ("warmStart", "logPath")}
+    return solveur
+
+def contraintes_candidates(problem, familles=FAMILLES):
+    """
+    Returns:
+        list: Noms des contraintes du problème appartenant aux familles données.
+    """
+    return [nom for nom in problem.constraints if nom.startswith(tuple(familles))]
+
+def _sous_probleme(problem, strictes, elastiques=()):
+    """
+    Construit une copie du problème sans fonction objectif où les contraintes candidates non
+    listées sont retirées, celles de strictes sont conservées et celles d'elastiques reçoivent
+    une variable d'écart positive (somme pondérée des écarts minimisée).
+    Returns:
+        tuple: Problème et variables d'écart de chaque contrainte élastique (ajout, retrait).
+    """
+    sous_probleme = LpProblem("Diagnostic", LpMinimize)
+    for nom in strictes:
+        contrainte = problem.constraints[nom]
+        sous_probleme.addConstraint(LpConstraint(LpAffineExpression(contrainte), contrainte.sense, nom))
+    ecarts = {}
+    for nom in elastiques:
+        contrainte = problem.constraints[nom]
+        expression = LpAffineExpression(contrainte)
+        hausse = baisse = None
+        if contrainte.sense != LpConstraintGE:
+            hausse = LpVariable(f"hausse_{nom}", lowBound=0)
+            expression = expression - hausse
+        if contrainte.sense != LpConstraintLE:
+            baisse = LpVariable(f"baisse_{nom}", lowBound=0)
+            expression = expression + baisse
+        sous_probleme.addConstraint(LpConstraint(expression, contrainte.sense, nom))
+        ecarts[nom] = (hausse, baisse)
+    sous_probleme.setObjective(lpSum(v / _echelle(problem.constraints[nom])
+                                     for nom, couple in ecarts.items() for v in couple if v is not None))
+    return sous_probleme, ecarts
+
+def _strictes(problem, familles):
+    return [nom for nom in problem.constraints if not nom.startswith(tuple(familles))]
+
+def _realisable(problem, strictes, solveur):
+    sous_probleme, _ = _sous_probleme(problem, strictes)
+    sous_probleme.solve(solveur)
+    return statut_resolution(sous_probleme) in STATUTS_SOLUTION
+
+def relaxation_elastique(modele, solveur=None, familles=FAMILLES, fixees=(), tolerance=1e-6):
+    """
+    Résout le problème élastique : les contraintes candidates (hors fixees) peuvent être violées,
+    la somme de leurs écarts rapportés à leur second membre est minimisée.
+    Args:
+        modele (Modele): Modèle dont le problème n'a pas de solution.
+        solveur: Solveur PuLP (CBC silencieux par défaut).
+        familles (tuple): Préfixes des contraintes pouvant être relâchées.
+        fixees (iterable): Contraintes candidates gardées strictes.
+        tolerance (float): Écart relatif en deçà duquel une contrainte n'est pas déplacée.
+    Returns:
+        dict: Déplacement du second membre de chaque contrainte déplacée (positif pour l'augmenter),
+              ou None si le problème reste sans solution même en relâchant toutes les candidates.
+    """
+    problem = modele.problem
+    solveur = _solveur_diagnostic(solveur)
+    fixees = list(fixees)
+    elastiques = [nom for nom in contraintes_candidates(problem, familles) if nom not in fixees]
+    sous_probleme, variables = _sous_probleme(problem, _strictes(problem, familles) + fixees, elastiques)
+    sous_probleme.solve(solveur)
+    if statut_resolution(sous_probleme) not in STATUTS_SOLUTION:
+        return None
+    ecarts = {}
+    for nom, (hausse, baisse) in variables.items():
+        ecart = sum((v.varValue or 0.0) * signe for v, signe in ((hausse, 1), (baisse, -1)) if v is not None)
+        if abs(ecart) > tolerance * _echelle(problem.constraints[nom]):
+            ecarts[nom] = ecart
+    return ecarts
+
+def contraintes_incompatibles(modele, solveur=None, familles=FAMILLES, ecarts=None):
+    """
+    Cherche un ensemble irréductible de contraintes candidates incompatibles.
+    Args:
+        modele (Modele): Modèle dont le problème n'a pas de solution.
+        solveur: Solveur PuLP (CBC silencieux par défaut).
+        familles (tuple): Préfixes des contraintes candidates.
+        ecarts (dict): Résultat de relaxation_elastique déjà calculé, pour éviter une résolution.
+    Returns:
+        list: Noms des contraintes incompatibles (vide si le problème est réalisable, None si les
+              contraintes candidates ne suffisent pas à expliquer l'infaisabilité).
+    """
+    problem = modele.problem
+    solveur = _solveur_diagnostic(solveur)
+    if ecarts is None:
+        ecarts = relaxation_elastique(modele, solveur, familles)
+    if ecarts is None:
+        return None
+
+    # Filtre élastique : les contraintes déplacées deviennent strictes jusqu'à l'infaisabilité
+    fixees = []
+    while ecarts is not None:
+        if not ecarts:
+            return []
+        fixees += sorted(ecarts)
+        ecarts = relaxation_elastique(modele, solveur, familles, fixees)
+
+    # Filtre de suppression : une contrainte dont le retrait laisse le problème infaisable est inutile
+    strictes = _strictes(problem, familles)
+    for nom in list(fixees):
+        reste = [c for c in fixees if c != nom]
+        if not _realisable(problem, strictes + reste, solveur):
+            fixees = reste
+    return fixees
+
+def contraintes_saturees(modele, tolerance=1e-6):
+    """
+    Args:
+        modele (Modele): Modèle dont le problème a une solution.
+        tolerance (float): Écart relatif à la taille des termes en deçà duquel une contrainte est saturée.
+    Returns:
+        list: Noms des contraintes saturées par la solution courante.
+    """
+    saturees = []
+    for nom, contrainte in modele.problem.constraints.items():
+        valeur = contrainte.value()
+        if valeur is None:
+            continue
+        echelle = max([1.0, abs(contrainte.constant)] + [abs(a * (v.varValue or 0.0)) for v, a in contrainte.items()])
+        if abs(valeur) <= tolerance * echelle:
+            saturees.append(nom)
+    return saturees
+
+def _bornes_saturees(problem, tolerance=1e-6):
+    nombre = 0
+    for variable in problem.variables():
+        valeur = variable.varValue
+        for borne in (variable.lowBound, variable.upBound):
+            if valeur is not None and borne is not None and abs(valeur - borne) <= tolerance * max(1.0, abs(borne)):
+                nombre += 1
+    return nombre
+
+def diagnostiquer(modele, solveur=None, familles=FAMILLES):
+    """
+    Diagnostique le problème résolu d'un modèle.
+    Args:
+        modele (Modele): Modèle dont le problème vient d'être résolu.
+        solveur: Solveur PuLP des résolutions du diagnostic (CBC silencieux par défaut).
+        familles (tuple): Préfixes des contraintes pouvant être relâchées.
+    Returns:
+        dict: Statut, puis pour un problème sans solution les écarts ("ecarts", None si relâcher
+              les candidates ne suffit pas) et les contraintes incompatibles ("incompatibles"),
+              pour une solution les contraintes saturées ("saturees") et "degenere".
+    """
+    statut = statut_resolution(modele.problem)
+    diagnostic = {"statut": statut}
+    if statut in STATUTS_SOLUTION:
+        saturees = contraintes_saturees(modele)
+        nb_variables = len(modele.problem.variables())
+        diagnostic["saturees"] = saturees
+        diagnostic["degenere"] = len(saturees) + _bornes_saturees(modele.problem) > nb_variables
+    elif statut != "Unbounded":
+        solveur = _solveur_diagnostic(solveur)
+        ecarts = relaxation_elastique(modele, solveur, familles)
+        diagnostic["ecarts"] = ecarts
+        diagnostic["incompatibles"] = None if ecarts is None else contraintes_incompatibles(modele, solveur, familles, ecarts)
+    return diagnostic
+
+def resumer_diagnostic(diagnostic):
+    """
+    Résume en une ligne le diagnostic d'un problème sans solution.
+    Args:
+        diagnostic (dict): Diagnostic renvoyé par diagnostiquer.
+    Returns:
+        str: Contraintes incompatibles et déplacements nécessaires (None s'il n'y a rien à signaler).
+    """
+    if "ecarts" not in diagnostic:
+        return None
+    if diagnostic["ecarts"] is None:
+        return "Sans solution même en relâchant les contraintes " + ", ".join(FAMILLES)
+    if not diagnostic["ecarts"]:
+        return "Réalisable : aucune contrainte à déplacer"
+    return ("Contraintes incompatibles : " + ", ".join(diagnostic["incompatibles"])
+            + " ; écarts : " + ", ".join(f"{nom} {ecart:+.6g}" for nom, ecart in diagnostic["ecarts"].items()))
+
+def main(arguments=None):
+    """
+    Point d'entrée en ligne de commande : résout un scénario et affiche son diagnostic en JSON.
+    """
+    from .scenarios import normaliser_scenario
+    from .solveurs import StrategieResolution
+    parser = argparse.ArgumentParser(prog="python -m optimisation diagnostic",
+                                     description="Diagnostic d'infaisabilité et de dégénérescence d'un scénario.")
+    parser.add_argument("scenario", nargs="?", help="Fichier JSON du scénario (scénario par défaut si absent)")
+    parser.add_argument("--solveur", default="cbc", help="Solveur : cbc, highs, glpk ou nom d'un solveur PuLP installé")
+    parser.add_argument("--delai", type=float, help="Temps de résolution maximal, en secondes")
+    parser.add_argument("--limite-machines", type=float, help="Nombre total de machines autorisé")
+    parser.add_argument("--positives", action="store_true",
+                        help="Production, consommation, machines et effectifs positifs (comme en planification)")
+    args = parser.parse_args(arguments)
+
+    donnees = {}
+    if args.scenario:
+        with open(args.scenario, encoding="utf-8") as f:
+            donnees = json.load(f)
+    try:
+        scenario = normaliser_scenario(donnees)
+        strategie = StrategieResolution.depuis_nom(args.solveur, delai=args.delai)
+    except ValueError as erreur:
+        parser.error(str(erreur))
+    modele = construire_probleme(scenario)
+    if args.positives:
+        decisions_positives(modele)
+    if args.limite_machines is not None:
+        modele.problem.constraints["Limite_machines"].constant = -args.limite_machines
+    strategie.resoudre(modele)
+    diagnostic = diagnostiquer(modele, strategie.solveur)
+    print(json.dumps(diagnostic, ensure_ascii=False, indent=2))
+    resume = resumer_diagnostic(diagnostic)
+    if resume:
+        print(resume, file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Objets métier et données de référence de l'usine.
+
+Regroupe les classes Produit, Machine, Carcasse et Bobine ainsi que les valeurs
+par défaut utilisées par le script interactif (prix, coûts, salaires, demande de base).
+Les objets métier sont déclarés avec __slots__ (pas de __dict__ par instance). Les catalogues
+volumineux se chargent plutôt en colonnes avec DonneesUsine.depuis_colonnes (voir donnees.py).
+"""
+
+class Produit:
+    """
+    Classe représentant un produit fini.
+    Attributs:
+        nom (str): Nom du produit.
+        prix_vente (float): Prix de vente du produit.
+        recettes (dict): Recettes nécessaires pour produire le produit.
+        poids_final (float): Poids final du produit.
+    """
+    __slots__ = ("nom", "prix_vente", "recettes", "poids_final")
+
+    def __init__(self, nom, prix_vente, recettes, poids_final):
+        self.nom = nom
+        self.prix_vente = prix_vente
+        self.recettes = recettes
+        self.poids_final = poids_final
+
+class Machine:
+    """
+    Classe représentant une machine de production.
+    Attributs:
+        nom (str): Nom de la machine.
+        capacite (dict): Capacité de la machine (kg) pour chaque produit ou carcasse qu'elle traite.
+        cout_mensuel (float): Coût mensuel de la machine.
+        nb_ouvriers (int): Nombre d'ouvriers nécessaires pour faire fonctionner la machine.
+    """
+    __slots__ = ("nom", "capacite", "cout_mensuel", "nb_ouvriers")
+
+    def __init__(self, nom, capacite, cout_mensuel, nb_ouvriers):
+        self.nom = nom
+        self.capacite = capacite
+        self.cout_mensuel = cout_mensuel
+        self.nb_ouvriers = nb_ouvriers
+
+class Carcasse:
+    """
+    Classe représentant une carcasse d'animal.
+    Attributs:
+        nom (str): Nom de l'animal.
+        poids (float): Poids de la carcasse.
+        conversion (dict): Conversion de la carcasse en matières premières.
+        cout_kg (float): Coût au kilogramme de la carcasse.
+    """
+    __slots__ = ("nom", "poids", "conversion", "cout_kg")
+
+    def __init__(self, nom, poids, conversion, cout_kg):
+        self.nom = nom
+        self.poids = poids
+        self.conversion = conversion
+        self.cout_kg = cout_kg
+
+class Bobine:
+    """
+    Classe représentant une bobine de matière.
+    Attributs:
+        nom (str): Nom de la bobine.
+        poids (float): Poids de la bobine.
+        cout_kg (float): Coût au kilogramme de la bobine.
+    """
+    __slots__ = ("nom", "poids", "cout_kg")
+
+    def __init__(self, nom, poids, cout_kg):
+        self.nom = nom
+        self.poids = poids
+        self.cout_kg = cout_kg
+
+# === Données de référence ===
+
+PRODUITS = ("Cuisses", "Jambon", "Pate", "Terrines", "Mousses")
+
+# Demande de base du marché, multipliée par le coefficient saisi
+DEMANDE_BASE = {"Cuisses": 250000, "Jambon": 1250000, "Pate": 10000000, "Terrines": 3750000, "Mousses": 900000}
+
+PRIX_VENTE_DEFAUT = {"Cuisses": 5.2, "Jambon": 3.9, "Pate": 2.1, "Terrines": 3.2, "Mousses": 4.4}
+
+# Coût par type de matière première (au kg)
+COUTS_MATIERES_DEFAUT = {"porc": 2.0115, "poulet": 2.97, "canard": 4.428, "plastique": 5.427, "fer": 2.214}
+
+SALAIRES_DEFAUT = {"Ouvriers": 1800, "Agents_Maitrise": 2100, "Cadres_Moyens": 3600, "Commerciaux": 1000,
+                   "Assistants_Commerciaux": 1700, "Employes": 1800, "Dirigeants": 18000}
+
+NB_COMMERCIAUX_DEFAUT = 10
+
+LIMITE_MACHINES = 35
+
+# === Construction des objets ===
+
+def creer_produits(prix_vente):
+    """
+    Crée les produits finis à partir des prix de vente.
+    Args:
+        prix_vente (dict): Prix de vente de chaque produit.
+    Returns:
+        dict: Produits indexés par leur nom.
+    """
+    return {
+        "Cuisses": Produit("Cuisses", prix_vente["Cuisses"], {"cuisse": 0.512, "plastique": 0.064}, 0.512),
+        "Jambon": Produit("Jambon", prix_vente["Jambon"], {"muscles": 0.180, "plastique": 0.073}, 0.180),
+        "Pate": Produit("Pate", prix_vente["Pate"], {"chair_porc": 0.094, "fer": 0.030}, 0.098),
+        "Terrines": Produit("Terrines", prix_vente["Terrines"], {"chair_porc": 0.101, "chair_poulet": 0.030, "chair_canard": 0.020, "fer": 0.080}, 0.156),
+        "Mousses": Produit("Mousses", prix_vente["Mousses"], {"chair_porc": 0.080, "poitrail_canard": 0.045, "chair_canard": 0.040, "plastique": 0.056}, 0.180),
+    }
+
+def creer_machines():
+    """
+    Crée les machines de l'usine.
+    Returns:
+        dict: Machines indexées par "decoupe", "broyage", "cuisson" et "emballage".
+    """
+    return {
+        "decoupe": Machine("Découpe", {"porc": 60000, "poulet": 45000, "canard": 45000}, 4000, 2),
+        "broyage": Machine("Broyage", {"Pate": 75000, "Terrines": 75000, "Mousses": 75000}, 3000, 1),
+        "cuisson": Machine("Cuisson", {"Jambon": 32750, "Pate": 54000, "Terrines": 45000, "Mousses": 100000}, 8000, 3),
+        "emballage": Machine("Emballage", {p: 40000 for p in PRODUITS}, 7500, 3),
+    }
+
+def creer_carcasses(couts_matieres):
+    """
+    Crée les carcasses à partir des coûts au kilogramme.
+    Args:
+        couts_matieres (dict): Coût au kg de chaque matière première.
+    Returns:
+        dict: Carcasses indexées par "porc", "poulet" et "canard".
+    """
+    return {
+        "porc": Carcasse("Porc", 100, {"muscles": 15, "chair_porc": 62}, couts_matieres["porc"]),
+        "poulet": Carcasse("Poulet", 2, {"cuisse": 0.64, "chair_poulet": 0.62}, couts_matieres["poulet"]),
+        "canard": Carcasse("Canard", 3, {"poitrail_canard": 0.42, "chair_canard": 1.62}, couts_matieres["canard"]),
+    }
+
+def creer_bobines(couts_matieres):
+    """
+    Crée les bobines à partir des coûts au kilogramme.
+    Args:
+        couts_matieres (dict): Coût au kg de chaque matière première.
+    Returns:
+        dict: Bobines indexées par "plastique" et "fer".
+    """
+    return {
+        "plastique": Bobine("Plastique", 50, couts_matieres["plastique"]),
+        "fer": Bobine("Fer", 60, couts_matieres["fer"]),
+    }
@@ -0,0 +1,215 @@
+"""
+Description matricielle de l'usine, à partir de laquelle le modèle est construit.
+
+Les recettes, les rendements des carcasses et bobines et les charges machines sont rangés dans des
+tableaux NumPy indexés par produit, source (carcasse ou bobine), matière et machine. Ajouter un
+produit ou une carcasse revient à ajouter une ligne de données, sans toucher au modèle.
+Un catalogue volumineux se charge directement en colonnes (DonneesUsine.depuis_colonnes), sans
+passer par les objets métier.
+
+Conventions :
+- une source est une carcasse ou une bobine, désignée par la clé de son coût dans couts_matieres ;
+- chaque matière est fournie par une seule source (la valeur des pertes en dépend) ;
+- la charge d'une machine vaut poids / capacité pour chaque produit ou source qu'elle traite.
+"""
+import hashlib
+import json
+
+import numpy as np
+
+from .domaine import (DEMANDE_BASE, LIMITE_MACHINES, PRIX_VENTE_DEFAUT, COUTS_MATIERES_DEFAUT,
+                      creer_produits, creer_machines, creer_carcasses, creer_bobines)
+
+class DonneesUsine:
+    """
+    Classe regroupant les données de l'usine sous forme de tableaux.
+    Attributs:
+        produits (list): Noms des produits (P).
+        sources (list): Clés des carcasses puis des bobines (S).
+        matieres (list): Noms des matières premières (M).
+        machines (list): Clés des machines (K).
+        poids_final (ndarray): Poids final de chaque produit (P).
+        demande_base (ndarray): Demande de base de chaque produit (P).
+        poids_sources (ndarray): Poids d'une carcasse ou d'une bobine (S).
+        est_carcasse (ndarray): True pour les carcasses, False pour les bobines (S).
+        recettes (ndarray): Quantité de chaque matière par unité de produit (P x M).
+        rendements (ndarray): Quantité de chaque matière fournie par unité de source (S x M).
+        charge_produits (ndarray): Part de machine utilisée par unité de produit (K x P).
+        charge_sources (ndarray): Part de machine utilisée par unité de source (K x S).
+        cout_machines (ndarray): Coût mensuel de chaque machine (K).
+        ouvriers_machines (ndarray): Nombre d'ouvriers par machine (K).
+        limite_machines (float): Nombre total de machines autorisé.
+        source_matiere (ndarray): Indice de la source fournissant chaque matière (M).
+    """
+    def __init__(self, produits, sources, matieres, machines, poids_final, demande_base,
+                 poids_sources, est_carcasse, recettes, rendements, charge_produits, charge_sources,
+                 cout_machines, ouvriers_machines, limite_machines=LIMITE_MACHINES):
+        self.produits = list(produits)
+        self.sources = list(sources)
+        self.matieres = list(matieres)
+        self.machines = list(machines)
+        self.poids_final = np.asarray(poids_final, dtype=float)
+        self.demande_base = np.asarray(demande_base, dtype=float)
+        self.poids_sources = np.asarray(poids_sources, dtype=float)
+        self.est_carcasse = np.asarray(est_carcasse, dtype=bool)
+        self.recettes = np.asarray(recettes, dtype=float)
+        self.rendements = np.asarray(rendements, dtype=float)
+        self.charge_produits = np.asarray(charge_produits, dtype=float)
+        self.charge_sources = np.asarray(charge_sources, dtype=float)
+        self.cout_machines = np.asarray(cout_machines, dtype=float)
+        self.ouvriers_machines = np.asarray(ouvriers_machines, dtype=float)
+        self.limite_machines = limite_machines
+
+        P, S, M, K = len(self.produits), len(self.sources), len(self.matieres), len(self.machines)
+        dimensions = {
+            "recettes": (self.recettes, (P, M)),
+            "rendements": (self.rendements, (S, M)),
+            "charge_produits": (self.charge_produits, (K, P)),
+            "charge_sources": (self.charge_sources, (K, S)),
+        }
+        for nom, (tableau, forme) in dimensions.items():
+            if tableau.shape != forme:
+                raise ValueError(f"{nom} : dimensions {tableau.shape} au lieu de {forme}")
+        nb_sources = np.count_nonzero(self.rendements, axis=0)
+        if np.any(nb_sources != 1):
+            matiere = self.matieres[int(np.argmax(nb_sources != 1))]
+            raise ValueError(f"La matière {matiere} doit être fournie par exactement une source")
+        self.source_matiere = np.argmax(self.rendements != 0, axis=0)
+        self._empreinte = None
+
+    @property
+    def carcasses(self):
+        return [s for s, carcasse in zip(self.sources, self.est_carcasse) if carcasse]
+
+    @property
+    def bobines(self):
+        return [s for s, carcasse in zip(self.sources, self.est_carcasse) if not carcasse]
+
+    @property
+    def matieres_carcasses(self):
+        """
+        Matières issues des carcasses, seules concernées par le calcul des pertes.
+        """
+        return [m for m, s in zip(self.matieres, self.source_matiere) if self.est_carcasse[s]]
+
+    def empreinte(self):
+        """
+        Calcule une empreinte des données, identique pour deux usines décrites par les mêmes valeurs.
+        Returns:
+            str: Empreinte SHA-256 hexadécimale.
+        """
+        if self._empreinte is None:
+            h = hashlib.sha256()
+            h.update(json.dumps([self.produits, self.sources, self.matieres, self.machines,
+                                 float(self.limite_machines)]).encode("utf-8"))
+            for tableau in (self.poids_final, self.demande_base, self.poids_sources, self.est_carcasse,
+                            self.recettes, self.rendements, self.charge_produits, self.charge_sources,
+                            self.cout_machines, self.ouvriers_machines):
+                h.update(np.ascontiguousarray(tableau).tobytes())
+            self._empreinte = h.hexdigest()
+        return self._empreinte
+
+    @classmethod
+    def depuis_colonnes(cls, produits, sources, matieres, machines, poids_final, demande_base,
+                        poids_sources, est_carcasse, recettes, rendements, capacites_produits,
+                        capacites_sources, cout_machines, ouvriers_machines, limite_machines=LIMITE_MACHINES):
+        """
+        Construit les tableaux à partir de colonnes : les recettes, rendements et capacités sont donnés
+        en triplets (indice de ligne, indice de colonne, valeur), comme dans un fichier de catalogue
+        où chaque ligne désigne un produit et une matière par leur numéro. Aucun objet ni dictionnaire
+        n'est créé par article : les tableaux sont remplis en une opération par triplet.
+        Args:
+            produits, sources, matieres, machines (list): Noms, dans l'ordre des indices.
+            poids_final, demande_base (array): Colonnes par produit (P).
+            poids_sources, est_carcasse (array): Colonnes par source (S).
+            recettes (tuple): Indices de produit, indices de matière et quantités par unité de produit.
+            rendements (tuple): Indices de source, indices de matière et quantités par unité de source.
+            capacites_produits (tuple): Indices de machine, indices de produit et capacités (kg).
+            capacites_sources (tuple): Indices de machine, indices de source et capacités (kg).
+            cout_machines, ouvriers_machines (array): Colonnes par machine (K).
+            limite_machines (float): Nombre total de machines autorisé.
+        Returns:
+            DonneesUsine: Données de l'usine.
+        """
+        P, S, M, K = len(produits), len(sources), len(matieres), len(machines)
+        poids_final = np.asarray(poids_final, dtype=float)
+        poids_sources = np.asarray(poids_sources, dtype=float)
+
+        def remplir(forme, triplets, poids=None):
+            lignes, colonnes, valeurs = triplets
+            lignes, colonnes = np.asarray(lignes, dtype=np.intp), np.asarray(colonnes, dtype=np.intp)
+            valeurs = np.asarray(valeurs, dtype=float)
+            tableau = np.zeros(forme)
+            # Charge machine : poids de l'élément traité rapporté à la capacité
+            tableau[lignes, colonnes] = valeurs if poids is None else poids[colonnes] / valeurs
+            return tableau
+
+        return cls(
+            produits, sources, matieres, machines, poids_final, demande_base, poids_sources, est_carcasse,
+            remplir((P, M), recettes), remplir((S, M), rendements),
+            remplir((K, P), capacites_produits, poids_final), remplir((K, S), capacites_sources, poids_sources),
+            cout_machines, ouvriers_machines, limite_machines,
+        )
+
+    @classmethod
+    def depuis_objets(cls, produits, machines, carcasses, bobines, demande_base, limite_machines=LIMITE_MACHINES):
+        """
+        Construit les tableaux à partir des objets métier.
+        Les bobines fournissent la matière portant leur clé, à raison de leur poids par bobine.
+        Args:
+            produits (dict): Produits indexés par nom.
+            machines (dict): Machines indexées par clé, capacité donnée par produit ou par source.
+            carcasses (dict): Carcasses indexées par clé de coût.
+            bobines (dict): Bobines indexées par clé de coût (et de matière).
+            demande_base (dict): Demande de base de chaque produit.
+            limite_machines (float): Nombre total de machines autorisé.
+        Returns:
+            DonneesUsine: Données de l'usine.
+        """
+        noms_produits = list(produits)
+        sources = list(carcasses) + list(bobines)
+        matieres = []
+        for produit in produits.values():
+            matieres += [m for m in produit.recettes if m not in matieres]
+        for carcasse in carcasses.values():
+            matieres += [m for m in carcasse.conversion if m not in matieres]
+        indice_produit = {p: i for i, p in enumerate(noms_produits)}
+        indice_source = {s: i for i, s in enumerate(sources)}
+        indice_matiere = {m: i for i, m in enumerate(matieres)}
+
+        recettes = [(indice_produit[p], indice_matiere[m], q)
+                    for p, produit in produits.items() for m, q in produit.recettes.items()]
+        rendements = [(indice_source[c], indice_matiere[m], q)
+                      for c, carcasse in carcasses.items() for m, q in carcasse.conversion.items()]
+        rendements += [(indice_source[b], indice_matiere[b], bobine.poids) for b, bobine in bobines.items()]
+        capacites_produits, capacites_sources = [], []
+        for k, machine in enumerate(machines.values()):
+            for nom, capacite in machine.capacite.items():
+                if nom in indice_produit:
+                    capacites_produits.append((k, indice_produit[nom], capacite))
+                else:
+                    capacites_sources.append((k, indice_source[nom], capacite))
+
+        def colonnes(triplets):
+            return tuple(zip(*triplets)) if triplets else ((), (), ())
+
+        return cls.depuis_colonnes(
+            noms_produits, sources, matieres, list(machines),
+            [produits[p].poids_final for p in noms_produits], [demande_base[p] for p in noms_produits],
+            [carcasses[s].poids if s in carcasses else bobines[s].poids for s in sources],
+            [s in carcasses for s in sources], colonnes(recettes), colonnes(rendements),
+            colonnes(capacites_produits), colonnes(capacites_sources),
+            [m.cout_mensuel for m in machines.values()], [m.nb_ouvriers for m in machines.values()],
+            limite_machines,
+        )
+
+def donnees_reference():
+    """
+    Renvoie les données de l'usine de référence (cinq produits, trois carcasses, deux bobines, quatre machines).
+    Returns:
+        DonneesUsine: Données de l'usine.
+    """
+    return DonneesUsine.depuis_objets(
+        creer_produits(PRIX_VENTE_DEFAUT), creer_machines(), creer_carcasses(COUTS_MATIERES_DEFAUT),
+        creer_bobines(COUTS_MATIERES_DEFAUT), DEMANDE_BASE,
+    )
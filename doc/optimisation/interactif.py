@@ -0,0 +1,300 @@
+"""
+Saisie interactive d'un scénario au clavier et affichage des résultats.
+
+Reprend les saisies du script "Algo v2.py". Rien n'est demandé à l'import du module :
+les saisies et la résolution ne sont lancées que par main(). Après la première résolution,
+les valeurs peuvent être modifiées une à une sans tout ressaisir (voir session.py).
+"""
+import argparse
+import sys
+
+from .domaine import PRIX_VENTE_DEFAUT, COUTS_MATIERES_DEFAUT, SALAIRES_DEFAUT
+
+def saisie_minmax(min: float, max: float) -> float:
+    """
+    Demande à l'utilisateur un nombre flottant entre min et max (inclus).
+    Redemande tant que la valeur n'est pas valide.
+
+    Args:
+        min (float): Valeur minimale acceptée.
+        max (float): Valeur maximale acceptée.
+
+    Returns:
+        float: Valeur saisie par l'utilisateur, comprise entre min et max.
+    """
+    result = float(input())
+    while result < min or result > max:
+        result = float(input(f"Entrez nombre entre {min} et {max}"))
+    return result
+
+# Entrée des coefficients des marchés
+def saisir_coefficients():
+    """
+    Demande à l'utilisateur de saisir les coefficients de marché avec validation des entrées.
+    
+    - Les coefficients doivent être positifs et entre 0 et 2
+    
+    Returns:
+        dict: Dictionnaire des coefficients validés
+    """
+    print("Entrer coefficients entre 0 et 2\n")
+    coef = {}
+    print("Coefficient cuisses de poulet\n")
+    coef["Cuisses"] = saisie_minmax(0,2)
+    print("Coefficient tranches de jambon\n")
+    coef["Jambon"] = saisie_minmax(0,2)
+    print("Coefficient pate de porc\n")
+    coef["Pate"] = saisie_minmax(0,2)
+    print("Coefficient terrines de volaille\n")
+    coef["Terrines"] = saisie_minmax(0,2)
+    print("Coefficient mousses de canard\n")
+    coef["Mousses"] = saisie_minmax(0,2)
+    return coef
+
+def saisie_objectif_prod():
+    """
+    Demande à l'utilisateur de saisir l'objectif de production avec validation des entrées.
+    
+    - L'objectif doit être positif et entre 0 et 100
+    
+    Returns:
+        float: Objectif de production validé
+    """
+    print("Entrer objectif de production en pourcentage entre 0 et 100\n")
+    objectif = {}
+    print("Objectif cuisses de poulet)\n")
+    objectif["Cuisses"] = saisie_minmax(0,100) / 100
+    print("Objectif tranches de jambon\n")
+    objectif["Jambon"] = saisie_minmax(0,100) / 100
+    print("Objectif pate de porc\n")
+    objectif["Pate"] = saisie_minmax(0,100) / 100
+    print("Objectif terrines de volaille\n")
+    objectif["Terrines"] = saisie_minmax(0,100) / 100
+    print("Objectif mousses de canard\n")
+    objectif["Mousses"] = saisie_minmax(0,100) / 100
+    return objectif
+
+# === Données ===
+
+# Prix de vente des produits finis
+def saisie_prix_vente():
+    """
+    Demande à l'utilisateur de saisir les prix de vente des produits finis.
+    Returns:
+        dict: Un dictionnaire contenant les prix de vente pour chaque produit.
+              Les produits incluent "Cuisses", "Jambon", "Pate", "Terrines", "Mousses".
+    """
+    prix_vente = dict(PRIX_VENTE_DEFAUT)
+    rep = input("Modifier prix de vente ? O pour oui sinon entrez autre")
+    if rep == "O":
+        prix_vente["Cuisses"] = saisie_minmax(0,10)
+        prix_vente["Jambon"] = saisie_minmax(0,10)
+        prix_vente["Pate"] = saisie_minmax(0,10)
+        prix_vente["Terrines"] = saisie_minmax(0,10)
+        prix_vente["Mousses"] = saisie_minmax(0,10)
+    return prix_vente
+
+def saisie_cout_matieres():
+    # Coût par type de matière première (au kg)
+    couts_matieres = dict(COUTS_MATIERES_DEFAUT)
+    rep = input("Modifier coût des carcasses et bobines ? O pour oui sinon entrez autre")
+    if rep == "O":
+        couts_matieres["porc"] = saisie_minmax(0,10)
+        couts_matieres["poulet"] = saisie_minmax(0,10)
+        couts_matieres["canard"] = saisie_minmax(0,10)
+        couts_matieres["plastique"] = saisie_minmax(0,10)
+        couts_matieres["fer"] = saisie_minmax(0,10)
+    return couts_matieres
+    
+def saisie_personnel():
+
+    # Salaires
+    salaires = dict(SALAIRES_DEFAUT)
+    print("Nombre de commerciaux")
+    nb_commerciaux = saisie_minmax(0, 100)
+    print("Entrer salaires des ouvriers")
+    salaires["Ouvriers"] = saisie_minmax(0,10000)
+    
+
+    return salaires, nb_commerciaux
+
+def saisir_scenario():
+    """
+    Demande au clavier toutes les valeurs d'un scénario.
+    Returns:
+        dict: Scénario décrit dans la documentation de modele.py.
+    """
+    salaires, nb_commerciaux = saisie_personnel()
+    return {
+        "salaires": salaires,
+        "nb_commerciaux": nb_commerciaux,
+        "couts_matieres": saisie_cout_matieres(),
+        "prix_vente": saisie_prix_vente(),
+        "coefficients": saisir_coefficients(),
+        "objectif": saisie_objectif_prod(),
+    }
+
+def afficher_resultats(resultats):
+    """
+    Affiche les résultats d'une résolution.
+    Args:
+        resultats (dict): Résultats renvoyés par extraire_resultats.
+    """
+    print("\n--- Produits finis à produire ---")
+    for prod, quantite in resultats["production"].items():
+        print(f"{prod:<10}: {quantite} unités")
+
+    machines = resultats["machines"]
+    print("\n--- Machines nécessaires ---")
+    print(f"Découpe     : {machines['decoupe']:.0f}")
+    print(f"Broyage     : {machines['broyage']:.0f}")
+    print(f"Cuisson     : {machines['cuisson']:.0f}")
+    print(f"Emballage   : {machines['emballage']:.0f}")
+    print(f"Total       : {sum(machines.values()):.0f}")
+
+    print("\n--- Consommation ---")
+    for c, nombre in resultats["carcasses"].items():
+        print(f"Carcasses {c:<8}: {nombre} unités")
+    for b, nombre in resultats["bobines"].items():
+        print(f"Bobines {b:<10}: {nombre} unités")
+
+    pertes = resultats["pertes"]
+    print("\n--- Pertes ---")
+    print(f"pertes chair porc       = {pertes['chair_porc']:.2f} kg")
+    print(f"pertes muscles porc     = {pertes['muscles']:.2f} kg")
+    print(f"pertes chair poulet     = {pertes['chair_poulet']:.2f} kg")
+    print(f"pertes cuisse poulet    = {pertes['cuisse']:.2f} kg")
+    print(f"pertes chair canard     = {pertes['chair_canard']:.2f} kg")
+    print(f"pertes poitrail canard  = {pertes['poitrail_canard']:.2f} kg")
+
+    effectifs = resultats["personnel"]
+    print("\n--- Personnel nécessaire ---")
+    print(f"Ouvriers           : {effectifs['Ouvriers']:.0f}")
+    print(f"Agents de Maîtrise : {effectifs['Agents_Maitrise']:.0f}")
+    print(f"Cadres Moyens      : {effectifs['Cadres_Moyens']:.0f}")
+    print(f"Commerciaux        : {effectifs['Commerciaux']}")
+    print(f"Assistants         : {effectifs['Assistants_Commerciaux']:.0f}")
+    print(f"Employés           : {effectifs['Employes']:.0f}")
+
+    print("\n--- Revenus ---")
+    print(f"Chiffre d'affaires : {resultats['revenu']:.2f} €")
+
+    charges = resultats["charges"]
+    print("\n--- Charges ---")
+    print(f"Pertes de carcasses : {charges['pertes']:.2f} €")
+    print(f"Matières premières  : {charges['matieres']:.2f} €")
+    print(f"Machines            : {charges['machines']:.2f} €")
+    print(f"Salaires            : {charges['salaires']:.2f} €" )
+
+    print(f"\nBénéfice mensuel maximum : {resultats['benefice']:.2f} €")
+
+    print(f"\nStatut de la solution : {resultats['statut']}")
+
+def afficher_diagnostic(diagnostic):
+    """
+    Affiche le diagnostic d'un problème sans solution.
+    Args:
+        diagnostic (dict): Diagnostic renvoyé par diagnostiquer (None s'il n'a pas été calculé).
+    """
+    if not diagnostic or "ecarts" not in diagnostic:
+        return
+    if diagnostic["ecarts"] is None:
+        print("Le problème reste sans solution même en relâchant les contraintes d'encadrement, de capacité et de matières.")
+        return
+    print("\n--- Contraintes incompatibles ---")
+    for nom in diagnostic["incompatibles"] or []:
+        print(nom)
+    print("\n--- Déplacement des seconds membres pour trouver une solution ---")
+    for nom, ecart in diagnostic["ecarts"].items():
+        print(f"{nom:<32}: {ecart:+.2f}")
+
+def saisir_modification():
+    """
+    Demande une modification du scénario, par exemple "prix_vente.Terrines=3.4", "objectif.Pate=80"
+    ou "limite_machines=40". Plusieurs modifications peuvent être séparées par des virgules.
+    Returns:
+        dict: Modifications saisies (None si la saisie est vide).
+    """
+    try:
+        texte = input("\nModification (ex. prix_vente.Terrines=3.4, Entrée pour terminer) : ").strip()
+    except EOFError:
+        return None
+    if not texte:
+        return None
+    modifications = {}
+    for element in texte.split(","):
+        cle, signe, valeur = element.partition("=")
+        if not signe:
+            print(f"Modification ignorée (cle=valeur attendu) : {element.strip()}")
+            continue
+        modifications[cle.strip()] = valeur.strip()
+    return modifications
+
+def afficher_differences(differences):
+    """
+    Affiche ce qui a changé depuis la résolution précédente.
+    Args:
+        differences (dict): Différences renvoyées par SessionOptimisation.modifier.
+    """
+    if not differences:
+        print("Aucun changement.")
+        return
+    for partie, valeurs in differences.items():
+        if partie in ("statut", "benefice"):
+            continue
+        print(f"\n--- {partie.capitalize()} ---")
+        for cle, valeur in valeurs.items():
+            print(f"{cle:<24}: {valeur['avant']} -> {valeur['apres']}")
+    if "statut" in differences:
+        print(f"\nStatut : {differences['statut']['avant']} -> {differences['statut']['apres']}")
+    if "benefice" in differences:
+        benefice = differences["benefice"]
+        if benefice["ecart"] is None:
+            print(f"\nBénéfice : {benefice['avant']} -> {benefice['apres']}")
+        else:
+            print(f"\nBénéfice : {benefice['avant']:.2f} € -> {benefice['apres']:.2f} € ({benefice['ecart']:+.2f} €)")
+
+def main(arguments=None):
+    """
+    Saisit un scénario, le résout et affiche les résultats, puis propose de modifier une valeur
+    à la fois : chaque modification est résolue à partir de la solution précédente et seules
+    les différences sont affichées.
+    Le modèle et le solveur ne sont chargés qu'une fois les saisies terminées. Le statut est
+    vérifié avant l'affichage : sans solution, le diagnostic du problème est affiché à la place.
+    La commande n'a pas d'option : tout argument est refusé.
+    """
+    parser = argparse.ArgumentParser(prog="python -m optimisation interactif",
+                                     description="Saisie d'un scénario au clavier puis résolution.")
+    parser.parse_args(arguments)
+    scenario = saisir_scenario()
+
+    from .modele import STATUTS_SOLUTION
+    from .session import SessionOptimisation
+    session = SessionOptimisation(scenario)
+    resultats = session.resoudre()
+
+    if resultats["statut"] not in STATUTS_SOLUTION:
+        print(f"\nStatut de la solution : {resultats['statut']}")
+        print("Aucune solution optimale trouvée.")
+        afficher_diagnostic(resultats.get("diagnostic"))
+        sys.exit()
+    afficher_resultats(resultats)
+    if resultats["statut"] != "Optimal":
+        print("Aucune solution optimale trouvée.")
+        sys.exit()
+
+    while True:
+        modifications = saisir_modification()
+        if modifications is None:
+            break
+        try:
+            differences = session.modifier(modifications)
+        except ValueError as erreur:
+            print(f"Modification refusée : {erreur}")
+            continue
+        afficher_differences(differences)
+        if session.resultats["statut"] not in STATUTS_SOLUTION:
+            afficher_diagnostic(session.resultats.get("diagnostic"))
+
+if __name__ == "__main__":
+    main()
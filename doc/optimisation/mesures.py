@@ -0,0 +1,218 @@
+"""
+Instrumentation des résolutions : durée de chaque étape, rapport structuré et export des mesures.
+
+Une résolution est découpée en étapes chronométrées :
+- "lecture" : lecture et validation du scénario ;
+- "cache" : recherche du scénario dans le cache des résultats ;
+- "construction" : construction ou mise à jour du modèle ;
+- "resolution" : appel du solveur (écriture du fichier, exécution, lecture de la solution) ;
+- "extraction" : lecture des valeurs des variables ;
+- "indicateurs" : calcul des pertes, effectifs, revenu, charges et bénéfice.
+
+Chaque résolution produit un RapportResolution (exportable en JSON lines) qui indique aussi, pour
+CBC, le nombre de nœuds explorés et l'écart d'optimalité relevés dans le journal du solveur.
+La classe Mesures agrège les rapports en compteurs et histogrammes au format texte de Prometheus.
+"""
+import json
+import re
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+ETAPES = ("lecture", "cache", "construction", "resolution", "extraction", "indicateurs", "diagnostic")
+
+# Bornes supérieures des classes des histogrammes
+BORNES_DUREES = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 60)
+BORNES_ECART = (0, 1e-6, 1e-4, 1e-3, 1e-2, 0.1)
+BORNES_NOEUDS = (0, 10, 100, 1000, 10000, 100000)
+
+# Lignes du résumé affiché par CBC en fin de résolution
+_MOTIFS_CBC = {
+    "objectif": re.compile(r"^Objective value:\s*(\S+)", re.MULTILINE),
+    "borne": re.compile(r"^(?:Upper|Lower) bound:\s*(\S+)", re.MULTILINE),
+    "nb_noeuds": re.compile(r"^Enumerated nodes:\s*(\d+)", re.MULTILINE),
+    "nb_iterations": re.compile(r"^Total iterations:\s*(\d+)", re.MULTILINE),
+}
+
+def lire_journal_cbc(chemin):
+    """
+    Relève dans le journal de CBC le nombre de nœuds, d'itérations et l'écart d'optimalité.
+    L'écart est recalculé à partir de la borne, CBC ne l'affichant qu'arrondi.
+    Args:
+        chemin (str): Journal écrit par CBC (option logPath de PULP_CBC_CMD).
+    Returns:
+        dict: "nb_noeuds", "nb_iterations" et "ecart_mip" (None pour une information absente).
+    """
+    try:
+        with open(chemin, encoding="utf-8", errors="replace") as f:
+            texte = f.read()
+    except OSError:
+        return {"nb_noeuds": None, "nb_iterations": None, "ecart_mip": None}
+    valeurs = {}
+    for nom, motif in _MOTIFS_CBC.items():
+        trouve = motif.findall(texte)
+        valeurs[nom] = float(trouve[-1]) if trouve else None
+    ecart = None
+    if valeurs["objectif"] is not None:
+        if valeurs["borne"] is None:
+            ecart = 0.0 if "Optimal solution found" in texte else None
+        else:
+            ecart = abs(valeurs["borne"] - valeurs["objectif"]) / max(1e-10, abs(valeurs["objectif"]))
+    return {
+        "nb_noeuds": None if valeurs["nb_noeuds"] is None else int(valeurs["nb_noeuds"]),
+        "nb_iterations": None if valeurs["nb_iterations"] is None else int(valeurs["nb_iterations"]),
+        "ecart_mip": ecart,
+    }
+
+class Chronometre:
+    """
+    Classe mesurant la durée des étapes d'une résolution.
+    Attributs:
+        durees (dict): Durée cumulée de chaque étape, en secondes.
+    """
+    def __init__(self):
+        self.durees = {}
+
+    @contextmanager
+    def etape(self, nom):
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durees[nom] = self.durees.get(nom, 0.0) + time.perf_counter() - debut
+
+class RapportResolution:
+    """
+    Classe regroupant le résultat d'une résolution et ses mesures.
+    Attributs:
+        id: Identifiant du scénario.
+        statut (str): Statut de la résolution.
+        benefice (float): Bénéfice obtenu (None sans solution).
+        durees (dict): Durée de chaque étape, en secondes.
+        nb_noeuds (int): Nœuds explorés par le solveur (None si inconnu ou résultat en cache).
+        nb_iterations (int): Itérations du simplexe (None si inconnu).
+        ecart_mip (float): Écart relatif entre la solution et la borne (None si inconnu).
+        depuis_cache (bool): True si le résultat provient du cache.
+        resultats (dict): Résultats détaillés renvoyés par extraire_resultats.
+    """
+    def __init__(self, id, statut, benefice, durees, nb_noeuds=None, nb_iterations=None,
+                 ecart_mip=None, depuis_cache=False, resultats=None):
+        self.id = id
+        self.statut = statut
+        self.benefice = benefice
+        self.durees = durees
+        self.nb_noeuds = nb_noeuds
+        self.nb_iterations = nb_iterations
+        self.ecart_mip = ecart_mip
+        self.depuis_cache = depuis_cache
+        self.resultats = resultats
+
+    def en_dict(self, detail=False):
+        """
+        Args:
+            detail (bool): Inclure les résultats détaillés.
+        Returns:
+            dict: Rapport sérialisable en JSON.
+        """
+        rapport = {
+            "id": self.id, "statut": self.statut, "benefice": self.benefice,
+            "durees": self.durees, "duree_totale": sum(self.durees.values()),
+            "nb_noeuds": self.nb_noeuds, "nb_iterations": self.nb_iterations,
+            "ecart_mip": self.ecart_mip, "depuis_cache": self.depuis_cache,
+        }
+        if detail:
+            rapport["resultats"] = self.resultats
+        return rapport
+
+    def en_json(self, detail=False):
+        return json.dumps(self.en_dict(detail), ensure_ascii=False)
+
+class Histogramme:
+    """
+    Classe représentant un histogramme cumulatif au sens de Prometheus.
+    """
+    def __init__(self, bornes):
+        self.bornes = tuple(bornes)
+        self.compteurs = [0] * (len(self.bornes) + 1)
+        self.somme = 0.0
+        self.nombre = 0
+
+    def observer(self, valeur):
+        self.compteurs[bisect_left(self.bornes, valeur)] += 1
+        self.somme += valeur
+        self.nombre += 1
+
+    def lignes(self, nom, etiquettes=""):
+        separateur = "," if etiquettes else ""
+        cumul = 0
+        for borne, compteur in zip(self.bornes + ("+Inf",), self.compteurs):
+            cumul += compteur
+            yield f'{nom}_bucket{{{etiquettes}{separateur}le="{borne}"}} {cumul}'
+        suffixe = f"{{{etiquettes}}}" if etiquettes else ""
+        yield f"{nom}_sum{suffixe} {self.somme}"
+        yield f"{nom}_count{suffixe} {self.nombre}"
+
+class Mesures:
+    """
+    Classe agrégeant les rapports de résolution en compteurs et histogrammes.
+    Attributs:
+        prefixe (str): Préfixe des noms de métriques.
+        resolutions (dict): Nombre de résolutions par statut.
+        durees (dict): Histogramme des durées par étape.
+        ecart_mip (Histogramme): Écart d'optimalité des résolutions effectuées par le solveur.
+        noeuds (Histogramme): Nœuds explorés par résolution.
+        nb_cache (int): Nombre de résultats servis par le cache.
+    """
+    def __init__(self, prefixe="optimisation"):
+        self.prefixe = prefixe
+        self.resolutions = {}
+        self.durees = {}
+        self.ecart_mip = Histogramme(BORNES_ECART)
+        self.noeuds = Histogramme(BORNES_NOEUDS)
+        self.nb_cache = 0
+
+    def enregistrer(self, rapport):
+        """
+        Ajoute un rapport aux compteurs et histogrammes.
+        Args:
+            rapport (RapportResolution): Rapport d'une résolution.
+        """
+        self.resolutions[rapport.statut] = self.resolutions.get(rapport.statut, 0) + 1
+        for etape, duree in rapport.durees.items():
+            self.durees.setdefault(etape, Histogramme(BORNES_DUREES)).observer(duree)
+        if rapport.depuis_cache:
+            self.nb_cache += 1
+        if rapport.ecart_mip is not None:
+            self.ecart_mip.observer(rapport.ecart_mip)
+        if rapport.nb_noeuds is not None:
+            self.noeuds.observer(rapport.nb_noeuds)
+
+    def exporter_prometheus(self):
+        """
+        Returns:
+            str: Métriques au format texte d'exposition de Prometheus.
+        """
+        p = self.prefixe
+        lignes = [
+            f"# HELP {p}_resolutions_total Nombre de scénarios traités, par statut.",
+            f"# TYPE {p}_resolutions_total counter",
+        ]
+        lignes += [f'{p}_resolutions_total{{statut="{statut}"}} {n}' for statut, n in sorted(self.resolutions.items())]
+        lignes += [
+            f"# HELP {p}_cache_total Nombre de résultats servis par le cache.",
+            f"# TYPE {p}_cache_total counter",
+            f"{p}_cache_total {self.nb_cache}",
+            f"# HELP {p}_duree_etape_secondes Durée de chaque étape d'une résolution.",
+            f"# TYPE {p}_duree_etape_secondes histogram",
+        ]
+        for etape in sorted(self.durees, key=lambda e: (ETAPES.index(e) if e in ETAPES else len(ETAPES), e)):
+            lignes += self.durees[etape].lignes(f"{p}_duree_etape_secondes", f'etape="{etape}"')
+        lignes += [
+            f"# HELP {p}_ecart_mip Écart relatif entre la solution et la borne du solveur.",
+            f"# TYPE {p}_ecart_mip histogram",
+            *self.ecart_mip.lignes(f"{p}_ecart_mip"),
+            f"# HELP {p}_noeuds Nœuds explorés par le solveur à chaque résolution.",
+            f"# TYPE {p}_noeuds histogram",
+            *self.noeuds.lignes(f"{p}_noeuds"),
+        ]
+        return "\n".join(lignes) + "\n"
@@ -0,0 +1,425 @@
+"""
+Construction et résolution du programme linéaire de maximisation du bénéfice.
+
+Le modèle est construit à partir d'un scénario (dictionnaire) sans aucune saisie clavier,
+ce qui permet de le piloter aussi bien depuis le script interactif que depuis un traitement par lot.
+Sa structure (variables et contraintes) est générée à partir des tableaux de DonneesUsine.
+
+Un scénario contient les clés suivantes :
+- "coefficients" : coefficient de marché de chaque produit (entre 0 et 2)
+- "objectif" : objectif de production de chaque produit (fraction entre 0 et 1)
+- "prix_vente" : prix de vente de chaque produit
+- "couts_matieres" : coût au kg des carcasses et bobines
+- "salaires" : salaire mensuel de chaque catégorie de personnel
+- "nb_commerciaux" : nombre de commerciaux
+"""
+from math import ceil
+
+import numpy as np
+from pulp import (LpProblem, LpMaximize, LpVariable, LpAffineExpression, LpConstraint, LpConstraintLE,
+                  LpStatus, LpStatusOptimal, LpSolutionIntegerFeasible, lpSum)
+
+from .donnees import donnees_reference
+from .solveurs import strategie
+
+# Statuts pour lesquels le solveur a fourni une solution
+STATUTS_SOLUTION = ("Optimal", "Realisable")
+
+# Version de la formulation, à incrémenter à chaque changement du modèle (invalide le cache des résultats)
+VERSION_MODELE = 2
+
+class Modele:
+    """
+    Classe regroupant le problème PuLP et les variables et expressions nécessaires à la lecture des résultats.
+    Attributs:
+        problem (LpProblem): Problème de maximisation du bénéfice.
+        donnees (DonneesUsine): Données de l'usine ayant servi à la construction.
+        x (dict): Variables de production par produit.
+        machines (dict): Variables du nombre de machines par type.
+        sources (dict): Variables du nombre de carcasses et de bobines, par clé de source.
+        carcasses (dict): Variables du nombre de carcasses par animal.
+        bobines (dict): Variables du nombre de bobines par matière.
+        personnel (dict): Variables et expressions des effectifs par catégorie.
+        pertes (dict): Expressions des pertes (kg) par matière issue des carcasses.
+        revenu, cout_matieres, cout_mensuel_total, cout_pertes, cout_salaries: Expressions du compte de résultat.
+    """
+    def __init__(self, problem, donnees, x, machines, sources, personnel, pertes, cout_mensuel_total):
+        self.problem = problem
+        self.donnees = donnees
+        self.x = x
+        self.machines = machines
+        self.sources = sources
+        self.carcasses = {c: sources[c] for c in donnees.carcasses}
+        self.bobines = {b: sources[b] for b in donnees.bobines}
+        self.personnel = personnel
+        self.pertes = pertes
+        self.cout_mensuel_total = cout_mensuel_total
+        self.revenu = None
+        self.cout_matieres = None
+        self.cout_pertes = None
+        self.cout_salaries = None
+
+def demande_maximale(coefficients, donnees=None):
+    """
+    Calcule la demande maximale du marché pour chaque produit.
+    Args:
+        coefficients (dict): Coefficient de marché de chaque produit.
+        donnees (DonneesUsine): Données de l'usine (usine de référence par défaut).
+    Returns:
+        dict: Demande maximale de chaque produit (demande de base multipliée par le coefficient).
+    """
+    donnees = donnees or donnees_reference()
+    return {p: base * coefficients[p] for p, base in zip(donnees.produits, donnees.demande_base.tolist())}
+
+def _expression(variables, coefficients, constante=0.0):
+    """
+    Construit l'expression (coefficients . variables + constante) en ne gardant que les coefficients non nuls.
+    """
+    indices = np.flatnonzero(coefficients)
+    return LpAffineExpression(zip([variables[i] for i in indices], coefficients[indices].tolist()), constante)
+
+def _expressions_par_ligne(nb_lignes, *blocs):
+    """
+    Construit une expression par ligne d'une matrice par blocs [A1 A2 ...] appliquée aux variables [v1 v2 ...].
+    Les coefficients non nuls de chaque bloc sont extraits en une fois : le travail fait en Python
+    est proportionnel au nombre de coefficients non nuls, pas à la taille des matrices.
+    Args:
+        nb_lignes (int): Nombre de lignes commun à tous les blocs.
+        blocs: Couples (matrice, liste de variables correspondant à ses colonnes).
+    Returns:
+        list: Une LpAffineExpression par ligne.
+    """
+    lignes, variables, valeurs = [], [], []
+    for matrice, variables_bloc in blocs:
+        i, j = np.nonzero(matrice)
+        lignes.append(i)
+        valeurs.append(matrice[i, j])
+        variables.append(np.array(variables_bloc, dtype=object)[j])
+    lignes = np.concatenate(lignes)
+    ordre = np.argsort(lignes, kind="stable")
+    variables = np.concatenate(variables)[ordre].tolist()
+    valeurs = np.concatenate(valeurs)[ordre].tolist()
+    debuts = np.searchsorted(lignes[ordre], np.arange(nb_lignes + 1)).tolist()
+    return [LpAffineExpression(zip(variables[a:b], valeurs[a:b])) for a, b in zip(debuts[:-1], debuts[1:])]
+
+def construire_structure(donnees=None):
+    """
+    Construit les variables, les expressions et les contraintes qui ne dépendent pas du scénario.
+    Les seconds membres dépendant du scénario sont laissés à zéro et la fonction objectif est vide :
+    appliquer_parametres doit être appelée avant la résolution.
+    Args:
+        donnees (DonneesUsine): Données de l'usine (usine de référence par défaut).
+    Returns:
+        Modele: Structure du problème.
+    """
+    donnees = donnees or donnees_reference()
+    K, S, M = len(donnees.machines), len(donnees.sources), len(donnees.matieres)
+
+    problem = LpProblem("Maximisation_du_Benefice", LpMaximize)
+
+    # Variables de production, de machines, de carcasses et de bobines
+    x = [LpVariable(f"x_{p}", cat="Integer") for p in donnees.produits]
+    m = [LpVariable(f"m_{k}", cat="Integer") for k in donnees.machines]
+    s = [LpVariable(f"{'carcasses' if carcasse else 'bobines'}_{nom}", cat="Continuous")
+         for nom, carcasse in zip(donnees.sources, donnees.est_carcasse)]
+
+    # Variables de personnel
+    nb_agents_maitrise = LpVariable("nb_agents_maitrise", cat="Integer")
+    nb_cadres = LpVariable("nb_cadres", cat="Integer")
+    nb_employes = LpVariable("nb_employes", cat="Integer")
+    nb_assistants = LpVariable("nb_assistants", cat="Integer")
+
+    cout_mensuel_total = _expression(m, donnees.cout_machines)
+    nb_ouvriers = _expression(m, donnees.ouvriers_machines)
+
+    # Pertes : matière disponible (carcasses) moins matière consommée (recettes), pour les matières de carcasses
+    carcasses = [i for i, j in enumerate(donnees.source_matiere) if donnees.est_carcasse[j]]
+    pertes = _expressions_par_ligne(len(carcasses), (donnees.rendements.T[carcasses], s),
+                                    (-donnees.recettes.T[carcasses], x))
+
+    # === Contraintes ===
+    # Les seconds membres des contraintes de demande et la part des commerciaux dans l'encadrement
+    # dépendent du scénario : ils sont fixés par appliquer_parametres.
+
+    # Contraintes de demande maximale pour chaque produit
+    for p, variable in zip(donnees.produits, x):
+        problem += variable <= 0, f"Demande_{p}"
+
+    # Limite totale de machines
+    problem += lpSum(m) <= donnees.limite_machines, "Limite_machines"
+
+    # Capacité des machines : charge des produits et des sources <= nombre de machines
+    capacites = _expressions_par_ligne(K, (donnees.charge_produits, x), (-np.eye(K), m), (donnees.charge_sources, s))
+    for k, expression in zip(donnees.machines, capacites):
+        problem.addConstraint(LpConstraint(expression, LpConstraintLE, f"Capacite_{k}", 0))
+
+    # Matières premières : besoin des recettes <= matière fournie par les carcasses et les bobines
+    matieres = _expressions_par_ligne(M, (donnees.recettes.T, x), (-donnees.rendements.T, s))
+    for matiere, expression in zip(donnees.matieres, matieres):
+        problem.addConstraint(LpConstraint(expression, LpConstraintLE, f"MP_{matiere}", 0))
+
+    # Encadrement (hors commerciaux)
+    problem += nb_agents_maitrise >= nb_ouvriers / 5, "Encadrement_par_agents_maitrise"
+    problem += nb_cadres >= (nb_agents_maitrise + nb_ouvriers) / 18, "Encadrement_par_cadres"
+    problem += nb_assistants >= 0, "Assistants commerciaux"
+    problem += nb_employes >= (nb_ouvriers + nb_agents_maitrise + nb_cadres + nb_assistants) / 15, "Encadrement_global"
+
+    personnel = {
+        "Ouvriers": nb_ouvriers,
+        "Agents_Maitrise": nb_agents_maitrise,
+        "Cadres_Moyens": nb_cadres,
+        "Commerciaux": None,
+        "Assistants_Commerciaux": nb_assistants,
+        "Employes": nb_employes,
+    }
+    return Modele(
+        problem, donnees, dict(zip(donnees.produits, x)), dict(zip(donnees.machines, m)),
+        dict(zip(donnees.sources, s)), personnel,
+        {donnees.matieres[i]: perte for i, perte in zip(carcasses, pertes)}, cout_mensuel_total,
+    )
+
+# Contraintes d'encadrement et effectif que chacune détermine, dans l'ordre de calcul
+ENCADREMENT = (
+    ("Encadrement_par_agents_maitrise", "Agents_Maitrise"),
+    ("Encadrement_par_cadres", "Cadres_Moyens"),
+    ("Assistants_commerciaux", "Assistants_Commerciaux"),
+    ("Encadrement_global", "Employes"),
+)
+
+def contraintes_dimensionnement(modele):
+    """
+    Renvoie les contraintes qui fixent le nombre de machines et les effectifs, chacune avec la
+    variable entière qu'elle détermine : la capacité de chaque machine (production et consommation
+    données), puis l'encadrement, dans l'ordre où chaque effectif se déduit des précédents.
+    Args:
+        modele (Modele): Modèle construit par construire_structure.
+    Returns:
+        list: Couples (contrainte, variable).
+    """
+    contraintes = modele.problem.constraints
+    couples = [(contraintes[f"Capacite_{k}"], variable) for k, variable in modele.machines.items()]
+    couples += [(contraintes[nom], modele.personnel[categorie]) for nom, categorie in ENCADREMENT]
+    return couples
+
+def decisions_positives(modele):
+    """
+    Borne à zéro la production, la consommation, les machines et les effectifs, comme en
+    planification multi-période (le modèle mensuel admet des valeurs négatives).
+    Args:
+        modele (Modele): Modèle à modifier.
+    """
+    personnel = modele.personnel
+    decisions = [*modele.x.values(), *modele.sources.values(), *modele.machines.values(),
+                 *(personnel[c] for c in personnel if c not in ("Ouvriers", "Commerciaux"))]
+    for variable in decisions:
+        variable.lowBound = 0
+
+def seconds_membres(scenario, donnees=None):
+    """
+    Calcule les constantes des contraintes qui dépendent du scénario.
+    PuLP stocke une contrainte sous la forme "expression + constante <= 0" (ou >= 0) :
+    la constante vaut donc l'opposé du second membre.
+    Args:
+        scenario (dict): Scénario à appliquer.
+        donnees (DonneesUsine): Données de l'usine (usine de référence par défaut).
+    Returns:
+        dict: Constante de chaque contrainte, indexée par son nom.
+    """
+    demande_max = demande_maximale(scenario["coefficients"], donnees)
+    objectif = scenario["objectif"]
+    nb_commerciaux = scenario["nb_commerciaux"]
+    constantes = {f"Demande_{prod}": -demande_max[prod] * objectif[prod] for prod in demande_max}
+    constantes["Encadrement_par_cadres"] = -nb_commerciaux / 18
+    constantes["Assistants_commerciaux"] = -nb_commerciaux / 5
+    constantes["Encadrement_global"] = -(nb_commerciaux + 1) / 15
+    return constantes
+
+def coefficients_pertes(donnees, couts_kg):
+    """
+    Développe le coût des pertes sur les variables de sources et de production.
+    Chaque kg perdu est valorisé au prix de la carcasse ramené à la part de la matière :
+    + valeur * rendement pour la source, - valeur * recette pour les produits.
+    Args:
+        donnees (DonneesUsine): Données de l'usine.
+        couts_kg (ndarray): Coût au kg de chaque source (S).
+    Returns:
+        tuple: Coefficients des sources (S) et des produits (P) dans le coût des pertes.
+    """
+    carcasses = [i for i, j in enumerate(donnees.source_matiere) if donnees.est_carcasse[j]]
+    origine = donnees.source_matiere[carcasses]
+    rendement = donnees.rendements[origine, carcasses]
+    valeur_kg = donnees.poids_sources[origine] * couts_kg[origine] / rendement * 1000
+    coef_sources = np.bincount(origine, weights=valeur_kg * rendement, minlength=len(donnees.sources))
+    coef_produits = donnees.recettes[:, carcasses] @ valeur_kg
+    return coef_sources, coef_produits
+
+def appliquer_parametres(modele, scenario):
+    """
+    Applique un scénario à un modèle déjà construit : la fonction objectif (prix, coûts, salaires)
+    est recalculée sur les variables existantes et seuls les seconds membres des contraintes
+    dépendant du scénario sont modifiés.
+    Args:
+        modele (Modele): Modèle renvoyé par construire_structure.
+        scenario (dict): Scénario décrit dans la documentation du module.
+    """
+    donnees = modele.donnees
+    salaires = scenario["salaires"]
+    nb_commerciaux = scenario["nb_commerciaux"]
+    prix_vente = np.array([scenario["prix_vente"][p] for p in donnees.produits])
+    couts_kg = np.array([scenario["couts_matieres"][s] for s in donnees.sources])
+    x = list(modele.x.values())
+    sources = list(modele.sources.values())
+    personnel = modele.personnel
+
+    # === Fonction objectif ===
+    modele.revenu = _expression(x, prix_vente)
+
+    # Coût total des matières premières
+    cout_source = donnees.poids_sources * couts_kg
+    modele.cout_matieres = _expression(sources, cout_source)
+
+    # Coût des pertes
+    coef_sources, coef_produits = coefficients_pertes(donnees, couts_kg)
+    modele.cout_pertes = _expression(sources, coef_sources) - _expression(x, coef_produits)
+
+    # Coût total des salaires
+    personnel["Commerciaux"] = nb_commerciaux
+    modele.cout_salaries = (
+        personnel["Ouvriers"] * salaires["Ouvriers"] +
+        personnel["Agents_Maitrise"] * salaires["Agents_Maitrise"] +
+        personnel["Cadres_Moyens"] * salaires["Cadres_Moyens"] +
+        nb_commerciaux * salaires["Commerciaux"] +
+        personnel["Assistants_Commerciaux"] * salaires["Assistants_Commerciaux"] +
+        personnel["Employes"] * salaires["Employes"] +
+        salaires["Dirigeants"]
+    )
+
+    # Calcul du bénéfice
+    modele.problem.setObjective(modele.revenu - modele.cout_matieres - modele.cout_mensuel_total
+                                - modele.cout_pertes - modele.cout_salaries)
+    modele.problem.objective.name = "Bénéfice_net"
+
+    # === Seconds membres ===
+    for nom, constante in seconds_membres(scenario, donnees).items():
+        modele.problem.constraints[nom].constant = constante
+
+def construire_probleme(scenario, donnees=None):
+    """
+    Construit le programme linéaire correspondant à un scénario.
+    Args:
+        scenario (dict): Scénario décrit dans la documentation du module.
+        donnees (DonneesUsine): Données de l'usine (usine de référence par défaut).
+    Returns:
+        Modele: Problème prêt à être résolu.
+    """
+    modele = construire_structure(donnees)
+    appliquer_parametres(modele, scenario)
+    return modele
+
+def _valeur(element):
+    """
+    Renvoie la valeur d'une variable, d'une expression PuLP ou d'une constante.
+    Returns:
+        float | None: Valeur, ou None si le solveur n'a pas fourni de solution.
+    """
+    if hasattr(element, "value"):
+        return element.value()
+    return element
+
+def _arrondi_superieur(valeur):
+    return None if valeur is None else ceil(valeur)
+
+def statut_resolution(problem):
+    """
+    Renvoie le statut du problème résolu. PuLP donne le statut "Optimal" à une solution trouvée
+    avant la limite de temps : elle est signalée "Realisable", son optimalité n'étant pas prouvée.
+    """
+    if problem.status == LpStatusOptimal and problem.sol_status == LpSolutionIntegerFeasible:
+        return "Realisable"
+    return LpStatus[problem.status]
+
+def lire_solution(modele):
+    """
+    Lit le statut et les valeurs des variables du problème résolu.
+    Le statut est lu en premier : sans solution (problème infaisable, non borné ou non résolu),
+    les valeurs laissées dans les variables n'ont pas de sens et sont remplacées par None.
+    Args:
+        modele (Modele): Modèle dont le problème a été résolu.
+    Returns:
+        dict: Statut, production, machines et consommation (arrondie à l'unité supérieure).
+    """
+    statut = statut_resolution(modele.problem)
+    if statut not in STATUTS_SOLUTION:
+        return {
+            "statut": statut,
+            **{partie: dict.fromkeys(variables) for partie, variables in (
+                ("production", modele.x), ("machines", modele.machines),
+                ("carcasses", modele.carcasses), ("bobines", modele.bobines))},
+        }
+    return {
+        "statut": statut,
+        "production": {p: v.varValue for p, v in modele.x.items()},
+        "machines": {m: v.varValue for m, v in modele.machines.items()},
+        "carcasses": {c: _arrondi_superieur(v.varValue) for c, v in modele.carcasses.items()},
+        "bobines": {b: _arrondi_superieur(v.varValue) for b, v in modele.bobines.items()},
+    }
+
+def calculer_indicateurs(modele):
+    """
+    Évalue les expressions du compte de résultat sur la solution du problème résolu.
+    Args:
+        modele (Modele): Modèle dont le problème a été résolu.
+    Returns:
+        dict: Pertes, personnel, revenu, charges et bénéfice (None sans solution, sauf les commerciaux).
+    """
+    if statut_resolution(modele.problem) not in STATUTS_SOLUTION:
+        return {
+            "pertes": dict.fromkeys(modele.pertes),
+            "personnel": {c: _valeur(e) if c == "Commerciaux" else None for c, e in modele.personnel.items()},
+            "revenu": None,
+            "charges": dict.fromkeys(("pertes", "matieres", "machines", "salaires")),
+            "benefice": None,
+        }
+    return {
+        "pertes": {m: _valeur(e) for m, e in modele.pertes.items()},
+        "personnel": {c: _valeur(e) for c, e in modele.personnel.items()},
+        "revenu": _valeur(modele.revenu),
+        "charges": {
+            "pertes": _valeur(modele.cout_pertes),
+            "matieres": _valeur(modele.cout_matieres),
+            "machines": _valeur(modele.cout_mensuel_total),
+            "salaires": _valeur(modele.cout_salaries),
+        },
+        "benefice": modele.problem.objective.value(),
+    }
+
+def extraire_resultats(modele):
+    """
+    Lit la solution du problème résolu.
+    Args:
+        modele (Modele): Modèle dont le problème a été résolu.
+    Returns:
+        dict: Statut, production, machines, consommation (arrondie à l'unité supérieure), pertes,
+              personnel, revenu, charges et bénéfice.
+    """
+    return {**lire_solution(modele), **calculer_indicateurs(modele)}
+
+def resoudre_scenario(scenario, solveur=None, donnees=None):
+    """
+    Construit puis résout le problème d'un scénario. Sans solution, les résultats contiennent
+    aussi le diagnostic du problème (voir diagnostic.py).
+    Args:
+        scenario (dict): Scénario à résoudre.
+        solveur: Solveur PuLP ou StrategieResolution à utiliser (CBC silencieux par défaut).
+        donnees (DonneesUsine): Données de l'usine (usine de référence par défaut).
+    Returns:
+        dict: Résultats tels que renvoyés par extraire_resultats.
+    """
+    modele = construire_probleme(scenario, donnees)
+    resolution = strategie(solveur)
+    resolution.resoudre(modele)
+    resultats = extraire_resultats(modele)
+    if resultats["statut"] not in STATUTS_SOLUTION:
+        from .diagnostic import diagnostiquer
+        resultats["diagnostic"] = diagnostiquer(modele, resolution.solveur)
+    return resultats
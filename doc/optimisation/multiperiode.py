@@ -0,0 +1,263 @@
+"""
+Planification sur plusieurs mois avec stocks reportés d'un mois sur l'autre.
+
+Chaque mois a son propre scénario (demande, prix, coûts, salaires, commerciaux). Par rapport au
+modèle mensuel :
+- la production d'un mois peut être vendue plus tard : un stock de produits finis est reporté ;
+- les bobines achetées alimentent un stock de matière (kg) reporté d'un mois sur l'autre ;
+- le parc de machines d'un mois est celui du mois précédent plus les ajouts moins les retraits ;
+- les carcasses restent consommées dans le mois où elles sont achetées.
+
+Production, ventes, stocks, machines et achats sont positifs. Le stockage coûte chaque mois une
+fraction (taux_stockage) du prix de vente des produits et du coût des bobines en stock.
+
+Le mode glissant (planifier_glissant) résout des fenêtres de quelques mois, fige les premiers mois
+de chaque fenêtre et repart de l'état obtenu : la taille de chaque problème ne dépend pas de l'horizon.
+"""
+import numpy as np
+from pulp import LpProblem, LpMaximize, LpVariable, LpConstraint, LpConstraintLE, LpConstraintEQ, lpSum
+
+from .donnees import donnees_reference
+from .modele import (STATUTS_SOLUTION, _expression, _expressions_par_ligne, _valeur, _arrondi_superieur,
+                     coefficients_pertes, demande_maximale, statut_resolution)
+from .solveurs import strategie
+
+class ModeleMultiPeriode:
+    """
+    Classe représentant le problème de planification sur plusieurs mois.
+    Attributs:
+        problem (LpProblem): Problème de maximisation du bénéfice cumulé.
+        donnees (DonneesUsine): Données de l'usine.
+        periodes (list): Pour chaque mois, dictionnaire des variables et expressions du mois.
+        x (dict): Variables de production, par (produit, mois) (utilisées par le mode de résolution rapide).
+    """
+    def __init__(self, scenarios, donnees=None, taux_stockage=0.01, cout_changement_machine=0.0,
+                 etat_initial=None):
+        """
+        Args:
+            scenarios (list): Un scénario par mois.
+            donnees (DonneesUsine): Données de l'usine (usine de référence par défaut).
+            taux_stockage (float): Coût mensuel du stock, en fraction de sa valeur.
+            cout_changement_machine (float): Coût d'ajout ou de retrait d'une machine.
+            etat_initial (dict): Stocks et parc de machines au début du premier mois
+                ("stock_produits", "stock_bobines", "machines"). Sans parc initial, le parc
+                du premier mois est libre.
+        """
+        self.donnees = donnees = donnees or donnees_reference()
+        etat_initial = etat_initial or {}
+        self.problem = LpProblem("Planification_multi_periode", LpMaximize)
+        self.periodes = []
+        self.x = {}
+
+        bobines = np.flatnonzero(~donnees.est_carcasse)
+        matieres_carcasses = [i for i, j in enumerate(donnees.source_matiere) if donnees.est_carcasse[j]]
+        matieres_bobines = [int(np.flatnonzero(donnees.rendements[b])[0]) for b in bobines]
+        K = len(donnees.machines)
+
+        stock_produits_prec = [etat_initial.get("stock_produits", {}).get(p, 0) for p in donnees.produits]
+        stock_bobines_prec = [etat_initial.get("stock_bobines", {}).get(donnees.sources[b], 0) for b in bobines]
+        machines_prec = None
+        if etat_initial.get("machines") is not None:
+            machines_prec = [etat_initial["machines"][k] for k in donnees.machines]
+
+        objectif = []
+        for t, scenario in enumerate(scenarios):
+            prix = np.array([scenario["prix_vente"][p] for p in donnees.produits])
+            couts_kg = np.array([scenario["couts_matieres"][s] for s in donnees.sources])
+            salaires = scenario["salaires"]
+            nb_commerciaux = scenario["nb_commerciaux"]
+            demande_max = demande_maximale(scenario["coefficients"], donnees)
+
+            x = [LpVariable(f"x_{p}_{t}", lowBound=0, cat="Integer") for p in donnees.produits]
+            ventes = [LpVariable(f"ventes_{p}_{t}", lowBound=0) for p in donnees.produits]
+            stock_produits = [LpVariable(f"stock_{p}_{t}", lowBound=0) for p in donnees.produits]
+            m = [LpVariable(f"m_{k}_{t}", lowBound=0, cat="Integer") for k in donnees.machines]
+            sources = [LpVariable(f"{'carcasses' if c else 'achats_bobines'}_{s}_{t}", lowBound=0)
+                       for s, c in zip(donnees.sources, donnees.est_carcasse)]
+            stock_bobines = [LpVariable(f"stock_bobines_{donnees.sources[b]}_{t}", lowBound=0) for b in bobines]
+            self.x.update(((p, t), variable) for p, variable in zip(donnees.produits, x))
+            nb_agents_maitrise = LpVariable(f"nb_agents_maitrise_{t}", cat="Integer")
+            nb_cadres = LpVariable(f"nb_cadres_{t}", cat="Integer")
+            nb_employes = LpVariable(f"nb_employes_{t}", cat="Integer")
+            nb_assistants = LpVariable(f"nb_assistants_{t}", cat="Integer")
+            nb_ouvriers = _expression(m, donnees.ouvriers_machines)
+
+            # Demande et stock de produits finis
+            for i, p in enumerate(donnees.produits):
+                self.problem += ventes[i] <= demande_max[p] * scenario["objectif"][p], f"Demande_{p}_{t}"
+                self.problem += (stock_produits[i] == stock_produits_prec[i] + x[i] - ventes[i],
+                                 f"Stock_{p}_{t}")
+
+            # Parc de machines reporté du mois précédent
+            changements = []
+            if machines_prec is not None:
+                for k in range(K):
+                    ajout = LpVariable(f"ajout_{donnees.machines[k]}_{t}", lowBound=0, cat="Integer")
+                    retrait = LpVariable(f"retrait_{donnees.machines[k]}_{t}", lowBound=0, cat="Integer")
+                    self.problem += m[k] == machines_prec[k] + ajout - retrait, f"Parc_{donnees.machines[k]}_{t}"
+                    changements += [ajout, retrait]
+            self.problem += lpSum(m) <= donnees.limite_machines, f"Limite_machines_{t}"
+
+            # Capacité des machines
+            capacites = _expressions_par_ligne(K, (donnees.charge_produits, x), (-np.eye(K), m),
+                                               (donnees.charge_sources, sources))
+            for k, expression in zip(donnees.machines, capacites):
+                self.problem.addConstraint(LpConstraint(expression, LpConstraintLE, f"Capacite_{k}_{t}", 0))
+
+            # Matières issues des carcasses, consommées dans le mois
+            besoins = _expressions_par_ligne(len(donnees.matieres), (donnees.recettes.T, x))
+            disponibles = _expressions_par_ligne(len(donnees.matieres), (donnees.rendements.T, sources))
+            for i in matieres_carcasses:
+                self.problem += besoins[i] <= disponibles[i], f"MP_{donnees.matieres[i]}_{t}"
+
+            # Matières des bobines : stock (kg) reporté d'un mois sur l'autre
+            for r, (b, i) in enumerate(zip(bobines, matieres_bobines)):
+                self.problem.addConstraint(LpConstraint(
+                    stock_bobines[r] - stock_bobines_prec[r] - disponibles[i] + besoins[i],
+                    LpConstraintEQ, f"Stock_bobines_{donnees.sources[b]}_{t}", 0))
+
+            # Encadrement
+            self.problem += nb_agents_maitrise >= nb_ouvriers / 5, f"Encadrement_par_agents_maitrise_{t}"
+            self.problem += nb_cadres >= (nb_agents_maitrise + nb_commerciaux + nb_ouvriers) / 18, f"Encadrement_par_cadres_{t}"
+            self.problem += nb_assistants >= nb_commerciaux / 5, f"Assistants_commerciaux_{t}"
+            self.problem += nb_employes >= (nb_ouvriers + nb_agents_maitrise + nb_cadres + nb_commerciaux + nb_assistants + 1) / 15, f"Encadrement_global_{t}"
+
+            # Compte de résultat du mois
+            coef_sources, coef_produits = coefficients_pertes(donnees, couts_kg)
+            periode = {
+                "x": x, "ventes": ventes, "stock_produits": stock_produits, "machines": m,
+                "sources": sources, "stock_bobines": stock_bobines,
+                "personnel": {
+                    "Ouvriers": nb_ouvriers, "Agents_Maitrise": nb_agents_maitrise, "Cadres_Moyens": nb_cadres,
+                    "Commerciaux": nb_commerciaux, "Assistants_Commerciaux": nb_assistants, "Employes": nb_employes,
+                },
+                "pertes": dict(zip([donnees.matieres[i] for i in matieres_carcasses],
+                                   [disponibles[i] - besoins[i] for i in matieres_carcasses])),
+                "revenu": _expression(ventes, prix),
+                "cout_matieres": _expression(sources, donnees.poids_sources * couts_kg),
+                "cout_machines": _expression(m, donnees.cout_machines),
+                "cout_pertes": _expression(sources, coef_sources) - _expression(x, coef_produits),
+                "cout_salaries": (
+                    nb_ouvriers * salaires["Ouvriers"] + nb_agents_maitrise * salaires["Agents_Maitrise"] +
+                    nb_cadres * salaires["Cadres_Moyens"] + nb_commerciaux * salaires["Commerciaux"] +
+                    nb_assistants * salaires["Assistants_Commerciaux"] + nb_employes * salaires["Employes"] +
+                    salaires["Dirigeants"]
+                ),
+                "cout_stockage": taux_stockage * (_expression(stock_produits, prix)
+                                                  + _expression(stock_bobines, couts_kg[bobines])),
+                "cout_changements": cout_changement_machine * lpSum(changements),
+            }
+            periode["benefice"] = (periode["revenu"] - periode["cout_matieres"] - periode["cout_machines"]
+                                   - periode["cout_pertes"] - periode["cout_salaries"]
+                                   - periode["cout_stockage"] - periode["cout_changements"])
+            objectif.append(periode["benefice"])
+            self.periodes.append(periode)
+
+            stock_produits_prec, stock_bobines_prec, machines_prec = stock_produits, stock_bobines, m
+
+        self.problem += lpSum(objectif), "Bénéfice_cumulé"
+
+    def resoudre(self, solveur=None):
+        """
+        Résout le problème et renvoie le plan mois par mois.
+        Args:
+            solveur: Solveur PuLP ou StrategieResolution à utiliser (CBC silencieux par défaut).
+        Returns:
+            dict: Statut, bénéfice cumulé, liste des résultats mensuels et état en fin d'horizon
+                  (bénéfice et état None, aucun mois sans solution).
+        """
+        strategie(solveur).resoudre(self)
+        statut = statut_resolution(self.problem)
+        if statut not in STATUTS_SOLUTION:
+            return {"statut": statut, "benefice": None, "periodes": [], "etat_final": None}
+        return {
+            "statut": statut,
+            "benefice": self.problem.objective.value(),
+            "periodes": [self._resultats_periode(t) for t in range(len(self.periodes))],
+            "etat_final": self.etat(len(self.periodes) - 1),
+        }
+
+    def etat(self, t):
+        """
+        Renvoie les stocks et le parc de machines à la fin du mois t, utilisables comme état initial.
+        """
+        donnees, periode = self.donnees, self.periodes[t]
+        return {
+            "stock_produits": {p: v.varValue for p, v in zip(donnees.produits, periode["stock_produits"])},
+            "stock_bobines": {b: v.varValue for b, v in zip(donnees.bobines, periode["stock_bobines"])},
+            "machines": {k: v.varValue for k, v in zip(donnees.machines, periode["machines"])},
+        }
+
+    def _resultats_periode(self, t):
+        donnees, periode = self.donnees, self.periodes[t]
+        nb_carcasses = len(donnees.carcasses)
+        return {
+            "production": {p: v.varValue for p, v in zip(donnees.produits, periode["x"])},
+            "ventes": {p: v.varValue for p, v in zip(donnees.produits, periode["ventes"])},
+            "machines": {k: v.varValue for k, v in zip(donnees.machines, periode["machines"])},
+            "carcasses": {c: _arrondi_superieur(v.varValue)
+                          for c, v in zip(donnees.carcasses, periode["sources"][:nb_carcasses])},
+            "bobines": {b: _arrondi_superieur(v.varValue)
+                        for b, v in zip(donnees.bobines, periode["sources"][nb_carcasses:])},
+            "pertes": {m: _valeur(e) for m, e in periode["pertes"].items()},
+            "personnel": {c: _valeur(e) for c, e in periode["personnel"].items()},
+            "revenu": _valeur(periode["revenu"]),
+            "charges": {
+                "pertes": _valeur(periode["cout_pertes"]),
+                "matieres": _valeur(periode["cout_matieres"]),
+                "machines": _valeur(periode["cout_machines"]),
+                "salaires": _valeur(periode["cout_salaries"]),
+                "stockage": _valeur(periode["cout_stockage"]),
+                "changements": _valeur(periode["cout_changements"]),
+            },
+            "benefice": _valeur(periode["benefice"]),
+            **{cle: valeur for cle, valeur in self.etat(t).items() if cle != "machines"},
+        }
+
+def planifier(scenarios, donnees=None, taux_stockage=0.01, cout_changement_machine=0.0,
+              etat_initial=None, solveur=None):
+    """
+    Résout la planification sur tout l'horizon en un seul problème.
+    Args:
+        scenarios (list): Un scénario par mois.
+        Les autres arguments sont ceux de ModeleMultiPeriode.
+    Returns:
+        dict: Résultats renvoyés par ModeleMultiPeriode.resoudre.
+    """
+    modele = ModeleMultiPeriode(scenarios, donnees, taux_stockage, cout_changement_machine, etat_initial)
+    return modele.resoudre(solveur)
+
+def planifier_glissant(scenarios, fenetre=3, pas=1, donnees=None, taux_stockage=0.01,
+                       cout_changement_machine=0.0, etat_initial=None, solveur=None):
+    """
+    Résout la planification par fenêtres glissantes : chaque fenêtre de quelques mois est résolue,
+    ses premiers mois sont figés et la fenêtre suivante repart de l'état obtenu.
+    Args:
+        scenarios (list): Un scénario par mois.
+        fenetre (int): Nombre de mois de chaque problème.
+        pas (int): Nombre de mois figés après chaque résolution.
+        Les autres arguments sont ceux de ModeleMultiPeriode.
+    Returns:
+        dict: Statut (le plus mauvais des fenêtres), bénéfice cumulé, résultats mensuels et état final.
+    """
+    pas = max(1, min(pas, fenetre))
+    periodes, statut, etat = [], "Optimal", etat_initial
+    for debut in range(0, len(scenarios), pas):
+        modele = ModeleMultiPeriode(scenarios[debut:debut + fenetre], donnees, taux_stockage,
+                                    cout_changement_machine, etat)
+        resultats = modele.resoudre(solveur)
+        if resultats["statut"] not in STATUTS_SOLUTION:
+            statut = resultats["statut"]
+            break
+        if resultats["statut"] == "Realisable":
+            statut = "Realisable"
+        figes = min(pas, len(scenarios) - debut)
+        periodes += resultats["periodes"][:figes]
+        etat = modele.etat(figes - 1)
+    benefices = [periode["benefice"] for periode in periodes]
+    return {
+        "statut": statut,
+        "benefice": sum(benefices) if statut in STATUTS_SOLUTION else None,
+        "periodes": periodes,
+        "etat_final": etat,
+    }
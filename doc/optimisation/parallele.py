@@ -0,0 +1,164 @@
+"""
+Résolution parallèle de scénarios indépendants sur un groupe de processus.
+
+Chaque processus garde son propre modèle paramétrique et son propre dossier temporaire pour les
+fichiers échangés avec CBC. Les résultats sont renvoyés dans l'ordre des scénarios d'entrée,
+quel que soit l'ordre dans lequel les processus terminent.
+"""
+import os
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.util import Finalize
+
+from .cache import CacheResultats
+from .parametrique import ModeleParametrique
+from .scenarios import resoudre_ligne
+from .solveurs import StrategieResolution, creer_solveur
+
+# Modèle propre à chaque processus, créé par _initialiser_processus
+_modele = None
+
+# Attente maximale du résultat d'un scénario : FACTEUR_ATTENTE * delai + MARGE_ATTENTE secondes. Le délai
+# ne borne que chaque appel au solveur ; le diagnostic d'un scénario sans solution en fait plusieurs.
+FACTEUR_ATTENTE = 2
+MARGE_ATTENTE = 30.0
+
+def _initialiser_processus(delai, chemin_cache, nom_solveur, ecart, mode):
+    """
+    Prépare un processus de résolution : dossier temporaire dédié et modèle construit une fois.
+    Le solveur de chaque processus n'utilise qu'un thread, le parallélisme venant des processus.
+    Args:
+        delai (float): Temps de résolution maximal par scénario, en secondes (None pour aucun).
+        chemin_cache (str): Base SQLite du cache partagé (None pour aucun).
+        nom_solveur (str): Nom du solveur (voir solveurs.creer_solveur).
+        ecart (float): Écart relatif d'optimalité accepté (None pour l'optimum exact).
+        mode (str): Mode de résolution, "exact" ou "rapide".
+    """
+    global _modele
+    dossier = tempfile.mkdtemp(prefix="optimisation_")
+    Finalize(None, shutil.rmtree, args=(dossier,), kwargs={"ignore_errors": True}, exitpriority=10)
+    solveur = creer_solveur(nom_solveur, threads=1, delai=delai, ecart=ecart)
+    solveur.tmpDir = dossier
+    cache = CacheResultats(chemin_cache) if chemin_cache else None
+    _modele = ModeleParametrique(StrategieResolution(solveur, mode), cache=cache)
+
+def _resoudre(numero, donnees):
+    return resoudre_ligne(_modele, numero, donnees)
+
+class ExecuteurParallele:
+    """
+    Classe répartissant la résolution de scénarios sur plusieurs processus.
+    Attributs:
+        nb_processus (int): Nombre de processus de résolution.
+        delai (float): Temps de résolution maximal par scénario, en secondes (None pour aucun).
+        nb_essais (int): Nombre d'essais par scénario avant de renvoyer un statut "Erreur".
+        fenetre (int): Nombre maximal de scénarios soumis et non encore renvoyés.
+        chemin_cache (str): Base SQLite du cache partagé par les processus (None pour aucun).
+        solveur (str): Nom du solveur utilisé par chaque processus.
+        ecart (float): Écart relatif d'optimalité accepté (None pour l'optimum exact).
+        mode (str): Mode de résolution, "exact" ou "rapide".
+        attente (float): Attente maximale du résultat d'un scénario, en secondes, au-delà de laquelle
+            le processus est considéré bloqué (None pour aucune ; déduite de delai par défaut).
+    """
+    def __init__(self, nb_processus=None, delai=None, nb_essais=2, fenetre=None, chemin_cache=None,
+                 solveur="cbc", ecart=None, mode="exact", attente=None):
+        self.nb_processus = nb_processus or os.cpu_count() or 1
+        self.delai = delai
+        if attente is None and delai is not None:
+            attente = FACTEUR_ATTENTE * delai + MARGE_ATTENTE
+        self.attente = attente
+        self.nb_essais = max(1, nb_essais)
+        self.fenetre = fenetre or 4 * self.nb_processus
+        self.chemin_cache = chemin_cache
+        self.solveur = solveur
+        self.ecart = ecart
+        self.mode = mode
+        self._pool = None
+        self._generation = 0
+
+    def _demarrer(self):
+        self._pool = ProcessPoolExecutor(self.nb_processus, initializer=_initialiser_processus,
+                                         initargs=(self.delai, self.chemin_cache, self.solveur, self.ecart, self.mode))
+        self._generation += 1
+
+    def _arreter(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _redemarrer(self, terminer=False):
+        """
+        Remplace le groupe de processus.
+        Args:
+            terminer (bool): Arrêter aussi les processus en cours de calcul (processus bloqué).
+        """
+        if terminer:
+            # ProcessPoolExecutor n'arrête pas un processus occupé : il est terminé directement
+            for processus in list((self._pool._processes or {}).values()):
+                processus.terminate()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._demarrer()
+
+    def _soumettre(self, numero, donnees, essai):
+        """
+        Soumet un scénario au groupe de processus, redémarré au besoin.
+        Returns:
+            tuple: (numéro, données, essai, génération du groupe, futur).
+        """
+        try:
+            futur = self._pool.submit(_resoudre, numero, donnees)
+        except BrokenProcessPool:
+            self._redemarrer()
+            futur = self._pool.submit(_resoudre, numero, donnees)
+        return numero, donnees, essai, self._generation, futur
+
+    def _resultat(self, tache):
+        """
+        Attend le résultat d'une tâche, en la soumettant de nouveau en cas d'erreur.
+        Si un processus a été tué ou ne rend pas de résultat dans le temps d'attente, le groupe est
+        redémarré une seule fois : les autres tâches soumises à l'ancien groupe sont resoumises sans
+        consommer d'essai.
+        """
+        while True:
+            numero, donnees, essai, generation, futur = tache
+            try:
+                return futur.result(timeout=self.attente)
+            except (BrokenProcessPool, CancelledError) as erreur:
+                if generation != self._generation:
+                    tache = self._soumettre(numero, donnees, essai)
+                    continue
+                self._redemarrer()
+                derniere_erreur = erreur
+            except TimeoutError:
+                self._redemarrer(terminer=True)
+                derniere_erreur = TimeoutError(f"aucun résultat après {self.attente:g} s")
+            except Exception as erreur:
+                derniere_erreur = erreur
+            if essai + 1 >= self.nb_essais:
+                identifiant = donnees.get("id") if isinstance(donnees, dict) else None
+                return {"id": numero if identifiant in (None, "") else identifiant, "statut": "Erreur",
+                        "erreur": f"{type(derniere_erreur).__name__}: {derniere_erreur}"}
+            tache = self._soumettre(numero, donnees, essai + 1)
+
+    def executer(self, lignes):
+        """
+        Résout une suite de scénarios en parallèle.
+        Args:
+            lignes (iterable): Lignes brutes de scénarios.
+        Yields:
+            dict: Lignes de résultat à plat, dans l'ordre des scénarios d'entrée.
+        """
+        self._demarrer()
+        en_cours = deque()
+        try:
+            for numero, donnees in enumerate(lignes):
+                en_cours.append(self._soumettre(numero, donnees, 0))
+                if len(en_cours) >= self.fenetre:
+                    yield self._resultat(en_cours.popleft())
+            while en_cours:
+                yield self._resultat(en_cours.popleft())
+        finally:
+            self._arreter()
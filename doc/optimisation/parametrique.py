@@ -0,0 +1,123 @@
+"""
+Modèle paramétrique : la structure du problème est construite une seule fois puis réutilisée.
+
+Entre deux résolutions, seuls la fonction objectif (prix, coûts, salaires) et les seconds membres
+dépendant du scénario (demande, commerciaux) sont mis à jour. Lorsque la solution précédente reste
+réalisable pour le nouveau scénario, elle sert de point de départ (warm start) à CBC. Une solution
+initiale irréalisable n'est jamais transmise : CBC peut alors renvoyer un faux optimum.
+
+Chaque résolution est chronométrée étape par étape (voir mesures.py). Avec journal_solveur, le journal
+de CBC est conservé pour relever le nombre de nœuds explorés et l'écart d'optimalité.
+Un scénario sans solution est diagnostiqué (contraintes incompatibles et écarts, voir diagnostic.py).
+"""
+import os
+
+from .cache import cle_scenario
+from .mesures import Chronometre, lire_journal_cbc
+from .modele import (STATUTS_SOLUTION, construire_structure, appliquer_parametres, lire_solution,
+                     calculer_indicateurs)
+from .solveurs import strategie
+
+class ModeleParametrique:
+    """
+    Classe représentant un modèle construit une fois et résolu pour plusieurs scénarios.
+    Attributs:
+        modele (Modele): Structure du problème, réutilisée d'un scénario à l'autre.
+        strategie (StrategieResolution): Solveur et mode utilisés pour chaque résolution.
+        solveur: Solveur PuLP de la stratégie.
+        cache (CacheResultats): Cache consulté avant chaque résolution (None pour aucun).
+        nb_resolutions (int): Nombre de résolutions effectuées.
+        dernier_journal (dict): Nœuds, itérations et écart d'optimalité de la dernière résolution
+            (vide si le journal du solveur n'est pas conservé ou si le résultat vient du cache).
+        diagnostic (bool): Diagnostiquer les scénarios sans solution.
+    """
+    def __init__(self, solveur=None, warm_start=True, donnees=None, cache=None, journal_solveur=False,
+                 diagnostic=True):
+        self.modele = construire_structure(donnees)
+        self.strategie = strategie(solveur)
+        self.solveur = self.strategie.solveur
+        self.warm_start = warm_start
+        self.cache = cache
+        self.nb_resolutions = 0
+        self.dernier_journal = {}
+        self.diagnostic = diagnostic
+        self._chemin_journal = None
+        if journal_solveur and hasattr(self.solveur, "optionsDict"):
+            dossier = getattr(self.solveur, "tmpDir", None) or "."
+            self._chemin_journal = os.path.join(dossier, f"cbc_{os.getpid()}_{id(self)}.log")
+            self.solveur.optionsDict["logPath"] = self._chemin_journal
+
+    def solution_realisable(self, tolerance=1e-6):
+        """
+        Vérifie si les valeurs actuelles des variables respectent toutes les contraintes du modèle.
+        La violation tolérée est relative à la taille des termes de la contrainte : les quantités
+        se comptent en millions et le solveur rend des valeurs exactes à sa propre tolérance près.
+        Args:
+            tolerance (float): Violation tolérée sur chaque contrainte, par unité de ses termes.
+        Returns:
+            bool: True si la solution courante est réalisable, False sinon (ou s'il n'y en a pas).
+        """
+        for contrainte in self.modele.problem.constraints.values():
+            valeur = contrainte.value()
+            if valeur is None:
+                return False
+            echelle = max([1.0, abs(contrainte.constant)]
+                          + [abs(a * v.varValue) for v, a in contrainte.items()])
+            if not contrainte.valid(tolerance * echelle):
+                return False
+        return True
+
+    def mettre_a_jour(self, scenario):
+        """
+        Applique un nouveau scénario sans reconstruire les variables ni les contraintes.
+        Args:
+            scenario (dict): Scénario à appliquer.
+        """
+        appliquer_parametres(self.modele, scenario)
+
+    def resoudre(self, scenario=None, chronometre=None):
+        """
+        Résout le modèle, après application d'un nouveau scénario s'il est fourni.
+        Les valeurs de la résolution précédente restent portées par les variables et servent
+        de solution initiale si elles sont réalisables et si le solveur accepte le warm start.
+        Si un cache est configuré, un scénario déjà résolu est renvoyé sans appeler le solveur.
+        Args:
+            scenario (dict): Scénario à appliquer avant la résolution.
+            chronometre (Chronometre): Chronomètre recevant la durée de chaque étape.
+        Returns:
+            dict: Résultats tels que renvoyés par extraire_resultats, avec le diagnostic du
+                  problème s'il n'a pas de solution.
+        """
+        chronometre = chronometre or Chronometre()
+        self.dernier_journal = {}
+        cle = None
+        if scenario is not None and self.cache is not None:
+            with chronometre.etape("cache"):
+                cle = cle_scenario(scenario, self.modele.donnees, self.strategie)
+                resultats = self.cache.obtenir(cle)
+            if resultats is not None:
+                return resultats
+        with chronometre.etape("construction"):
+            if scenario is not None:
+                self.mettre_a_jour(scenario)
+            if hasattr(self.solveur, "optionsDict"):
+                self.solveur.optionsDict["warmStart"] = self.warm_start and self.solution_realisable()
+        with chronometre.etape("resolution"):
+            self.strategie.resoudre(self.modele)
+        self.nb_resolutions += 1
+        if self._chemin_journal is not None:
+            self.dernier_journal = lire_journal_cbc(self._chemin_journal)
+            if os.path.exists(self._chemin_journal):
+                os.remove(self._chemin_journal)
+        with chronometre.etape("extraction"):
+            resultats = lire_solution(self.modele)
+        with chronometre.etape("indicateurs"):
+            resultats.update(calculer_indicateurs(self.modele))
+        if self.diagnostic and resultats["statut"] not in STATUTS_SOLUTION:
+            from .diagnostic import diagnostiquer
+            with chronometre.etape("diagnostic"):
+                resultats["diagnostic"] = diagnostiquer(self.modele, self.solveur)
+        if cle is not None:
+            with chronometre.etape("cache"):
+                self.cache.enregistrer(cle, resultats)
+        return resultats
@@ -0,0 +1,296 @@
+"""
+Frontière de Pareto entre le bénéfice, les pertes de carcasses (kg) et l'effectif total.
+
+Méthode epsilon-contrainte : le bénéfice est maximisé sous une borne sur le critère secondaire
+(contrainte "Epsilon_pertes" ou "Epsilon_personnel"), ajoutée au modèle mensuel construit une fois.
+Comme en planification multi-période, production, consommation, machines et effectifs sont positifs :
+le bénéfice maximal peut donc être inférieur à celui du modèle mensuel, qui admet une production négative.
+
+Les points sont placés de façon adaptative : partant des deux extrémités (bénéfice maximal, critère
+minimal), l'intervalle le plus long de la frontière (distance normalisée entre ses deux points) est
+coupé en deux, jusqu'au nombre de points demandé ou à la résolution du critère. Chaque nouveau
+point part de la solution du point voisin de plus faible critère, toujours réalisable pour une borne
+plus lâche (warm start de CBC). Une borne qui redonne le point voisin ne crée pas de point et
+resserre l'intervalle sans nouvelle coupe inutile.
+
+Utilisation :
+    python -m optimisation pareto --critere personnel --points 30 -o frontiere.csv
+    python -m optimisation pareto --critere pertes --niveaux 5 -o surface.csv
+"""
+import argparse
+import csv
+import heapq
+import json
+import math
+import sys
+
+from pulp import LpConstraint, LpConstraintLE, lpSum
+
+from .modele import STATUTS_SOLUTION, construire_probleme, decisions_positives, lire_solution, statut_resolution
+from .solveurs import MODES, StrategieResolution, strategie
+
+CRITERES = ("pertes", "personnel")
+
+# Résolution par défaut de la borne : un salarié, un kilogramme
+RESOLUTIONS = {"pertes": 1.0, "personnel": 1.0}
+
+class FrontierePareto:
+    """
+    Classe calculant des points de la frontière de Pareto sur un modèle construit une fois.
+    Attributs:
+        modele (Modele): Modèle mensuel du scénario.
+        strategie (StrategieResolution): Solveur et mode de résolution.
+        criteres (dict): Expression de chaque critère secondaire ("pertes" en kg, "personnel").
+        nb_resolutions (int): Nombre d'appels au solveur.
+        nb_reprises (int): Nombre de résolutions parties de la solution d'un point voisin.
+    """
+    def __init__(self, scenario, solveur=None, donnees=None):
+        self.modele = construire_probleme(scenario, donnees)
+        self.strategie = strategie(solveur)
+        self.objectif = self.modele.problem.objective
+        personnel = self.modele.personnel
+        # Comme en planification multi-période, toutes les décisions sont positives : sans ces bornes,
+        # minimiser l'effectif ou les pertes serait non borné ou sans fin pour CBC.
+        decisions_positives(self.modele)
+        self.criteres = {
+            "pertes": lpSum(self.modele.pertes.values()),
+            "personnel": lpSum(personnel[c] for c in personnel if c != "Commerciaux") + personnel["Commerciaux"],
+        }
+        self.nb_resolutions = 0
+        self.nb_reprises = 0
+
+    def _borner(self, critere, borne):
+        """
+        Ajoute, modifie ou retire (borne None) la contrainte epsilon d'un critère.
+        """
+        nom = f"Epsilon_{critere}"
+        contraintes = self.modele.problem.constraints
+        if borne is None:
+            contraintes.pop(nom, None)
+        elif nom in contraintes:
+            contraintes[nom].constant = self.criteres[critere].constant - borne
+        else:
+            self.modele.problem.addConstraint(LpConstraint(self.criteres[critere], LpConstraintLE, nom, borne))
+
+    def _resoudre(self, depart=None):
+        """
+        Résout le problème courant, à partir des valeurs d'un point précédent si elles sont données.
+        """
+        solveur = self.strategie.solveur
+        if hasattr(solveur, "optionsDict"):
+            solveur.optionsDict["warmStart"] = depart is not None
+        if depart is not None:
+            self.nb_reprises += 1
+            for variable in self.modele.problem.variables():
+                if variable.name in depart:
+                    variable.varValue = depart[variable.name]
+        self.strategie.resoudre(self.modele)
+        self.nb_resolutions += 1
+        return statut_resolution(self.modele.problem)
+
+    def point(self, bornes=None, depart=None):
+        """
+        Maximise le bénéfice sous des bornes sur les critères secondaires.
+        Args:
+            bornes (dict): Borne supérieure de chaque critère borné ("pertes", "personnel").
+            depart (dict): Valeurs des variables d'un point réalisable pour ces bornes.
+        Returns:
+            dict: Statut, bornes, bénéfice, valeur de chaque critère, production et machines
+                  (None sans solution), ainsi que les valeurs des variables ("valeurs").
+        """
+        bornes = bornes or {}
+        for critere in CRITERES:
+            self._borner(critere, bornes.get(critere))
+        statut = self._resoudre(depart)
+        point = {"statut": statut, "bornes": dict(bornes)}
+        if statut not in STATUTS_SOLUTION:
+            return {**point, "benefice": None, **{c: None for c in CRITERES}}
+        solution = lire_solution(self.modele)
+        point.update({
+            "benefice": self.objectif.value(),
+            **{c: expression.value() for c, expression in self.criteres.items()},
+            "production": solution["production"],
+            "machines": solution["machines"],
+            "valeurs": {v.name: v.varValue for v in self.modele.problem.variables()},
+        })
+        return point
+
+    def minimum(self, critere, bornes=None, resolution=None):
+        """
+        Point de plus faible valeur du critère, puis de plus grand bénéfice à cette valeur, à une
+        demi-résolution près (optimisation lexicographique). Borner les pertes exactement à leur
+        minimum impose à la production entière des proportions exactes, très longues à trouver pour CBC.
+        Args:
+            critere (str): "pertes" ou "personnel".
+            bornes (dict): Bornes sur les autres critères.
+            resolution (float): Résolution du critère (voir RESOLUTIONS).
+        Returns:
+            dict: Point de la frontière (voir point).
+        """
+        bornes = dict(bornes or {})
+        for nom in CRITERES:
+            self._borner(nom, bornes.get(nom))
+        problem = self.modele.problem
+        problem.setObjective(-self.criteres[critere])
+        try:
+            statut = self._resoudre()
+            valeur = self.criteres[critere].value()
+        finally:
+            problem.setObjective(self.objectif)
+        if statut not in STATUTS_SOLUTION:
+            return {"statut": statut, "bornes": bornes, "benefice": None, **{c: None for c in CRITERES}}
+        bornes[critere] = valeur + (RESOLUTIONS[critere] if resolution is None else resolution) / 2
+        return self.point(bornes)
+
+    def frontiere(self, critere, nb_points=20, resolution=None, bornes=None):
+        """
+        Calcule la frontière entre le bénéfice et un critère, avec des points répartis là où
+        elle varie le plus.
+        Args:
+            critere (str): "pertes" ou "personnel".
+            nb_points (int): Nombre maximal de points (extrémités comprises).
+            resolution (float): Écart minimal entre deux bornes essayées (voir RESOLUTIONS).
+            bornes (dict): Bornes fixes sur l'autre critère.
+        Returns:
+            list: Points de la frontière par valeur croissante du critère (voir point).
+        """
+        if critere not in CRITERES:
+            raise ValueError(f"Critère inconnu : {critere} (critères : {', '.join(CRITERES)})")
+        resolution = RESOLUTIONS[critere] if resolution is None else resolution
+        bornes = dict(bornes or {})
+        bornes.pop(critere, None)
+        haut = self.point(bornes)
+        if haut["benefice"] is None:
+            return []
+        bas = self.minimum(critere, bornes, resolution)
+        if bas["benefice"] is None or haut[critere] - bas[critere] <= resolution:
+            return [haut]
+        etendue_critere = haut[critere] - bas[critere]
+        etendue_benefice = max(abs(haut["benefice"] - bas["benefice"]), 1e-9)
+
+        def longueur(a, b):
+            return math.hypot((b[critere] - a[critere]) / etendue_critere,
+                              (b["benefice"] - a["benefice"]) / etendue_benefice)
+
+        points = [bas, haut]
+        # Intervalles à couper : (-longueur, compteur, point bas, point haut, plancher de la borne)
+        intervalles = [(-longueur(bas, haut), 0, bas, haut, bas[critere])]
+        compteur = 1
+        while intervalles and len(points) < nb_points:
+            _, _, a, b, plancher = heapq.heappop(intervalles)
+            borne = (plancher + b[critere]) / 2
+            if critere == "personnel":
+                borne = math.floor(borne)
+            if b[critere] - plancher <= resolution or not plancher < borne < b[critere]:
+                continue
+            m = self.point({**bornes, critere: borne}, depart=a["valeurs"])
+            if m["benefice"] is None:
+                continue
+            if abs(m[critere] - a[critere]) <= 1e-6 * max(1.0, abs(a[critere])) or m["benefice"] <= a["benefice"]:
+                # Aucun point entre a et la borne : l'intervalle se resserre
+                heapq.heappush(intervalles, (-longueur(a, b), compteur, a, b, borne))
+            else:
+                points.append(m)
+                heapq.heappush(intervalles, (-longueur(a, m), compteur, a, m, a[critere]))
+                # m est optimal pour la borne : aucun autre point entre m et la borne
+                heapq.heappush(intervalles, (-longueur(m, b), compteur + 1, m, b, borne))
+            compteur += 2
+        return sorted(points, key=lambda p: p[critere])
+
+def filtrer_domines(points):
+    """
+    Retire les points dominés (moins de bénéfice sans moins de pertes ni moins de personnel)
+    et les doublons.
+    Args:
+        points (list): Points calculés par FrontierePareto.
+    Returns:
+        list: Points non dominés, chacun une seule fois.
+    """
+    def domine(q, p):
+        return q["benefice"] >= p["benefice"] - 1e-6 and all(q[c] <= p[c] + 1e-6 for c in CRITERES)
+    retenus = []
+    for p in sorted((p for p in points if p["benefice"] is not None), key=lambda p: -p["benefice"]):
+        if not any(domine(q, p) for q in retenus):
+            retenus.append(p)
+    return retenus
+
+def surface_pareto(scenario, critere="pertes", nb_niveaux=5, nb_points=10, solveur=None, donnees=None):
+    """
+    Calcule la surface de Pareto entre les trois critères : une frontière bénéfice / critère pour
+    plusieurs niveaux de l'autre critère, répartis entre son minimum et sa valeur au bénéfice maximal.
+    Args:
+        scenario (dict): Scénario à explorer.
+        critere (str): Critère balayé sur chaque frontière.
+        nb_niveaux (int): Nombre de niveaux de l'autre critère.
+        nb_points (int): Nombre maximal de points par frontière.
+        solveur: Solveur PuLP ou StrategieResolution.
+        donnees (DonneesUsine): Données de l'usine (usine de référence par défaut).
+    Returns:
+        tuple: Points non dominés et FrontierePareto utilisée (compteurs de résolutions).
+    """
+    autre = next(c for c in CRITERES if c != critere)
+    frontiere = FrontierePareto(scenario, solveur, donnees)
+    haut = frontiere.point()
+    bas = frontiere.minimum(autre)
+    if haut["benefice"] is None or bas["benefice"] is None:
+        return [], frontiere
+    points = []
+    for i in range(nb_niveaux):
+        niveau = bas[autre] + (haut[autre] - bas[autre]) * i / max(1, nb_niveaux - 1)
+        if autre == "personnel":
+            niveau = math.floor(niveau + 1e-9)
+        points += frontiere.frontiere(critere, nb_points, bornes={autre: niveau})
+    return filtrer_domines(points), frontiere
+
+def main(arguments=None):
+    from .scenarios import normaliser_scenario
+    parser = argparse.ArgumentParser(prog="python -m optimisation pareto",
+                                     description="Frontière de Pareto entre bénéfice, pertes et effectif")
+    parser.add_argument("scenario", nargs="?", help="Fichier JSON du scénario (- pour l'entrée standard)")
+    parser.add_argument("--critere", choices=CRITERES, default="personnel", help="Critère opposé au bénéfice")
+    parser.add_argument("--points", type=int, default=20, help="Nombre maximal de points par frontière")
+    parser.add_argument("--resolution", type=float, help="Écart minimal entre deux bornes essayées")
+    parser.add_argument("--niveaux", type=int, default=0,
+                        help="Nombre de niveaux de l'autre critère (surface à trois critères, 0 pour une frontière)")
+    parser.add_argument("-o", "--sortie", help="Fichier CSV des points (sortie standard par défaut)")
+    parser.add_argument("--solveur", default="cbc", help="Solveur : cbc, highs, glpk ou nom d'un solveur PuLP installé")
+    parser.add_argument("--mode", choices=MODES, default="exact", help="Résolution exacte ou rapide (relaxation arrondie)")
+    args = parser.parse_args(arguments)
+
+    if args.scenario is None:
+        donnees = {}
+    elif args.scenario == "-":
+        donnees = json.load(sys.stdin)
+    else:
+        with open(args.scenario, encoding="utf-8") as f:
+            donnees = json.load(f)
+    try:
+        scenario = normaliser_scenario(donnees)
+        resolution = StrategieResolution.depuis_nom(args.solveur, mode=args.mode)
+    except ValueError as erreur:
+        parser.error(str(erreur))
+
+    if args.niveaux:
+        points, frontiere = surface_pareto(scenario, args.critere, args.niveaux, args.points, resolution)
+    else:
+        frontiere = FrontierePareto(scenario, resolution)
+        points = frontiere.frontiere(args.critere, args.points, args.resolution)
+
+    colonnes = ["benefice", *CRITERES, *(f"borne_{c}" for c in CRITERES), "statut"]
+    fichier = open(args.sortie, "w", newline="", encoding="utf-8") if args.sortie else sys.stdout
+    try:
+        ecrivain = csv.DictWriter(fichier, fieldnames=colonnes)
+        ecrivain.writeheader()
+        for point in points:
+            ecrivain.writerow({
+                "benefice": point["benefice"], **{c: point[c] for c in CRITERES},
+                **{f"borne_{c}": point["bornes"].get(c) for c in CRITERES}, "statut": point["statut"],
+            })
+    finally:
+        if fichier is not sys.stdout:
+            fichier.close()
+    print(f"{len(points)} points, {frontiere.nb_resolutions} résolutions "
+          f"dont {frontiere.nb_reprises} à partir d'un point voisin", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
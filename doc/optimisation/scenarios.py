@@ -0,0 +1,513 @@
+"""
+Exécution par lot de scénarios sans saisie clavier.
+
+Lit un fichier de scénarios (CSV, JSON, JSON lines, Parquet ou binaire), résout le problème de chaque
+ligne et écrit les résultats par lots (CSV, JSON lines, Parquet, Arrow ou binaire), sans les garder
+en mémoire. Le format binaire (.npy, enregistrements de largeur fixe) est décrit dans binaire.py.
+Chaque ligne de résultat contient le statut, la production, les machines, les carcasses et bobines
+(arrondies à l'unité supérieure), les pertes par matière, les effectifs, le revenu et chaque charge.
+Les fichiers Parquet, Arrow et binaires se relisent en colonnes par projection en mémoire (lire_resultats).
+
+Colonnes reconnues dans un fichier de scénarios (toutes facultatives, les valeurs par défaut
+du script interactif sont utilisées pour les colonnes absentes) :
+- id : identifiant du scénario (numéro de ligne par défaut)
+- coef_<Produit> : coefficient de marché, entre 0 et 2
+- objectif_<Produit> : objectif de production en pourcentage, entre 0 et 100
+- prix_<Produit> : prix de vente, entre 0 et 10
+- cout_<matiere> : coût au kg (porc, poulet, canard, plastique, fer), entre 0 et 10
+- salaire_<Categorie> : salaire mensuel (Ouvriers entre 0 et 10000)
+- nb_commerciaux : nombre de commerciaux, entre 0 et 100
+
+En JSON, les sections peuvent aussi être données sous forme d'objets imbriqués
+("coefficients", "objectif", "prix_vente", "couts_matieres", "salaires").
+
+Utilisation :
+    python -m optimisation.scenarios scenarios.csv -o resultats.csv
+    python -m optimisation.scenarios scenarios.csv -o resultats.csv -j 0 --delai 30
+    python -m optimisation.scenarios scenarios.csv -o resultats.csv --solveur highs --threads 4 --ecart 0.001
+    python -m optimisation.scenarios scenarios.csv -o resultats.csv --mode rapide
+    python -m optimisation.scenarios scenarios.csv -o resultats.csv --cache resultats.sqlite
+    python -m optimisation.scenarios scenarios.parquet -o resultats.parquet -j 0 --taille-lot 50000
+    python -m optimisation.scenarios nouveaux.csv -o resultats.csv --ajouter
+    python -m optimisation.scenarios scenarios.npy -o resultats.npy
+    python -m optimisation.scenarios scenarios.csv -o resultats.csv --mesures mesures.jsonl --prometheus metriques.prom
+"""
+import argparse
+import csv
+import itertools
+import json
+import math
+import os
+import sys
+
+from .domaine import (PRODUITS, PRIX_VENTE_DEFAUT, COUTS_MATIERES_DEFAUT, SALAIRES_DEFAUT,
+                      NB_COMMERCIAUX_DEFAUT)
+from .donnees import donnees_reference
+from .mesures import Chronometre, Mesures, RapportResolution
+from .solveurs import MODES, StrategieResolution
+
+# Section du scénario, préfixe des colonnes à plat, bornes de validation
+SECTIONS = {
+    "coefficients": ("coef_", (0, 2)),
+    "objectif": ("objectif_", (0, 100)),
+    "prix_vente": ("prix_", (0, 10)),
+    "couts_matieres": ("cout_", (0, 10)),
+    "salaires": ("salaire_", (0, None)),
+}
+
+# Mêmes bornes que les saisies du script interactif
+BORNES_SALAIRES = {"Ouvriers": (0, 10000)}
+BORNES_NB_COMMERCIAUX = (0, 100)
+
+def scenario_par_defaut():
+    """
+    Renvoie le scénario obtenu en validant toutes les valeurs par défaut du script interactif.
+    Returns:
+        dict: Scénario complet (objectifs exprimés en fraction).
+    """
+    return {
+        "id": None,
+        "coefficients": {p: 1.0 for p in PRODUITS},
+        "objectif": {p: 1.0 for p in PRODUITS},
+        "prix_vente": dict(PRIX_VENTE_DEFAUT),
+        "couts_matieres": dict(COUTS_MATIERES_DEFAUT),
+        "salaires": dict(SALAIRES_DEFAUT),
+        "nb_commerciaux": NB_COMMERCIAUX_DEFAUT,
+    }
+
+def _verifier(nom, valeur, bornes):
+    """
+    Convertit une valeur en flottant et vérifie qu'elle respecte les bornes.
+    Raises:
+        ValueError: Si la valeur n'est pas un nombre fini ou sort des bornes.
+    """
+    try:
+        valeur = float(valeur)
+    except (TypeError, ValueError):
+        raise ValueError(f"{nom} = {valeur!r} n'est pas un nombre") from None
+    if not math.isfinite(valeur):
+        raise ValueError(f"{nom} = {valeur} n'est pas un nombre fini")
+    minimum, maximum = bornes
+    if valeur < minimum or (maximum is not None and valeur > maximum):
+        raise ValueError(f"{nom} = {valeur} hors de l'intervalle [{minimum}, {maximum}]")
+    return valeur
+
+def _est_vide(valeur):
+    return valeur is None or (isinstance(valeur, str) and valeur.strip() == "")
+
+def normaliser_scenario(donnees, numero=None):
+    """
+    Construit un scénario complet et validé à partir d'une ligne de fichier.
+    Args:
+        donnees (dict): Ligne lue (colonnes à plat et/ou sections imbriquées).
+        numero (int): Numéro de la ligne, utilisé comme identifiant par défaut.
+    Returns:
+        dict: Scénario utilisable par construire_probleme.
+    Raises:
+        ValueError: Si la ligne n'est pas un objet ou si une valeur est invalide ou hors bornes.
+    """
+    if not isinstance(donnees, dict):
+        raise ValueError(f"Scénario attendu sous forme d'objet, pas {type(donnees).__name__}")
+    if not all(isinstance(cle, str) for cle in donnees):
+        # csv.DictReader range les cellules sans colonne sous la clé None
+        raise ValueError("Cellules en trop par rapport à l'en-tête")
+    scenario = scenario_par_defaut()
+    scenario["id"] = numero if _est_vide(donnees.get("id")) else donnees["id"]
+
+    for section, (prefixe, bornes) in SECTIONS.items():
+        valeurs = {}
+        imbrique = donnees.get(section)
+        if isinstance(imbrique, dict):
+            valeurs.update(imbrique)
+        elif not _est_vide(imbrique):
+            raise ValueError(f"{section} attendu sous forme d'objet, pas {type(imbrique).__name__}")
+        for cle, valeur in donnees.items():
+            if cle.startswith(prefixe) and cle not in SECTIONS and not _est_vide(valeur):
+                valeurs[cle[len(prefixe):]] = valeur
+        for cle, valeur in valeurs.items():
+            if cle not in scenario[section]:
+                raise ValueError(f"Clé inconnue dans {section} : {cle}")
+            valeur = _verifier(f"{prefixe}{cle}", valeur, BORNES_SALAIRES.get(cle, bornes))
+            scenario[section][cle] = valeur / 100 if section == "objectif" else valeur
+
+    if not _est_vide(donnees.get("nb_commerciaux")):
+        scenario["nb_commerciaux"] = _verifier("nb_commerciaux", donnees["nb_commerciaux"], BORNES_NB_COMMERCIAUX)
+    return scenario
+
+# === Lecture ===
+
+def _lire_csv(chemin):
+    with open(chemin, newline="", encoding="utf-8") as fichier:
+        yield from csv.DictReader(fichier)
+
+def _lire_json(chemin):
+    with open(chemin, encoding="utf-8") as fichier:
+        donnees = json.load(fichier)
+    yield from (donnees if isinstance(donnees, list) else donnees["scenarios"])
+
+def _lire_jsonl(chemin):
+    with open(chemin, encoding="utf-8") as fichier:
+        for ligne in fichier:
+            if ligne.strip():
+                yield json.loads(ligne)
+
+def _lire_parquet(chemin, taille_lot=1024):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as erreur:
+        raise ImportError("La lecture des fichiers Parquet nécessite pyarrow (pip install pyarrow)") from erreur
+    fichier = pq.ParquetFile(chemin)
+    for lot in fichier.iter_batches(batch_size=taille_lot):
+        yield from lot.to_pylist()
+
+def _lire_binaire(chemin):
+    from .binaire import lire_scenarios_binaires
+    return lire_scenarios_binaires(chemin)
+
+LECTEURS = {".csv": _lire_csv, ".json": _lire_json, ".jsonl": _lire_jsonl, ".parquet": _lire_parquet,
+            ".npy": _lire_binaire}
+
+def lire_scenarios(chemin):
+    """
+    Lit un fichier de scénarios ligne par ligne, sans le charger entièrement en mémoire
+    (sauf pour le JSON classique).
+    Args:
+        chemin (str): Fichier .csv, .json, .jsonl, .parquet ou .npy.
+    Yields:
+        dict: Lignes brutes du fichier.
+    Raises:
+        ValueError: Si l'extension n'est pas reconnue.
+    """
+    extension = os.path.splitext(chemin)[1].lower()
+    if extension not in LECTEURS:
+        raise ValueError(f"Format de scénarios non reconnu : {extension}")
+    return LECTEURS[extension](chemin)
+
+# === Écriture ===
+
+def colonnes_resultat():
+    """
+    Renvoie la liste ordonnée des colonnes d'une ligne de résultat.
+    Returns:
+        list: Noms de colonnes.
+    """
+    colonnes = ["id", "statut", "erreur", "benefice", "revenu"]
+    donnees = donnees_reference()
+    colonnes += [f"production_{p}" for p in donnees.produits]
+    colonnes += [f"machines_{m}" for m in donnees.machines]
+    colonnes += [f"carcasses_{c}" for c in donnees.carcasses]
+    colonnes += [f"bobines_{b}" for b in donnees.bobines]
+    colonnes += [f"pertes_{m}" for m in donnees.matieres_carcasses]
+    colonnes += [f"personnel_{c}" for c in SALAIRES_DEFAUT if c != "Dirigeants"]
+    colonnes += [f"charges_{c}" for c in ("pertes", "matieres", "machines", "salaires")]
+    return colonnes
+
+def aplatir_resultats(identifiant, resultats):
+    """
+    Met à plat les résultats d'un scénario pour l'écriture en ligne. Le diagnostic d'un scénario
+    sans solution est résumé dans la colonne "erreur".
+    Args:
+        identifiant: Identifiant du scénario.
+        resultats (dict): Résultats renvoyés par extraire_resultats.
+    Returns:
+        dict: Ligne de résultat (colonnes de colonnes_resultat).
+    """
+    ligne = {"id": identifiant, "erreur": None}
+    for cle, valeur in resultats.items():
+        if cle == "diagnostic":
+            from .diagnostic import resumer_diagnostic
+            ligne["erreur"] = resumer_diagnostic(valeur)
+        elif isinstance(valeur, dict):
+            for sous_cle, sous_valeur in valeur.items():
+                ligne[f"{cle}_{sous_cle}"] = sous_valeur
+        else:
+            ligne[cle] = valeur
+    return ligne
+
+# Nombre de lignes écrites en un bloc (groupe de lignes Parquet, lot Arrow, écriture CSV)
+TAILLE_LOT = 10000
+
+# Colonnes texte des lignes de résultat, les autres sont numériques
+COLONNES_TEXTE = ("id", "statut", "erreur")
+
+class EcrivainCSV:
+    """
+    Écrit les lignes de résultat dans un fichier CSV, par lots de taille_lot lignes.
+    Avec entete=False (ajout à un fichier existant), la ligne d'en-tête n'est pas répétée.
+    """
+    def __init__(self, fichier, taille_lot=TAILLE_LOT, entete=True):
+        self.writer = csv.DictWriter(fichier, fieldnames=colonnes_resultat(), extrasaction="ignore")
+        self.taille_lot = taille_lot
+        self.lot = []
+        if entete:
+            self.writer.writeheader()
+
+    def ecrire(self, ligne):
+        self.lot.append(ligne)
+        if len(self.lot) >= self.taille_lot:
+            self.vider()
+
+    def vider(self):
+        self.writer.writerows(self.lot)
+        self.lot = []
+
+    def fermer(self):
+        self.vider()
+
+class EcrivainJSONL:
+    """
+    Écrit les lignes de résultat au format JSON lines, par lots de taille_lot lignes.
+    """
+    def __init__(self, fichier, taille_lot=TAILLE_LOT, entete=True):
+        self.fichier = fichier
+        self.taille_lot = taille_lot
+        self.lot = []
+
+    def ecrire(self, ligne):
+        self.lot.append(json.dumps(ligne, ensure_ascii=False) + "\n")
+        if len(self.lot) >= self.taille_lot:
+            self.vider()
+
+    def vider(self):
+        self.fichier.writelines(self.lot)
+        self.fichier.flush()
+        self.lot = []
+
+    def fermer(self):
+        self.vider()
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as erreur:
+        raise ImportError("Les fichiers Parquet et Arrow nécessitent pyarrow (pip install pyarrow)") from erreur
+    return pyarrow
+
+class EcrivainColonnes:
+    """
+    Base des écrivains en colonnes : les lignes sont accumulées colonne par colonne et écrites
+    tous les taille_lot lignes en un bloc (groupe de lignes Parquet ou lot Arrow). La mémoire
+    utilisée ne dépend que de la taille du lot, pas du nombre de lignes du fichier.
+    Attributs:
+        schema (pyarrow.Schema): Colonnes de colonnes_resultat, texte pour id, statut et erreur,
+            flottants pour les autres.
+        nb_lignes (int): Nombre de lignes écrites.
+    """
+    def __init__(self, fichier, taille_lot=TAILLE_LOT, entete=True):
+        pa = _pyarrow()
+        self.colonnes = colonnes_resultat()
+        self.schema = pa.schema([(c, pa.string() if c in COLONNES_TEXTE else pa.float64()) for c in self.colonnes])
+        self.taille_lot = taille_lot
+        self.nb_lignes = 0
+        self.lot = {c: [] for c in self.colonnes}
+        self.writer = self._ouvrir(pa, fichier)
+
+    def ecrire(self, ligne):
+        for colonne in self.colonnes:
+            valeur = ligne.get(colonne)
+            if colonne in COLONNES_TEXTE and valeur is not None:
+                valeur = str(valeur)
+            self.lot[colonne].append(valeur)
+        if len(self.lot["id"]) >= self.taille_lot:
+            self.vider()
+
+    def vider(self):
+        if not self.lot["id"]:
+            return
+        pa = _pyarrow()
+        tableau = pa.Table.from_arrays([pa.array(self.lot[c], type=self.schema.field(c).type) for c in self.colonnes],
+                                       schema=self.schema)
+        self.writer.write_table(tableau)
+        self.nb_lignes += tableau.num_rows
+        self.lot = {c: [] for c in self.colonnes}
+
+    def fermer(self):
+        self.vider()
+        self.writer.close()
+
+class EcrivainParquet(EcrivainColonnes):
+    """
+    Écrit les lignes de résultat dans un fichier Parquet, un groupe de lignes par lot.
+    """
+    def _ouvrir(self, pa, fichier):
+        return pa.parquet.ParquetWriter(fichier, self.schema)
+
+class EcrivainArrow(EcrivainColonnes):
+    """
+    Écrit les lignes de résultat dans un fichier Arrow IPC, lisible sans copie par projection
+    en mémoire (voir lire_resultats).
+    """
+    def _ouvrir(self, pa, fichier):
+        return pa.ipc.new_file(fichier, self.schema)
+
+def _ecrivain_binaire(fichier, taille_lot=TAILLE_LOT, entete=True):
+    from .binaire import EcrivainBinaire
+    return EcrivainBinaire(fichier, taille_lot, entete)
+
+ECRIVAINS = {".csv": EcrivainCSV, ".jsonl": EcrivainJSONL, ".parquet": EcrivainParquet, ".arrow": EcrivainArrow,
+             ".npy": _ecrivain_binaire}
+
+# Formats écrits en binaire et sans ajout possible à un fichier existant
+FORMATS_BINAIRES = (".parquet", ".arrow", ".npy")
+
+def lire_resultats(chemin):
+    """
+    Ouvre un fichier de résultats Parquet, Arrow ou binaire pour l'analyse. Le fichier est projeté
+    en mémoire : seules les colonnes utilisées sont lues depuis le disque (sans copie pour Arrow
+    et le format binaire).
+    Args:
+        chemin (str): Fichier .parquet, .arrow ou .npy écrit par le traitement par lot.
+    Returns:
+        pyarrow.Table | numpy.memmap: Résultats, une colonne par valeur de colonnes_resultat
+            (enregistrements de binaire.type_resultats pour un fichier .npy).
+    Raises:
+        ValueError: Si l'extension n'est pas reconnue.
+    """
+    extension = os.path.splitext(chemin)[1].lower()
+    if extension == ".npy":
+        from .binaire import ouvrir, type_resultats
+        return ouvrir(chemin, type_resultats())
+    pa = _pyarrow()
+    if extension == ".arrow":
+        return pa.ipc.open_file(pa.memory_map(chemin, "r")).read_all()
+    if extension == ".parquet":
+        return pa.parquet.read_table(chemin, memory_map=True)
+    raise ValueError(f"Format de résultats non reconnu : {extension}")
+
+# === Exécution ===
+
+# Fin des lignes de scénarios (une ligne JSON peut valoir None)
+_FIN = object()
+
+def resoudre_ligne(modele, numero, donnees, chronometre=None):
+    """
+    Valide puis résout une ligne de scénario.
+    Args:
+        modele (ModeleParametrique): Modèle réutilisé pour la résolution.
+        numero (int): Numéro de la ligne dans le fichier.
+        donnees (dict): Ligne brute.
+        chronometre (Chronometre): Chronomètre recevant la durée de chaque étape.
+    Returns:
+        dict: Ligne de résultat à plat, de statut "Invalide" si la ligne ne peut pas être validée.
+    """
+    chronometre = chronometre or Chronometre()
+    try:
+        with chronometre.etape("lecture"):
+            scenario = normaliser_scenario(donnees, numero)
+    except ValueError as erreur:
+        identifiant = donnees.get("id") if isinstance(donnees, dict) else None
+        return {"id": numero if _est_vide(identifiant) else identifiant, "statut": "Invalide", "erreur": str(erreur)}
+    return aplatir_resultats(scenario["id"], modele.resoudre(scenario, chronometre))
+
+def executer_scenarios(lignes, solveur=None, cache=None, rapporter=None):
+    """
+    Résout une suite de scénarios et renvoie les résultats au fil de l'eau.
+    Le modèle est construit une seule fois puis mis à jour pour chaque scénario.
+    Une ligne invalide produit un résultat de statut "Invalide" sans interrompre le lot.
+    Args:
+        lignes (iterable): Lignes brutes de scénarios.
+        solveur: Solveur PuLP ou StrategieResolution à utiliser.
+        cache (CacheResultats): Cache des résultats déjà calculés (None pour aucun).
+        rapporter (callable): Fonction appelée avec le RapportResolution de chaque scénario.
+    Yields:
+        dict: Lignes de résultat à plat, dans l'ordre des scénarios.
+    """
+    from .parametrique import ModeleParametrique
+    modele = ModeleParametrique(solveur, cache=cache, journal_solveur=rapporter is not None)
+    lignes = iter(lignes)
+    for numero in itertools.count():
+        chronometre = Chronometre()
+        with chronometre.etape("lecture"):
+            donnees = next(lignes, _FIN)
+        if donnees is _FIN:
+            return
+        nb_resolutions = modele.nb_resolutions
+        ligne = resoudre_ligne(modele, numero, donnees, chronometre)
+        if rapporter is not None:
+            resolu = modele.nb_resolutions > nb_resolutions
+            depuis_cache = ligne["statut"] != "Invalide" and not resolu
+            rapporter(RapportResolution(ligne["id"], ligne["statut"], ligne.get("benefice"), chronometre.durees,
+                                        depuis_cache=depuis_cache, **(modele.dernier_journal if resolu else {})))
+        yield ligne
+
+def main(arguments=None):
+    """
+    Point d'entrée en ligne de commande du traitement par lot.
+    """
+    parser = argparse.ArgumentParser(description="Résolution par lot de scénarios de bénéfice.")
+    parser.add_argument("entree", help="Fichier de scénarios (.csv, .json, .jsonl, .parquet, .npy)")
+    parser.add_argument("-o", "--sortie", help="Fichier de résultats (.csv, .jsonl, .parquet, .arrow ou .npy), "
+                                               "sortie standard en JSON lines par défaut")
+    parser.add_argument("--ajouter", action="store_true", help="Ajouter les résultats à la fin du fichier (CSV ou JSON lines)")
+    parser.add_argument("--taille-lot", type=int, default=TAILLE_LOT, help="Nombre de lignes de résultat écrites en un bloc")
+    parser.add_argument("-j", "--processus", type=int, default=1, help="Nombre de processus de résolution (0 pour un par cœur)")
+    parser.add_argument("--delai", type=float, help="Temps de résolution maximal par scénario, en secondes")
+    parser.add_argument("--solveur", default="cbc", help="Solveur : cbc, highs, glpk ou nom d'un solveur PuLP installé")
+    parser.add_argument("--threads", type=int, help="Nombre de threads du solveur (un seul processus)")
+    parser.add_argument("--ecart", type=float, help="Écart relatif d'optimalité accepté par le solveur")
+    parser.add_argument("--mode", choices=MODES, default="exact", help="Résolution exacte ou rapide (relaxation arrondie)")
+    parser.add_argument("--essais", type=int, default=2, help="Nombre d'essais par scénario en cas d'erreur du solveur")
+    parser.add_argument("--cache", help="Base SQLite des résultats déjà calculés, partagée entre les exécutions")
+    parser.add_argument("--mesures", help="Fichier JSON lines recevant la durée des étapes de chaque résolution")
+    parser.add_argument("--prometheus", help="Fichier recevant en fin de lot les métriques au format Prometheus")
+    args = parser.parse_args(arguments)
+    instrumente = args.mesures or args.prometheus
+    try:
+        strategie = StrategieResolution.depuis_nom(args.solveur, args.threads, args.delai, args.ecart, args.mode)
+    except ValueError as erreur:
+        parser.error(str(erreur))
+    if instrumente and args.processus != 1:
+        parser.error("--mesures et --prometheus ne sont disponibles qu'avec un seul processus (-j 1)")
+
+    if args.sortie:
+        extension = os.path.splitext(args.sortie)[1].lower()
+        if extension not in ECRIVAINS:
+            parser.error(f"Format de sortie non reconnu : {extension}")
+        if extension in FORMATS_BINAIRES:
+            if args.ajouter:
+                parser.error(f"--ajouter n'est pas disponible pour le format {extension}")
+            fichier = open(args.sortie, "wb")
+        else:
+            fichier = open(args.sortie, "a" if args.ajouter else "w", newline="", encoding="utf-8")
+    else:
+        extension, fichier = ".jsonl", sys.stdout
+    entete = fichier.tell() == 0 if fichier is not sys.stdout else True
+
+    mesures = Mesures()
+    fichier_mesures = open(args.mesures, "w", encoding="utf-8") if args.mesures else None
+
+    def rapporter(rapport):
+        mesures.enregistrer(rapport)
+        if fichier_mesures is not None:
+            fichier_mesures.write(rapport.en_json() + "\n")
+
+    ecrivain = None
+    try:
+        ecrivain = ECRIVAINS[extension](fichier, max(1, args.taille_lot), entete)
+        if args.processus == 1:
+            from .cache import CacheResultats
+            cache = CacheResultats(args.cache) if args.cache else None
+            resultats = executer_scenarios(lire_scenarios(args.entree), strategie, cache,
+                                           rapporter if instrumente else None)
+        else:
+            from .parallele import ExecuteurParallele
+            executeur = ExecuteurParallele(args.processus or None, args.delai, args.essais, chemin_cache=args.cache,
+                                           solveur=args.solveur, ecart=args.ecart, mode=args.mode)
+            resultats = executeur.executer(lire_scenarios(args.entree))
+        for ligne in resultats:
+            ecrivain.ecrire(ligne)
+    finally:
+        if ecrivain is not None:
+            ecrivain.fermer()
+        if fichier is not sys.stdout:
+            fichier.close()
+        if fichier_mesures is not None:
+            fichier_mesures.close()
+    if args.prometheus:
+        with open(args.prometheus, "w", encoding="utf-8") as f:
+            f.write(mesures.exporter_prometheus())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""
+Analyse de sensibilité du programme linéaire : valeurs duales, coûts réduits et intervalles de validité.
+
+Deux modes sont proposés :
+- "relaxation" : les variables entières sont relâchées et le programme linéaire continu est résolu ;
+- "entiers_fixes" : le problème entier est résolu, les machines et les effectifs sont fixés à leur
+  valeur puis le programme linéaire restant est résolu, la production redevenant continue. Le coût
+  réduit d'une machine fixée (par exemple m_decoupe) donne alors la valeur d'une unité supplémentaire :
+  le bénéfice de la production qu'elle permet, moins son coût.
+
+CBC ne fournit pas d'analyse de post-optimalité : la base optimale est reconstruite à partir de la
+solution et les intervalles sont calculés avec NumPy (matrices denses, adapté aux modèles de
+quelques milliers de contraintes). Tant qu'un second membre (ou un coefficient de l'objectif) reste
+dans son intervalle, la base reste optimale et le bénéfice varie linéairement avec la valeur duale
+(ou la valeur de la variable) : il n'est pas nécessaire de résoudre à nouveau.
+
+Utilisation :
+    python -m optimisation sensibilite scenario.json --mode entiers_fixes
+"""
+import argparse
+import json
+import math
+
+import numpy as np
+from pulp import LpContinuous, LpConstraintLE, LpConstraintGE
+
+from .modele import STATUTS_SOLUTION, construire_probleme, contraintes_dimensionnement, statut_resolution
+from .solveurs import strategie
+
+MODES = ("relaxation", "entiers_fixes")
+
+def _forme_matricielle(problem):
+    """
+    Met le problème sous la forme : max c.v  avec  A v + s = b,  lo <= v <= up  et bornes des écarts s.
+    Returns:
+        tuple: (variables, noms des contraintes, A, b, c, bornes inférieures, bornes supérieures),
+               les bornes couvrant les variables puis les écarts.
+    """
+    variables = problem.variables()
+    indice = {v.name: j for j, v in enumerate(variables)}
+    noms = list(problem.constraints)
+    n, m = len(variables), len(noms)
+    A = np.zeros((m, n))
+    b = np.zeros(m)
+    bas_ecarts = np.zeros(m)
+    haut_ecarts = np.zeros(m)
+    for i, nom in enumerate(noms):
+        contrainte = problem.constraints[nom]
+        for variable, coef in contrainte.items():
+            A[i, indice[variable.name]] = coef
+        b[i] = -contrainte.constant
+        if contrainte.sense == LpConstraintLE:
+            haut_ecarts[i] = np.inf
+        elif contrainte.sense == LpConstraintGE:
+            bas_ecarts[i] = -np.inf
+    c = np.zeros(n)
+    for variable, coef in problem.objective.items():
+        c[indice[variable.name]] = coef
+    bas = np.array([-np.inf if v.lowBound is None else v.lowBound for v in variables] + bas_ecarts.tolist())
+    haut = np.array([np.inf if v.upBound is None else v.upBound for v in variables] + haut_ecarts.tolist())
+    return variables, noms, A, b, c, bas, haut
+
+def _choisir_base(colonnes, valeurs, bas, haut, tolerance):
+    """
+    Reconstruit une base à partir de la solution : les colonnes strictement entre leurs bornes sont
+    prioritaires (les plus éloignées d'abord), puis les écarts nuls et les autres colonnes complètent
+    la base en cas de dégénérescence. Une colonne n'est gardée que si elle est indépendante des précédentes.
+    Returns:
+        ndarray: Indices des colonnes de base.
+    """
+    m = colonnes.shape[0]
+    distance = np.minimum(valeurs - bas, haut - valeurs)
+    echelle = tolerance * np.maximum(1.0, np.abs(valeurs))
+    interieures = np.flatnonzero(distance > echelle)
+    interieures = interieures[np.argsort(-distance[interieures], kind="stable")]
+    n = colonnes.shape[1] - m
+    au_bord = [j for j in range(n, n + m) if distance[j] <= echelle[j] and bas[j] != haut[j]]
+    au_bord += [j for j in range(n) if distance[j] <= echelle[j] and bas[j] != haut[j]]
+
+    base, orthonormee = [], np.zeros((m, 0))
+    for j in list(interieures) + au_bord:
+        colonne = colonnes[:, j]
+        residu = colonne - orthonormee @ (orthonormee.T @ colonne)
+        norme = np.linalg.norm(residu)
+        if norme > 1e-9 * max(1.0, np.linalg.norm(colonne)):
+            base.append(j)
+            orthonormee = np.column_stack([orthonormee, residu / norme])
+            if len(base) == m:
+                break
+    if len(base) < m:
+        raise ValueError("Base optimale impossible à reconstruire à partir de la solution")
+    return np.array(base)
+
+def _seuil(direction, tolerance=1e-9):
+    """
+    Composante en dessous de laquelle une direction est du bruit numérique, relative à sa plus grande composante.
+    """
+    return tolerance * max(1.0, float(np.max(np.abs(direction), initial=0.0)))
+
+def _intervalle(valeur, direction, bas, haut):
+    """
+    Calcule l'intervalle [dmin, dmax] des pas d tels que bas <= valeur + d * direction <= haut.
+    Les composantes de direction sous _seuil sont ignorées : le pas n'est pas limité de leur côté.
+    """
+    dmin, dmax = -np.inf, np.inf
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vers_haut = (haut - valeur) / direction
+        vers_bas = (bas - valeur) / direction
+    seuil = _seuil(direction)
+    positifs = direction > seuil
+    negatifs = direction < -seuil
+    if np.any(positifs):
+        dmax = min(dmax, np.min(vers_haut[positifs]))
+        dmin = max(dmin, np.max(vers_bas[positifs]))
+    if np.any(negatifs):
+        dmax = min(dmax, np.min(vers_bas[negatifs]))
+        dmin = max(dmin, np.max(vers_haut[negatifs]))
+    return min(dmin, 0.0), max(dmax, 0.0)
+
+def analyser_modele(modele, tolerance=1e-7):
+    """
+    Calcule les valeurs duales, coûts réduits et intervalles de validité d'un modèle dont le
+    programme linéaire (continu) vient d'être résolu.
+    Args:
+        modele (Modele): Modèle résolu en continu.
+        tolerance (float): Tolérance relative pour décider qu'une valeur est sur une borne.
+    Returns:
+        dict: "contraintes" (valeur duale, écart, second membre et son intervalle) et
+              "variables" (valeur, coût réduit, coefficient de l'objectif et son intervalle).
+    """
+    problem = modele.problem
+    variables, noms, A, b, c, bas, haut = _forme_matricielle(problem)
+    m, n = A.shape
+    colonnes = np.hstack([A, np.eye(m)])
+    couts = np.concatenate([c, np.zeros(m)])
+    valeurs_variables = np.array([v.varValue or 0.0 for v in variables])
+    valeurs = np.concatenate([valeurs_variables, b - A @ valeurs_variables])
+
+    base = _choisir_base(colonnes, valeurs, bas, haut, tolerance)
+    inverse = np.linalg.inv(colonnes[:, base])
+    duales = inverse.T @ couts[base]
+    couts_reduits = couts - colonnes.T @ duales
+    couts_reduits[base] = 0.0
+    hors_base = np.setdiff1d(np.arange(n + m), base)
+    # Une colonne hors base est à sa borne supérieure si elle en est plus proche que de la borne inférieure
+    au_plafond = np.abs(valeurs - haut) < np.abs(valeurs - bas)
+    fixes = bas == haut
+
+    contraintes = {}
+    for i, nom in enumerate(noms):
+        dmin, dmax = _intervalle(valeurs[base], inverse[:, i], bas[base], haut[base])
+        contraintes[nom] = {
+            "duale": float(duales[i]),
+            "ecart": float(valeurs[n + i]),
+            "second_membre": float(b[i]),
+            "second_membre_min": float(b[i] + dmin),
+            "second_membre_max": float(b[i] + dmax),
+        }
+
+    rang = {j: r for r, j in enumerate(base)}
+    resultats_variables = {}
+    for j, variable in enumerate(variables):
+        if fixes[j]:
+            dmin, dmax = -np.inf, np.inf
+        elif j not in rang:
+            # Maximisation : un coût réduit doit rester <= 0 à la borne inférieure, >= 0 à la borne supérieure
+            dmin, dmax = (-couts_reduits[j], np.inf) if au_plafond[j] else (-np.inf, -couts_reduits[j])
+        else:
+            alpha = inverse[rang[j]] @ colonnes[:, hors_base]
+            reduits = couts_reduits[hors_base]
+            seuil = _seuil(alpha)
+            dmin, dmax = -np.inf, np.inf
+            for a, d, plafond, fixe in zip(alpha, reduits, au_plafond[hors_base], fixes[hors_base]):
+                if fixe or abs(a) < seuil:
+                    continue
+                # Le coût réduit devient d - delta * a : il doit garder son signe
+                limite = d / a
+                if (a > 0) != plafond:
+                    dmin = max(dmin, limite)
+                else:
+                    dmax = min(dmax, limite)
+        resultats_variables[variable.name] = {
+            "valeur": float(valeurs[j]),
+            "cout_reduit": float(couts_reduits[j]),
+            "objectif": float(c[j]),
+            "objectif_min": float(c[j] + min(dmin, 0.0)),
+            "objectif_max": float(c[j] + max(dmax, 0.0)),
+        }
+
+    return {"contraintes": contraintes, "variables": resultats_variables}
+
+def analyser_sensibilite(scenario, mode="relaxation", donnees=None, solveur=None):
+    """
+    Résout un scénario en continu et renvoie son analyse de sensibilité.
+    Pour chaque produit, l'intervalle du coefficient de l'objectif est aussi traduit en intervalle
+    de prix de vente (le reste du coefficient, issu des pertes, ne dépend pas du prix).
+    Args:
+        scenario (dict): Scénario à analyser.
+        mode (str): "relaxation" ou "entiers_fixes".
+        donnees (DonneesUsine): Données de l'usine (usine de référence par défaut).
+        solveur: Solveur PuLP ou StrategieResolution (CBC silencieux par défaut). La stratégie résout
+            le problème entier du mode "entiers_fixes" ; son solveur résout le programme continu.
+    Returns:
+        dict: Statut, mode, bénéfice du programme continu, "contraintes", "variables" et "prix".
+    Raises:
+        ValueError: Si le mode est inconnu.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Mode d'analyse inconnu : {mode}")
+    resolution = strategie(solveur)
+    modele = construire_probleme(scenario, donnees)
+    problem = modele.problem
+
+    if mode == "entiers_fixes":
+        resolution.resoudre(modele)
+        statut = statut_resolution(problem)
+        if statut not in STATUTS_SOLUTION:
+            return {"statut": statut, "mode": mode}
+        # Seuls les machines et les effectifs sont fixés : la production reste libre dans le programme continu
+        for _, variable in contraintes_dimensionnement(modele):
+            valeur = round(variable.varValue)
+            variable.lowBound = variable.upBound = valeur
+
+    for variable in problem.variables():
+        variable.cat = LpContinuous
+    problem.solve(resolution.solveur)
+    statut = statut_resolution(problem)
+    if statut != "Optimal":
+        return {"statut": statut, "mode": mode}
+
+    analyse = analyser_modele(modele)
+    analyse["prix"] = {}
+    for produit, variable in modele.x.items():
+        ligne = analyse["variables"][variable.name]
+        prix = scenario["prix_vente"][produit]
+        analyse["prix"][produit] = {
+            "prix": prix,
+            "prix_min": prix + ligne["objectif_min"] - ligne["objectif"],
+            "prix_max": prix + ligne["objectif_max"] - ligne["objectif"],
+        }
+    analyse.update({"statut": statut, "mode": mode, "benefice": problem.objective.value()})
+    return analyse
+
+def _sans_infinis(valeur):
+    """
+    Remplace les bornes infinies par None (JSON n'a pas de valeur infinie).
+    """
+    if isinstance(valeur, dict):
+        return {cle: _sans_infinis(v) for cle, v in valeur.items()}
+    if isinstance(valeur, float) and math.isinf(valeur):
+        return None
+    return valeur
+
+def main(arguments=None):
+    """
+    Point d'entrée en ligne de commande : analyse un scénario et affiche le résultat en JSON
+    (null pour un intervalle non borné).
+    """
+    from .scenarios import normaliser_scenario
+    from .solveurs import MODES as MODES_RESOLUTION, StrategieResolution
+    parser = argparse.ArgumentParser(prog="python -m optimisation sensibilite",
+                                     description="Valeurs duales, coûts réduits et intervalles de validité d'un scénario.")
+    parser.add_argument("scenario", nargs="?", help="Fichier JSON du scénario (scénario par défaut si absent)")
+    parser.add_argument("--mode", choices=MODES, default="relaxation", help="Programme continu analysé")
+    parser.add_argument("--solveur", default="cbc", help="Solveur : cbc, highs, glpk ou nom d'un solveur PuLP installé")
+    parser.add_argument("--delai", type=float, help="Temps de résolution maximal, en secondes")
+    parser.add_argument("--ecart", type=float, help="Écart relatif d'optimalité accepté par le solveur")
+    parser.add_argument("--resolution", choices=MODES_RESOLUTION, default="exact",
+                        help="Mode de résolution du problème entier (mode entiers_fixes)")
+    args = parser.parse_args(arguments)
+
+    donnees = {}
+    if args.scenario:
+        with open(args.scenario, encoding="utf-8") as f:
+            donnees = json.load(f)
+    try:
+        scenario = normaliser_scenario(donnees)
+        resolution = StrategieResolution.depuis_nom(args.solveur, delai=args.delai, ecart=args.ecart,
+                                                    mode=args.resolution)
+    except ValueError as erreur:
+        parser.error(str(erreur))
+    analyse = analyser_sensibilite(scenario, args.mode, solveur=resolution)
+    print(json.dumps(_sans_infinis(analyse), ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
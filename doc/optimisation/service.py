@@ -0,0 +1,378 @@
+"""
+Service HTTP/JSON de résolution de scénarios, à lancer en tâche de fond pour l'interface de planification.
+
+Les scénarios reçus (mêmes champs que les saisies du script interactif, à plat ou par sections,
+voir scenarios.py) sont placés dans une file bornée puis résolus par un groupe de processus
+démarrés d'avance, chacun gardant son modèle construit en mémoire (voir parallele.py).
+
+- Contre-pression : si la file est pleine, la requête est refusée (503 avec Retry-After).
+- Concurrence : au plus un scénario en cours de résolution par processus.
+- Annulation : un scénario encore en file est retiré par DELETE ou si le client se déconnecte.
+  Un scénario déjà confié au solveur va jusqu'au bout (dans la limite de --delai), son résultat est ignoré.
+
+Routes :
+    POST   /resolutions          résout le scénario du corps JSON et renvoie le résultat
+                                 (?attendre=0 : renvoie 202 et l'identifiant de la résolution)
+    GET    /resolutions/<id>     état et résultat d'une résolution
+    DELETE /resolutions/<id>     annule une résolution encore en file
+    GET    /sante                taille de la file, résolutions en cours, processus
+    GET    /metriques            métriques au format Prometheus (voir mesures.py)
+
+Utilisation :
+    python -m optimisation.service --port 8080 -j 4 --file 64 --delai 10
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import signal
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlsplit, parse_qs
+
+from . import parallele
+from .mesures import Chronometre, Mesures, RapportResolution
+from .scenarios import normaliser_scenario
+from .solveurs import MODES, creer_solveur
+
+TAILLE_MAX_CORPS = 1 << 20
+
+RAISONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           409: "Conflict", 413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error",
+           503: "Service Unavailable"}
+
+def _prechauffer(duree):
+    """
+    Tâche vide occupant un processus : en soumettre une par processus force leur démarrage
+    (et donc la construction de leur modèle) avant la première requête.
+    """
+    time.sleep(duree)
+    return os.getpid()
+
+def _longueur_corps(entetes):
+    """
+    Returns:
+        int: Longueur du corps annoncée par l'en-tête Content-Length (0 sans en-tête), None si elle
+             n'est pas un entier positif.
+    """
+    valeur = entetes.get("content-length", "0")
+    return int(valeur) if valeur.isascii() and valeur.isdigit() else None
+
+def _resoudre_scenario(scenario):
+    """
+    Résout un scénario validé avec le modèle du processus.
+    Returns:
+        tuple: (résultats, durée de chaque étape).
+    """
+    chronometre = Chronometre()
+    resultats = parallele._modele.resoudre(scenario, chronometre)
+    return resultats, chronometre.durees
+
+class FileSaturee(Exception):
+    """
+    Levée quand la file d'attente est pleine.
+    """
+
+class Resolution:
+    """
+    Classe représentant une demande de résolution.
+    Attributs:
+        id (str): Identifiant attribué par le service.
+        scenario (dict): Scénario validé.
+        etat (str): "en_attente", "en_cours", "terminee", "annulee" ou "erreur".
+        resultats (dict): Résultats de la résolution (None tant qu'elle n'est pas terminée).
+        erreur (str): Message d'erreur (None sans erreur).
+        fin (asyncio.Event): Signalé quand la résolution est terminée, annulée ou en erreur.
+    """
+    def __init__(self, identifiant, scenario):
+        self.id = identifiant
+        self.scenario = scenario
+        self.etat = "en_attente"
+        self.resultats = None
+        self.erreur = None
+        self.fin = asyncio.Event()
+        self.soumise = time.perf_counter()
+
+    def en_dict(self):
+        return {"id": self.id, "scenario": self.scenario["id"], "etat": self.etat,
+                "erreur": self.erreur, "resultats": self.resultats}
+
+class ServiceOptimisation:
+    """
+    Classe regroupant la file d'attente, le groupe de processus de résolution et le serveur HTTP.
+    Attributs:
+        nb_processus (int): Nombre de processus, et donc de résolutions simultanées.
+        taille_file (int): Nombre maximal de résolutions en attente.
+        mesures (Mesures): Métriques des résolutions effectuées.
+    """
+    def __init__(self, nb_processus=None, taille_file=64, delai=None, solveur="cbc", ecart=None,
+                 mode="exact", chemin_cache=None, max_conservees=1000):
+        self.nb_processus = nb_processus or os.cpu_count() or 1
+        self.taille_file = taille_file
+        self.mesures = Mesures()
+        self._options = (delai, chemin_cache, solveur, ecart, mode)
+        self._max_conservees = max_conservees
+        self._resolutions = OrderedDict()
+        self._compteur = itertools.count(1)
+        self._file = None
+        self._pool = None
+        self._consommateurs = []
+        self._nb_en_cours = 0
+
+    # === Résolutions ===
+
+    def _creer_pool(self):
+        return ProcessPoolExecutor(self.nb_processus, initializer=parallele._initialiser_processus,
+                                   initargs=self._options)
+
+    async def _prechauffer_pool(self):
+        """
+        Crée le groupe de processus et attend que chacun ait construit son modèle.
+        """
+        self._pool = self._creer_pool()
+        boucle = asyncio.get_running_loop()
+        await asyncio.gather(*(boucle.run_in_executor(self._pool, _prechauffer, 0.2)
+                               for _ in range(self.nb_processus)))
+
+    async def demarrer(self):
+        """
+        Démarre les processus de résolution (modèles construits d'avance) et les tâches qui vident la file.
+        """
+        self._file = asyncio.Queue(self.taille_file)
+        await self._prechauffer_pool()
+        self._consommateurs = [asyncio.create_task(self._consommer()) for _ in range(self.nb_processus)]
+
+    async def arreter(self):
+        for tache in self._consommateurs:
+            tache.cancel()
+        await asyncio.gather(*self._consommateurs, return_exceptions=True)
+        for resolution in self._resolutions.values():
+            if not resolution.fin.is_set():
+                resolution.etat, resolution.erreur = "annulee", "Arrêt du service"
+                resolution.fin.set()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def soumettre(self, scenario):
+        """
+        Place un scénario validé dans la file d'attente.
+        Returns:
+            Resolution: Demande de résolution créée.
+        Raises:
+            FileSaturee: Si la file est pleine.
+        """
+        resolution = Resolution(str(next(self._compteur)), scenario)
+        try:
+            self._file.put_nowait(resolution)
+        except asyncio.QueueFull:
+            raise FileSaturee() from None
+        self._resolutions[resolution.id] = resolution
+        while len(self._resolutions) > self._max_conservees:
+            ancienne = next(iter(self._resolutions.values()))
+            if not ancienne.fin.is_set():
+                break
+            self._resolutions.popitem(last=False)
+        return resolution
+
+    def annuler(self, resolution):
+        """
+        Annule une résolution encore en file d'attente.
+        Returns:
+            bool: True si la résolution a été annulée.
+        """
+        if resolution.etat != "en_attente":
+            return False
+        resolution.etat = "annulee"
+        resolution.fin.set()
+        return True
+
+    async def _consommer(self):
+        boucle = asyncio.get_running_loop()
+        while True:
+            resolution = await self._file.get()
+            if resolution.etat == "annulee":
+                continue
+            resolution.etat = "en_cours"
+            self._nb_en_cours += 1
+            pool = self._pool
+            try:
+                resultats, durees = await boucle.run_in_executor(pool, _resoudre_scenario, resolution.scenario)
+            except BrokenProcessPool:
+                resolution.etat, resolution.erreur = "erreur", "Processus de résolution interrompu"
+                resolution.fin.set()
+                # Un processus a été tué : le groupe est remplacé une seule fois, et préchauffé comme le premier
+                if pool is self._pool:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    try:
+                        await self._prechauffer_pool()
+                    except BrokenProcessPool:
+                        pass
+            except Exception as erreur:
+                resolution.etat, resolution.erreur = "erreur", f"{type(erreur).__name__}: {erreur}"
+            else:
+                resolution.etat, resolution.resultats = "terminee", resultats
+                durees["attente"] = time.perf_counter() - resolution.soumise - sum(durees.values())
+                self.mesures.enregistrer(RapportResolution(resolution.scenario["id"], resultats["statut"],
+                                                           resultats["benefice"], durees))
+            finally:
+                self._nb_en_cours -= 1
+                resolution.fin.set()
+
+    def sante(self):
+        return {"file": self._file.qsize(), "taille_file": self.taille_file,
+                "en_cours": self._nb_en_cours, "processus": self.nb_processus}
+
+    # === HTTP ===
+
+    async def _attendre(self, resolution, lecteur):
+        """
+        Attend la fin d'une résolution ; annule la résolution si le client se déconnecte avant.
+        """
+        fin = asyncio.create_task(resolution.fin.wait())
+        deconnexion = asyncio.create_task(lecteur.read(1))
+        try:
+            await asyncio.wait((fin, deconnexion), return_when=asyncio.FIRST_COMPLETED)
+            if not fin.done() and deconnexion.result():
+                # Données reçues après la requête : le client est toujours là
+                await fin
+        finally:
+            fin.cancel()
+            deconnexion.cancel()
+        if not resolution.fin.is_set():
+            self.annuler(resolution)
+            return False
+        return True
+
+    async def _router(self, methode, chemin, parametres, corps, lecteur):
+        """
+        Returns:
+            tuple: (code HTTP, contenu JSON ou texte, en-têtes supplémentaires), ou None si le client est parti.
+        """
+        morceaux = [m for m in chemin.split("/") if m]
+        if morceaux == ["sante"] and methode == "GET":
+            return 200, self.sante(), {}
+        if morceaux == ["metriques"] and methode == "GET":
+            return 200, self.mesures.exporter_prometheus(), {}
+        if morceaux == ["resolutions"]:
+            if methode != "POST":
+                return 405, {"erreur": "Méthode non autorisée"}, {"Allow": "POST"}
+            try:
+                scenario = normaliser_scenario(json.loads(corps or b"{}"))
+            except (ValueError, TypeError, AttributeError) as erreur:
+                return 422, {"erreur": str(erreur)}, {}
+            try:
+                resolution = self.soumettre(scenario)
+            except FileSaturee:
+                return 503, {"erreur": "File d'attente pleine"}, {"Retry-After": "1"}
+            if parametres.get("attendre", ["1"])[-1] in ("0", "non", "false"):
+                return 202, resolution.en_dict(), {"Location": f"/resolutions/{resolution.id}"}
+            if not await self._attendre(resolution, lecteur):
+                return None
+            return (200 if resolution.etat == "terminee" else 500), resolution.en_dict(), {}
+        if len(morceaux) == 2 and morceaux[0] == "resolutions":
+            resolution = self._resolutions.get(morceaux[1])
+            if resolution is None:
+                return 404, {"erreur": "Résolution inconnue"}, {}
+            if methode == "GET":
+                return 200, resolution.en_dict(), {}
+            if methode == "DELETE":
+                if self.annuler(resolution):
+                    return 200, resolution.en_dict(), {}
+                return 409, {"erreur": f"Résolution {resolution.etat}, impossible à annuler"}, {}
+            return 405, {"erreur": "Méthode non autorisée"}, {"Allow": "GET, DELETE"}
+        return 404, {"erreur": "Route inconnue"}, {}
+
+    async def traiter_connexion(self, lecteur, ecrivain):
+        """
+        Traite une requête HTTP/1.1 (une requête par connexion). Une erreur imprévue donne une réponse 500.
+        """
+        try:
+            try:
+                ligne = (await lecteur.readline()).decode("latin-1").split()
+                entetes = {}
+                while True:
+                    entete = (await lecteur.readline()).decode("latin-1").strip()
+                    if not entete:
+                        break
+                    nom, _, valeur = entete.partition(":")
+                    entetes[nom.strip().lower()] = valeur.strip()
+            except ValueError:
+                # Ligne plus longue que la limite du lecteur
+                ligne, entetes = [], {}
+            longueur = _longueur_corps(entetes)
+            if len(ligne) != 3:
+                reponse = 400, {"erreur": "Requête invalide"}, {}
+            elif longueur is None:
+                reponse = 400, {"erreur": "En-tête Content-Length invalide"}, {}
+            elif longueur > TAILLE_MAX_CORPS:
+                reponse = 413, {"erreur": "Corps trop volumineux"}, {}
+            else:
+                methode, cible, _ = ligne
+                corps = await lecteur.readexactly(longueur)
+                url = urlsplit(cible)
+                try:
+                    reponse = await self._router(methode.upper(), url.path, parse_qs(url.query), corps, lecteur)
+                except Exception as erreur:
+                    reponse = 500, {"erreur": f"{type(erreur).__name__}: {erreur}"}, {}
+            if reponse is not None:
+                code, contenu, supplementaires = reponse
+                if isinstance(contenu, str):
+                    type_contenu, donnees = "text/plain; version=0.0.4; charset=utf-8", contenu.encode("utf-8")
+                else:
+                    type_contenu = "application/json; charset=utf-8"
+                    donnees = json.dumps(contenu, ensure_ascii=False).encode("utf-8")
+                entete = [f"HTTP/1.1 {code} {RAISONS.get(code, '')}", f"Content-Type: {type_contenu}",
+                          f"Content-Length: {len(donnees)}", "Connection: close"]
+                entete += [f"{nom}: {valeur}" for nom, valeur in supplementaires.items()]
+                ecrivain.write(("\r\n".join(entete) + "\r\n\r\n").encode("latin-1") + donnees)
+                await ecrivain.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            ecrivain.close()
+
+    async def servir(self, hote="127.0.0.1", port=8080):
+        """
+        Démarre le service et le fait tourner jusqu'à SIGINT ou SIGTERM.
+        """
+        await self.demarrer()
+        serveur = await asyncio.start_server(self.traiter_connexion, hote, port)
+        arret = asyncio.Event()
+        boucle = asyncio.get_running_loop()
+        for signal_arret in (signal.SIGINT, signal.SIGTERM):
+            boucle.add_signal_handler(signal_arret, arret.set)
+        try:
+            async with serveur:
+                await arret.wait()
+        finally:
+            await self.arreter()
+
+def main(arguments=None):
+    """
+    Point d'entrée en ligne de commande du service.
+    """
+    parser = argparse.ArgumentParser(description="Service HTTP/JSON de résolution de scénarios de bénéfice.")
+    parser.add_argument("--hote", default="127.0.0.1", help="Adresse d'écoute")
+    parser.add_argument("--port", type=int, default=8080, help="Port d'écoute")
+    parser.add_argument("-j", "--processus", type=int, default=0, help="Nombre de processus de résolution (0 pour un par cœur)")
+    parser.add_argument("--file", type=int, default=64, help="Nombre maximal de scénarios en attente")
+    parser.add_argument("--delai", type=float, help="Temps de résolution maximal par scénario, en secondes")
+    parser.add_argument("--solveur", default="cbc", help="Solveur : cbc, highs, glpk ou nom d'un solveur PuLP installé")
+    parser.add_argument("--ecart", type=float, help="Écart relatif d'optimalité accepté par le solveur")
+    parser.add_argument("--mode", choices=MODES, default="exact", help="Résolution exacte ou rapide (relaxation arrondie)")
+    parser.add_argument("--cache", help="Base SQLite des résultats déjà calculés")
+    args = parser.parse_args(arguments)
+    try:
+        creer_solveur(args.solveur)
+    except ValueError as erreur:
+        parser.error(str(erreur))
+    service = ServiceOptimisation(args.processus or None, args.file, args.delai, args.solveur, args.ecart,
+                                  args.mode, args.cache)
+    asyncio.run(service.servir(args.hote, args.port))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Session d'exploration : modification d'une valeur du scénario et nouvelle résolution incrémentale.
+
+La session garde le modèle construit et la dernière solution. Une modification (un prix, un
+objectif, un coût, la limite de machines...) ne touche que la fonction objectif ou un second membre,
+puis le problème est résolu à partir de la solution précédente lorsqu'elle reste réalisable
+(warm start de CBC). La réponse est la liste de ce qui a changé : production, machines,
+consommation, pertes, personnel et bénéfice.
+
+Les modifications s'écrivent comme dans un fichier de scénarios (objectifs en pourcentage) :
+    session.modifier({"prix_vente": {"Terrines": 3.4}})
+    session.modifier({"prix_vente.Terrines": 3.4, "objectif.Pate": 80})
+    session.modifier({"cout_porc": 2.2})
+    session.modifier({"limite_machines": 40})
+"""
+from .parametrique import ModeleParametrique
+from .scenarios import SECTIONS, normaliser_scenario, scenario_par_defaut
+
+# Parties des résultats comparées d'une résolution à l'autre
+PARTIES_COMPAREES = ("production", "machines", "carcasses", "bobines", "pertes", "personnel", "charges")
+
+def _ecart(avant, apres, tolerance, minimum):
+    if avant is None or apres is None:
+        return avant != apres
+    return abs(apres - avant) > max(minimum, tolerance * abs(avant))
+
+def comparer_resultats(avant, apres, tolerance=1e-6, minimum=0.01):
+    """
+    Compare deux résultats et ne garde que les valeurs qui ont changé.
+    Args:
+        avant (dict): Résultats de la résolution précédente.
+        apres (dict): Résultats de la nouvelle résolution.
+        tolerance (float): Variation relative en deçà de laquelle une valeur est inchangée.
+        minimum (float): Variation absolue en deçà de laquelle une valeur est inchangée (les pertes
+            proches de zéro varient de la tolérance du solveur d'une résolution à l'autre).
+    Returns:
+        dict: Pour chaque partie modifiée, {clé: {"avant", "apres"}}, ainsi que le statut et
+              le bénéfice (avant, après et écart) s'ils ont changé.
+    """
+    differences = {}
+    for partie in PARTIES_COMPAREES:
+        modifications = {
+            cle: {"avant": avant[partie].get(cle), "apres": valeur}
+            for cle, valeur in apres[partie].items()
+            if _ecart(avant[partie].get(cle), valeur, tolerance, minimum)
+        }
+        if modifications:
+            differences[partie] = modifications
+    if avant["statut"] != apres["statut"]:
+        differences["statut"] = {"avant": avant["statut"], "apres": apres["statut"]}
+    if _ecart(avant["benefice"], apres["benefice"], tolerance, minimum):
+        ecart = None if None in (avant["benefice"], apres["benefice"]) else apres["benefice"] - avant["benefice"]
+        differences["benefice"] = {"avant": avant["benefice"], "apres": apres["benefice"], "ecart": ecart}
+    return differences
+
+def _en_entree(scenario):
+    """
+    Remet un scénario normalisé sous la forme d'une ligne d'entrée (objectifs en pourcentage).
+    """
+    entree = {section: dict(scenario[section]) for section in SECTIONS}
+    entree["objectif"] = {p: valeur * 100 for p, valeur in scenario["objectif"].items()}
+    entree["nb_commerciaux"] = scenario["nb_commerciaux"]
+    entree["id"] = scenario.get("id")
+    return entree
+
+class SessionOptimisation:
+    """
+    Classe gardant un modèle résolu pour explorer l'effet de modifications successives.
+    Attributs:
+        parametrique (ModeleParametrique): Modèle réutilisé d'une résolution à l'autre.
+        scenario (dict): Scénario courant.
+        limite_machines (float): Nombre total de machines autorisé.
+        resultats (dict): Résultats de la dernière résolution (None avant la première).
+        historique (list): Scénarios, limites et résultats précédents, pour annuler.
+    """
+    def __init__(self, scenario=None, solveur=None, donnees=None):
+        """
+        Args:
+            scenario (dict): Scénario initial normalisé (scénario par défaut si None).
+            solveur: Solveur PuLP ou StrategieResolution à utiliser (CBC silencieux par défaut).
+            donnees (DonneesUsine): Données de l'usine (usine de référence par défaut).
+        """
+        self.parametrique = ModeleParametrique(solveur, warm_start=True, donnees=donnees)
+        self.scenario = scenario or scenario_par_defaut()
+        self.limite_machines = self.parametrique.modele.donnees.limite_machines
+        self.resultats = None
+        self.historique = []
+
+    def resoudre(self, chronometre=None):
+        """
+        Résout le scénario courant.
+        Returns:
+            dict: Résultats tels que renvoyés par extraire_resultats.
+        """
+        contrainte = self.parametrique.modele.problem.constraints["Limite_machines"]
+        contrainte.constant = -self.limite_machines
+        self.resultats = self.parametrique.resoudre(self.scenario, chronometre)
+        return self.resultats
+
+    def appliquer(self, modifications):
+        """
+        Calcule le scénario et la limite de machines obtenus après modification, sans résoudre.
+        Args:
+            modifications (dict): Sections imbriquées ({"prix_vente": {"Terrines": 3.4}}), clés
+                pointées ("prix_vente.Terrines"), colonnes d'un fichier de scénarios ("prix_Terrines")
+                ou valeurs simples ("nb_commerciaux", "limite_machines").
+        Returns:
+            tuple: Scénario normalisé et limite de machines.
+        Raises:
+            ValueError: Si une clé est inconnue ou une valeur hors bornes.
+        """
+        entree = _en_entree(self.scenario)
+        limite = self.limite_machines
+        for cle, valeur in modifications.items():
+            section, _, sous_cle = cle.partition(".")
+            for nom, (prefixe, _) in SECTIONS.items():
+                if not sous_cle and section not in SECTIONS and section.startswith(prefixe):
+                    section, sous_cle = nom, section[len(prefixe):]
+            if section.lower() == "limite_machines":
+                limite = float(valeur)
+                if limite < 0:
+                    raise ValueError(f"limite_machines = {limite} doit être positive")
+            elif section == "nb_commerciaux":
+                entree["nb_commerciaux"] = valeur
+            elif section in SECTIONS and isinstance(valeur, dict) and not sous_cle:
+                entree[section].update(valeur)
+            elif section in SECTIONS and sous_cle:
+                entree[section][sous_cle] = valeur
+            else:
+                raise ValueError(f"Modification inconnue : {cle}")
+        for section in SECTIONS:
+            inconnues = set(entree[section]) - set(self.scenario[section])
+            if inconnues:
+                raise ValueError(f"Clé inconnue dans {section} : {', '.join(sorted(inconnues))}")
+        return normaliser_scenario(entree), limite
+
+    def modifier(self, modifications, chronometre=None):
+        """
+        Applique des modifications au scénario courant et résout de nouveau, à partir de la
+        solution précédente.
+        Args:
+            modifications (dict): Modifications (voir appliquer).
+            chronometre (Chronometre): Chronomètre recevant la durée de chaque étape.
+        Returns:
+            dict: Différences avec la résolution précédente (voir comparer_resultats).
+        Raises:
+            ValueError: Si une modification est invalide (la session reste inchangée).
+        """
+        scenario, limite = self.appliquer(modifications)
+        if self.resultats is None:
+            self.resoudre()
+        if scenario == self.scenario and limite == self.limite_machines:
+            return {}
+        self.historique.append((self.scenario, self.limite_machines, self.resultats))
+        avant = self.resultats
+        self.scenario, self.limite_machines = scenario, limite
+        return comparer_resultats(avant, self.resoudre(chronometre))
+
+    def annuler(self):
+        """
+        Revient au scénario précédant la dernière modification. Ses résultats sont repris de
+        l'historique, sans nouvelle résolution : le modèle est remis à jour à la prochaine.
+        Returns:
+            dict: Différences avec les résultats annulés (vide s'il n'y a rien à annuler).
+        """
+        if not self.historique:
+            return {}
+        avant = self.resultats
+        self.scenario, self.limite_machines, self.resultats = self.historique.pop()
+        return comparer_resultats(avant, self.resultats)
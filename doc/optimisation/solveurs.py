@@ -0,0 +1,314 @@
+"""
+Choix du solveur et de la stratégie de résolution.
+
+Le solveur est désigné par un nom court ("cbc", "highs", "glpk") ou par le nom d'un solveur PuLP
+installé localement, avec un nombre de threads, un temps maximal et un écart relatif d'optimalité.
+
+Trois modes de résolution sont proposés :
+- "exact" : résolution du programme en nombres entiers, dans la limite du temps et de l'écart fixés ;
+- "rapide" : la production est relâchée en continu (seuls les nombres de machines et les effectifs
+  restent entiers, ce qui laisse peu de branchements), puis arrondie à l'entier inférieur et fixée
+  pour une dernière résolution. Arrondir la production vers le bas ne fait que libérer de la capacité
+  et de la matière : cette dernière résolution a toujours une solution. La valeur de la relaxation
+  est une borne supérieure du bénéfice, qui donne l'écart maximal à l'optimum.
+- "etages" : résolution par étages. Le programme est d'abord résolu en continu ; les machines sont
+  arrondies dans la limite totale et les effectifs en sont déduits directement (dimensionner) ; la
+  production est ensuite relâchée à machines fixées, arrondie à l'entier inférieur, puis améliorée par
+  un court programme en nombres entiers sur la seule production (DELAI_REPARATION). Les machines et
+  les salariés n'ayant qu'un coût, le plus petit nombre entier respectant la capacité et l'encadrement
+  est optimal : le calcul direct remplace le branchement sur ces variables. La relaxation donne, comme
+  en mode rapide, une borne supérieure du bénéfice.
+
+Une solution non prouvée optimale (limite de temps, écart d'optimalité, mode rapide ou par étages) a le
+statut "Realisable" : elle n'est pas mémorisée par le cache des résultats. CBC signale "Optimal" un arrêt
+sur l'écart relatif : le statut est corrigé après la résolution.
+
+PuLP n'est importé qu'à la création d'un solveur ou à la première résolution.
+"""
+from math import ceil, floor
+
+MODES = ("exact", "rapide", "etages")
+
+# Temps maximal du programme de réparation en mode par étages, en secondes
+DELAI_REPARATION = 2.0
+
+# Noms courts et solveurs PuLP correspondants, par ordre de préférence
+SOLVEURS = {
+    "cbc": ("PULP_CBC_CMD", "COIN_CMD"),
+    "highs": ("HiGHS", "HiGHS_CMD"),
+    "glpk": ("GLPK_CMD",),
+}
+
+# Réglages prédéfinis : réponse rapide pour les requêtes interactives, optimum exact pour les lots de nuit
+STRATEGIES = {
+    "interactif": {"mode": "rapide", "delai": 1.0},
+    "nuit": {"mode": "exact"},
+}
+
+def solveurs_disponibles():
+    """
+    Returns:
+        list: Noms PuLP des solveurs installés localement.
+    """
+    from pulp import listSolvers
+    return listSolvers(onlyAvailable=True)
+
+def creer_solveur(nom="cbc", threads=None, delai=None, ecart=None, msg=False):
+    """
+    Crée un solveur PuLP à partir de son nom.
+    Args:
+        nom (str): Nom court (voir SOLVEURS) ou nom d'un solveur PuLP.
+        threads (int): Nombre de threads du solveur (None pour sa valeur par défaut).
+        delai (float): Temps de résolution maximal, en secondes (None pour aucun).
+        ecart (float): Écart relatif d'optimalité accepté (None pour l'optimum exact).
+        msg (bool): Afficher la sortie du solveur.
+    Returns:
+        LpSolver: Solveur prêt à l'emploi.
+    Raises:
+        ValueError: Si aucun solveur correspondant n'est installé.
+    """
+    from pulp import PulpSolverError, getSolver
+    options = {"msg": msg}
+    for cle, valeur in (("threads", threads), ("timeLimit", delai), ("gapRel", ecart)):
+        if valeur is not None:
+            options[cle] = valeur
+    candidats = SOLVEURS.get(nom.lower(), (nom,))
+    for candidat in candidats:
+        try:
+            solveur = getSolver(candidat, **options)
+        except PulpSolverError:
+            continue
+        if solveur.available():
+            return solveur
+    raise ValueError(f"Solveur {nom} non disponible (solveurs installés : {', '.join(solveurs_disponibles())})")
+
+def resoudre_relaxation_arrondie(modele, solveur):
+    """
+    Résout le problème avec une production continue, arrondit la production à l'entier inférieur
+    puis résout le problème à production fixée. Les variables de production retrouvent ensuite
+    leur catégorie et leurs bornes.
+    Args:
+        modele (Modele): Modèle à résoudre.
+        solveur: Solveur PuLP.
+    Returns:
+        float | None: Bénéfice de la relaxation, borne supérieure du bénéfice (None si la relaxation
+                      n'a pas été résolue à l'optimum). Le statut du problème indique si une solution entière a été trouvée.
+    """
+    from pulp import LpContinuous, LpStatusOptimal, LpSolutionOptimal
+    problem = modele.problem
+    production = list(modele.x.values())
+    bornes = [(v.cat, v.lowBound, v.upBound) for v in production]
+    try:
+        for variable in production:
+            variable.cat = LpContinuous
+        problem.solve(solveur)
+        if problem.status != LpStatusOptimal:
+            return None
+        borne = problem.objective.value() if problem.sol_status == LpSolutionOptimal else None
+        # Les valeurs lues peuvent dépasser leurs bornes de la tolérance du solveur, et une production
+        # nulle ne doit pas être arrondie sous sa borne inférieure
+        for variable, (_, bas, _) in zip(production, bornes):
+            valeur = variable.varValue
+            arrondi = floor(valeur - 1e-6 * max(1.0, abs(valeur)))
+            variable.lowBound = variable.upBound = arrondi if bas is None else max(arrondi, ceil(bas))
+        problem.solve(solveur)
+    finally:
+        for variable, (categorie, bas, haut) in zip(production, bornes):
+            variable.cat, variable.lowBound, variable.upBound = categorie, bas, haut
+    return borne
+
+def dimensionner(modele, machines=True, tolerance=1e-9):
+    """
+    Fixe les valeurs des machines puis des effectifs au plus petit entier respectant la capacité
+    et l'encadrement, à production et consommation données (valeurs actuelles des variables).
+    Args:
+        modele (Modele): Modèle dont la production et la consommation portent une valeur.
+        machines (bool): Dimensionner aussi les machines (sinon seulement les effectifs, à machines données).
+        tolerance (float): Dépassement relatif toléré avant d'arrondir à l'entier supérieur.
+    """
+    from .modele import contraintes_dimensionnement
+    couples = contraintes_dimensionnement(modele)
+    for contrainte, variable in couples if machines else couples[len(modele.machines):]:
+        # Contrainte "a * variable + reste >= 0" (a > 0) ou "<= 0" (a < 0) : variable >= -reste / a
+        coefficient, reste = 0.0, contrainte.constant
+        for autre, a in contrainte.items():
+            if autre is variable:
+                coefficient = a
+            else:
+                reste += a * autre.varValue
+        seuil = -reste / coefficient
+        variable.varValue = ceil(seuil - tolerance * max(1.0, abs(seuil)))
+
+def arrondir_machines(modele, tolerance=1e-9):
+    """
+    Arrondit les machines de la relaxation continue sans dépasser la limite totale : chaque type
+    reçoit la partie entière de sa valeur, puis les machines encore autorisées vont aux types de
+    plus grande partie fractionnaire.
+    Args:
+        modele (Modele): Modèle dont les machines portent les valeurs de la relaxation.
+    """
+    machines = list(modele.machines.values())
+    valeurs = [v.varValue for v in machines]
+    entiers = [floor(v + tolerance * max(1.0, abs(v))) for v in valeurs]
+    disponibles = floor(-modele.problem.constraints["Limite_machines"].constant + tolerance) - sum(entiers)
+    ordre = sorted(range(len(machines)), key=lambda i: entiers[i] - valeurs[i])
+    for i in ordre[:max(0, disponibles)]:
+        if valeurs[i] > entiers[i]:
+            entiers[i] += 1
+    for variable, valeur in zip(machines, entiers):
+        variable.varValue = valeur
+
+def resoudre_par_etages(modele, solveur, delai_reparation=DELAI_REPARATION):
+    """
+    Résout le problème par étages :
+    1. relaxation continue de tout le programme (borne supérieure du bénéfice) ;
+    2. machines arrondies dans la limite totale (arrondir_machines), effectifs calculés (dimensionner) ;
+    3. à machines et effectifs fixés, production relâchée puis arrondie à l'entier inférieur (toujours
+       réalisable, voir resoudre_relaxation_arrondie), et court programme en nombres entiers sur la
+       production parti de cette solution, limité à delai_reparation secondes ;
+    4. machines et effectifs redimensionnés sur la production retenue (dimensionner).
+    Les variables retrouvent ensuite leur catégorie et leurs bornes.
+    Args:
+        modele (Modele): Modèle à résoudre.
+        solveur: Solveur PuLP.
+        delai_reparation (float): Temps maximal du programme de réparation, en secondes.
+    Returns:
+        float | None: Bénéfice de la relaxation, borne supérieure du bénéfice (None si la relaxation
+                      n'a pas été résolue à l'optimum). Le statut du problème indique si une solution entière a été trouvée.
+    """
+    from pulp import LpContinuous, LpInteger, LpStatusOptimal, LpSolutionOptimal, LpSolutionIntegerFeasible
+    from .modele import contraintes_dimensionnement
+    problem = modele.problem
+    entieres = [v for v in problem.variables() if v.cat == LpInteger]
+    dimensionnees = [variable for _, variable in contraintes_dimensionnement(modele)]
+    production = list(modele.x.values())
+    bornes = [(v.cat, v.lowBound, v.upBound) for v in entieres + dimensionnees]
+    options = getattr(solveur, "optionsDict", {})
+    depart, delai = options.get("warmStart"), getattr(solveur, "timeLimit", None)
+    try:
+        if hasattr(solveur, "optionsDict"):
+            options["warmStart"] = False
+        for variable in entieres:
+            variable.cat = LpContinuous
+        problem.solve(solveur)
+        if problem.status != LpStatusOptimal:
+            return None
+        borne = problem.objective.value() if problem.sol_status == LpSolutionOptimal else None
+
+        arrondir_machines(modele)
+        dimensionner(modele, machines=False)
+        for variable in dimensionnees:
+            variable.lowBound = variable.upBound = variable.varValue
+        problem.solve(solveur)
+        if problem.status != LpStatusOptimal:
+            return borne
+        for variable in production:
+            valeur = variable.varValue
+            variable.varValue = floor(valeur - 1e-6 * max(1.0, abs(valeur)))
+        solution = [(v, v.varValue) for v in problem.variables()]
+
+        for variable, (categorie, _, _) in zip(entieres, bornes):
+            variable.cat = categorie
+        if hasattr(solveur, "optionsDict"):
+            options["warmStart"] = True
+        solveur.timeLimit = delai_reparation if delai is None else min(delai, delai_reparation)
+        problem.solve(solveur)
+        if problem.status != LpStatusOptimal:
+            # Réparation sans solution dans le délai : la production arrondie reste réalisable
+            for variable, valeur in solution:
+                variable.varValue = valeur
+            problem.status, problem.sol_status = LpStatusOptimal, LpSolutionIntegerFeasible
+        dimensionner(modele)
+    finally:
+        for variable, (categorie, bas, haut) in zip(entieres + dimensionnees, bornes):
+            variable.cat, variable.lowBound, variable.upBound = categorie, bas, haut
+        if depart is None:
+            options.pop("warmStart", None)
+        else:
+            options["warmStart"] = depart
+        if hasattr(solveur, "timeLimit"):
+            solveur.timeLimit = delai
+    return borne
+
+class StrategieResolution:
+    """
+    Classe représentant la manière de résoudre un modèle : solveur et mode.
+    Attributs:
+        solveur: Solveur PuLP utilisé.
+        mode (str): "exact", "rapide" ou "etages".
+        derniere_borne (float): Borne supérieure du bénéfice obtenue par la dernière résolution
+            rapide ou par étages (None en mode exact).
+    """
+    def __init__(self, solveur=None, mode="exact"):
+        if mode not in MODES:
+            raise ValueError(f"Mode de résolution inconnu : {mode}")
+        self.solveur = solveur or creer_solveur()
+        self.mode = mode
+        self.derniere_borne = None
+
+    @classmethod
+    def depuis_nom(cls, nom="cbc", threads=None, delai=None, ecart=None, mode="exact"):
+        """
+        Crée une stratégie à partir du nom du solveur et de ses réglages (voir creer_solveur).
+        """
+        return cls(creer_solveur(nom, threads, delai, ecart), mode)
+
+    @classmethod
+    def predefinie(cls, nom, solveur="cbc", threads=None):
+        """
+        Crée une stratégie à partir d'un réglage de STRATEGIES.
+        Args:
+            nom (str): "interactif" ou "nuit".
+            solveur (str): Nom du solveur.
+            threads (int): Nombre de threads du solveur.
+        """
+        reglage = dict(STRATEGIES[nom])
+        mode = reglage.pop("mode")
+        return cls.depuis_nom(solveur, threads, mode=mode, **reglage)
+
+    def empreinte(self):
+        """
+        Returns:
+            dict: Réglages dont dépend le résultat d'une résolution : solveur, mode, écart relatif
+                  et temps maximal (clé du cache des résultats).
+        """
+        options = getattr(self.solveur, "optionsDict", {})
+        return {"solveur": getattr(self.solveur, "name", type(self.solveur).__name__), "mode": self.mode,
+                "ecart": options.get("gapRel"), "delai": getattr(self.solveur, "timeLimit", None)}
+
+    def resoudre(self, modele):
+        """
+        Résout le modèle selon le mode choisi. En mode rapide ou par étages, si aucune solution n'est
+        trouvée (relaxation irréalisable ou production arrondie irréalisable), le programme complet est
+        résolu. Le mode par étages ne s'applique qu'aux modèles mensuels (machines et encadrement) :
+        les autres modèles sont résolus en mode exact. Un optimum obtenu avec un écart relatif non nul
+        n'est pas prouvé : la solution est signalée réalisable.
+        Args:
+            modele (Modele): Modèle à résoudre.
+        Returns:
+            int: Statut PuLP de la résolution.
+        """
+        from pulp import LpStatusOptimal, LpSolutionOptimal, LpSolutionIntegerFeasible
+        problem = modele.problem
+        self.derniere_borne = None
+        from .modele import Modele
+        resolution = {"rapide": resoudre_relaxation_arrondie, "etages": resoudre_par_etages}.get(self.mode)
+        if self.mode == "etages" and not isinstance(modele, Modele):
+            resolution = None
+        if resolution is not None:
+            self.derniere_borne = resolution(modele, self.solveur)
+            if problem.status == LpStatusOptimal:
+                problem.sol_status = LpSolutionIntegerFeasible
+                return problem.status
+            self.derniere_borne = None
+        statut = problem.solve(self.solveur)
+        if (getattr(self.solveur, "optionsDict", {}).get("gapRel") and problem.isMIP()
+                and problem.sol_status == LpSolutionOptimal):
+            problem.sol_status = LpSolutionIntegerFeasible
+        return statut
+
+def strategie(solveur):
+    """
+    Renvoie la stratégie correspondant à un solveur PuLP, à une stratégie ou à None (CBC exact).
+    """
+    return solveur if isinstance(solveur, StrategieResolution) else StrategieResolution(solveur)
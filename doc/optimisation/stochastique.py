@@ -0,0 +1,421 @@
+"""
+Optimisation stochastique à deux étapes sur l'incertitude de la demande.
+
+Les coefficients de marché ne sont plus une valeur saisie mais une loi : chaque échantillon tire un
+coefficient par produit (loi log-normale centrée sur le coefficient du scénario, avec un facteur de
+marché commun à tous les produits). Les décisions sont prises en deux temps :
+- première étape, avant de connaître la demande : nombre de machines et effectifs d'encadrement ;
+- seconde étape, pour chaque échantillon : production, carcasses et bobines.
+
+ModeleStochastique résout le problème complet (forme étendue) sur un petit nombre d'échantillons.
+La production de seconde étape y est continue par défaut : entière, elle multiplie les branchements
+de CBC par le nombre d'échantillons pour un effet négligeable (quantités de l'ordre du million),
+l'évaluation des premières étapes proposées restant faite en nombres entiers.
+Le bénéfice maximisé est (1 - aversion) * espérance + aversion * CVaR, la CVaR au niveau alpha
+étant la moyenne des (1 - alpha) plus mauvais bénéfices (formulation de Rockafellar et Uryasev).
+
+resoudre_saa applique l'approximation par moyenne d'échantillons (SAA) pour des centaines
+d'échantillons : plusieurs formes étendues de petite taille proposent chacune une première étape,
+puis chaque proposition est évaluée sur un grand échantillon commun. À première étape fixée, les
+échantillons sont indépendants (recours toujours réalisable : ne rien produire l'est) : ils sont
+résolus séparément, en parallèle sur plusieurs processus. La moyenne des valeurs des formes
+étendues estime une borne supérieure du bénéfice espéré, d'où un écart d'optimalité estimé
+(sans aversion au risque seulement).
+
+Utilisation :
+    python -m optimisation stochastique scenario.json --echantillons 500 --dispersion 0.2 -j 4
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from pulp import LpProblem, LpMaximize, LpVariable, LpConstraint, LpConstraintLE, lpSum
+
+from .donnees import donnees_reference
+from .modele import (_expression, _expressions_par_ligne, _arrondi_superieur, appliquer_parametres,
+                     coefficients_pertes, construire_structure, demande_maximale, statut_resolution)
+from .solveurs import MODES, StrategieResolution, creer_solveur, strategie
+
+# Catégories de personnel décidées en première étape (les ouvriers découlent des machines)
+PERSONNEL_PREMIERE_ETAPE = ("Agents_Maitrise", "Cadres_Moyens", "Assistants_Commerciaux", "Employes")
+
+def tirer_coefficients(scenario, nb_echantillons, dispersion=0.2, correlation=0.5, graine=0, donnees=None):
+    """
+    Tire des coefficients de marché autour de ceux du scénario.
+    Chaque coefficient est multiplié par un facteur log-normal d'espérance 1, combinaison d'un
+    facteur commun à tous les produits et d'un facteur propre au produit, puis borné à [0, 2].
+    Args:
+        scenario (dict): Scénario dont les coefficients servent de valeur centrale.
+        nb_echantillons (int): Nombre d'échantillons.
+        dispersion (float): Écart type du logarithme du facteur.
+        correlation (float): Part de la variance due au facteur commun (entre 0 et 1).
+        graine (int): Graine du générateur aléatoire.
+        donnees (DonneesUsine): Données de l'usine (usine de référence par défaut).
+    Returns:
+        list: Coefficients de chaque échantillon (dictionnaires indexés par produit).
+    """
+    donnees = donnees or donnees_reference()
+    rng = np.random.default_rng(graine)
+    centre = np.array([scenario["coefficients"][p] for p in donnees.produits])
+    commun = rng.standard_normal((nb_echantillons, 1))
+    propre = rng.standard_normal((nb_echantillons, len(donnees.produits)))
+    z = np.sqrt(correlation) * commun + np.sqrt(1 - correlation) * propre
+    coefficients = np.clip(centre * np.exp(dispersion * z - dispersion ** 2 / 2), 0, 2)
+    return [dict(zip(donnees.produits, ligne)) for ligne in coefficients.tolist()]
+
+def cvar(benefices, alpha=0.95):
+    """
+    Calcule la CVaR empirique : moyenne des (1 - alpha) plus mauvais bénéfices, le dernier
+    échantillon de la queue comptant pour la fraction nécessaire.
+    Args:
+        benefices (list): Bénéfice de chaque échantillon (équiprobables).
+        alpha (float): Niveau de confiance (entre 0 et 1).
+    Returns:
+        float: CVaR du bénéfice.
+    """
+    valeurs = np.sort(np.asarray(benefices, dtype=float))
+    queue = (1 - alpha) * len(valeurs)
+    if queue <= 0:
+        return float(valeurs[0])
+    poids = np.clip(queue - np.arange(len(valeurs)), 0, 1)
+    return float(poids @ valeurs / queue)
+
+def resume_benefices(benefices, alpha=0.95):
+    """
+    Returns:
+        dict: Espérance, erreur type, CVaR et quantiles des bénéfices échantillonnés.
+    """
+    valeurs = np.asarray(benefices, dtype=float)
+    return {
+        "benefice_espere": float(valeurs.mean()),
+        "erreur_type": float(valeurs.std(ddof=1) / np.sqrt(len(valeurs))) if len(valeurs) > 1 else 0.0,
+        "cvar": cvar(valeurs, alpha),
+        "quantiles": {f"{q:g}": float(v) for q, v in zip((0.05, 0.5, 0.95), np.quantile(valeurs, (0.05, 0.5, 0.95)))},
+    }
+
+class ModeleStochastique:
+    """
+    Classe représentant la forme étendue du problème à deux étapes.
+    Attributs:
+        problem (LpProblem): Problème de maximisation.
+        donnees (DonneesUsine): Données de l'usine.
+        echantillons (list): Coefficients de marché de chaque échantillon.
+        alpha (float): Niveau de la CVaR.
+        aversion (float): Poids de la CVaR dans l'objectif (0 : espérance seule).
+        machines (dict): Variables du nombre de machines (première étape).
+        personnel (dict): Variables et expressions des effectifs (première étape).
+        x (dict): Variables de production, indexées par (produit, numéro d'échantillon).
+        benefices (list): Expression du bénéfice de chaque échantillon.
+    """
+    def __init__(self, scenario, echantillons, donnees=None, alpha=0.95, aversion=0.0, production_entiere=False):
+        """
+        Args:
+            scenario (dict): Scénario fixant prix, coûts, salaires, objectifs et commerciaux.
+            echantillons (list): Coefficients de marché de chaque échantillon.
+            donnees (DonneesUsine): Données de l'usine (usine de référence par défaut).
+            alpha (float): Niveau de la CVaR.
+            aversion (float): Poids de la CVaR dans l'objectif, entre 0 et 1.
+            production_entiere (bool): Production de seconde étape en nombres entiers.
+        """
+        self.donnees = donnees = donnees or donnees_reference()
+        self.echantillons = list(echantillons)
+        self.alpha = alpha
+        self.aversion = aversion
+        self.problem = problem = LpProblem("Maximisation_du_Benefice_stochastique", LpMaximize)
+        K = len(donnees.machines)
+        N = len(self.echantillons)
+        salaires = scenario["salaires"]
+        nb_commerciaux = scenario["nb_commerciaux"]
+        prix = np.array([scenario["prix_vente"][p] for p in donnees.produits])
+        couts_kg = np.array([scenario["couts_matieres"][s] for s in donnees.sources])
+        coef_sources, coef_produits = coefficients_pertes(donnees, couts_kg)
+        cout_source = donnees.poids_sources * couts_kg
+
+        # === Première étape ===
+        m = [LpVariable(f"m_{k}", cat="Integer") for k in donnees.machines]
+        nb_agents_maitrise = LpVariable("nb_agents_maitrise", cat="Integer")
+        nb_cadres = LpVariable("nb_cadres", cat="Integer")
+        nb_employes = LpVariable("nb_employes", cat="Integer")
+        nb_assistants = LpVariable("nb_assistants", cat="Integer")
+        nb_ouvriers = _expression(m, donnees.ouvriers_machines)
+
+        problem += lpSum(m) <= donnees.limite_machines, "Limite_machines"
+        problem += nb_agents_maitrise >= nb_ouvriers / 5, "Encadrement_par_agents_maitrise"
+        problem += nb_cadres >= (nb_agents_maitrise + nb_commerciaux + nb_ouvriers) / 18, "Encadrement_par_cadres"
+        problem += nb_assistants >= nb_commerciaux / 5, "Assistants_commerciaux"
+        problem += nb_employes >= (nb_ouvriers + nb_agents_maitrise + nb_cadres + nb_commerciaux + nb_assistants + 1) / 15, "Encadrement_global"
+
+        self.machines = dict(zip(donnees.machines, m))
+        self.personnel = {
+            "Ouvriers": nb_ouvriers, "Agents_Maitrise": nb_agents_maitrise, "Cadres_Moyens": nb_cadres,
+            "Commerciaux": nb_commerciaux, "Assistants_Commerciaux": nb_assistants, "Employes": nb_employes,
+        }
+        self.cout_premiere_etape = _expression(m, donnees.cout_machines) + (
+            nb_ouvriers * salaires["Ouvriers"] + nb_agents_maitrise * salaires["Agents_Maitrise"] +
+            nb_cadres * salaires["Cadres_Moyens"] + nb_commerciaux * salaires["Commerciaux"] +
+            nb_assistants * salaires["Assistants_Commerciaux"] + nb_employes * salaires["Employes"] +
+            salaires["Dirigeants"]
+        )
+
+        # === Seconde étape : un jeu de variables et de contraintes par échantillon ===
+        self.x, self.sources, self.benefices = {}, [], []
+        for w, coefficients in enumerate(self.echantillons):
+            demande_max = demande_maximale(coefficients, donnees)
+            x = [LpVariable(f"x_{p}_{w}", cat="Integer" if production_entiere else "Continuous")
+                 for p in donnees.produits]
+            s = [LpVariable(f"{'carcasses' if c else 'bobines'}_{nom}_{w}")
+                 for nom, c in zip(donnees.sources, donnees.est_carcasse)]
+            for p, variable in zip(donnees.produits, x):
+                problem += variable <= demande_max[p] * scenario["objectif"][p], f"Demande_{p}_{w}"
+                self.x[p, w] = variable
+            capacites = _expressions_par_ligne(K, (donnees.charge_produits, x), (-np.eye(K), m),
+                                               (donnees.charge_sources, s))
+            for k, expression in zip(donnees.machines, capacites):
+                problem.addConstraint(LpConstraint(expression, LpConstraintLE, f"Capacite_{k}_{w}", 0))
+            matieres = _expressions_par_ligne(len(donnees.matieres), (donnees.recettes.T, x),
+                                              (-donnees.rendements.T, s))
+            for matiere, expression in zip(donnees.matieres, matieres):
+                problem.addConstraint(LpConstraint(expression, LpConstraintLE, f"MP_{matiere}_{w}", 0))
+            self.sources.append(s)
+            self.benefices.append(_expression(x, prix + coef_produits) - _expression(s, cout_source + coef_sources)
+                                  - self.cout_premiere_etape)
+
+        # === Objectif : espérance et CVaR ===
+        esperance = lpSum(self.benefices) / N
+        if aversion > 0:
+            # CVaR = eta - somme(u_w) / ((1 - alpha) N), avec u_w >= eta - bénéfice_w et u_w >= 0
+            eta = LpVariable("seuil_var")
+            u = [LpVariable(f"depassement_{w}", lowBound=0) for w in range(N)]
+            for w, (uw, benefice) in enumerate(zip(u, self.benefices)):
+                problem += uw >= eta - benefice, f"CVaR_{w}"
+            self.cvar = eta - lpSum(u) / ((1 - alpha) * N)
+            problem += (1 - aversion) * esperance + aversion * self.cvar, "Bénéfice_stochastique"
+        else:
+            self.cvar = None
+            problem += esperance, "Bénéfice_stochastique"
+
+    def premiere_etape(self):
+        """
+        Returns:
+            dict: Machines et effectifs d'encadrement retenus, utilisables par evaluer_premiere_etape.
+        """
+        return {
+            "machines": {k: round(v.varValue) for k, v in self.machines.items()},
+            "personnel": {c: round(self.personnel[c].varValue) for c in PERSONNEL_PREMIERE_ETAPE},
+        }
+
+    def resoudre(self, solveur=None):
+        """
+        Résout la forme étendue.
+        Args:
+            solveur: Solveur PuLP ou StrategieResolution à utiliser (CBC silencieux par défaut).
+        Returns:
+            dict: Statut, valeur de l'objectif, première étape, résumé des bénéfices par échantillon
+                  et production de chaque échantillon (None sans solution).
+        """
+        strategie(solveur).resoudre(self)
+        statut = statut_resolution(self.problem)
+        if statut not in ("Optimal", "Realisable"):
+            return {"statut": statut, "objectif": None, "premiere_etape": None, "echantillons": None}
+        benefices = [b.value() for b in self.benefices]
+        nb_carcasses = len(self.donnees.carcasses)
+        return {
+            "statut": statut,
+            "objectif": self.problem.objective.value(),
+            "premiere_etape": self.premiere_etape(),
+            **resume_benefices(benefices, self.alpha),
+            "echantillons": [
+                {
+                    "coefficients": coefficients,
+                    "production": {p: self.x[p, w].varValue for p in self.donnees.produits},
+                    "carcasses": {c: _arrondi_superieur(v.varValue)
+                                  for c, v in zip(self.donnees.carcasses, self.sources[w][:nb_carcasses])},
+                    "bobines": {b: _arrondi_superieur(v.varValue)
+                                for b, v in zip(self.donnees.bobines, self.sources[w][nb_carcasses:])},
+                    "benefice": benefice,
+                }
+                for w, (coefficients, benefice) in enumerate(zip(self.echantillons, benefices))
+            ],
+        }
+
+# === Évaluation d'une première étape fixée ===
+
+def _reglage_solveur(reglage):
+    """
+    Crée la stratégie décrite par (nom, délai, écart, mode), sur un seul thread.
+    """
+    nom, delai, ecart, mode = reglage
+    return StrategieResolution(creer_solveur(nom, threads=1, delai=delai, ecart=ecart), mode)
+
+def evaluer_lot(scenario, premiere_etape, echantillons, donnees=None, reglage=("cbc", None, None, "exact")):
+    """
+    Résout la seconde étape de chaque échantillon, machines et effectifs étant fixés. La structure
+    du modèle mensuel est construite une fois et seuls les seconds membres de demande changent
+    d'un échantillon à l'autre.
+    Args:
+        scenario (dict): Scénario de référence.
+        premiere_etape (dict): Machines et effectifs (voir ModeleStochastique.premiere_etape).
+        echantillons (list): Coefficients de marché de chaque échantillon.
+        donnees (DonneesUsine): Données de l'usine (usine de référence par défaut).
+        reglage (tuple): Nom du solveur, délai, écart et mode de résolution.
+    Returns:
+        list: Bénéfice de chaque échantillon (None si la résolution a échoué).
+    """
+    modele = construire_structure(donnees)
+    for k, variable in modele.machines.items():
+        variable.lowBound = variable.upBound = premiere_etape["machines"][k]
+    for categorie in PERSONNEL_PREMIERE_ETAPE:
+        variable = modele.personnel[categorie]
+        variable.lowBound = variable.upBound = premiere_etape["personnel"][categorie]
+    resolution = _reglage_solveur(reglage)
+    benefices = []
+    for coefficients in echantillons:
+        appliquer_parametres(modele, {**scenario, "coefficients": coefficients})
+        resolution.resoudre(modele)
+        statut = statut_resolution(modele.problem)
+        benefices.append(modele.problem.objective.value() if statut in ("Optimal", "Realisable") else None)
+    return benefices
+
+def _resoudre_forme_etendue(scenario, echantillons, donnees, alpha, aversion, reglage):
+    resultats = ModeleStochastique(scenario, echantillons, donnees, alpha, aversion).resoudre(_reglage_solveur(reglage))
+    resultats.pop("echantillons")
+    return resultats
+
+def _decouper(elements, nb_parts):
+    taille = -(-len(elements) // max(1, nb_parts))
+    return [elements[i:i + taille] for i in range(0, len(elements), taille)]
+
+def resoudre_saa(scenario, nb_echantillons=200, nb_replications=4, taille_replication=20, dispersion=0.2,
+                 correlation=0.5, alpha=0.95, aversion=0.0, graine=0, donnees=None, solveur="cbc",
+                 delai=None, ecart=None, mode="exact", nb_processus=None):
+    """
+    Résout le problème à deux étapes par approximation par moyenne d'échantillons.
+    1. nb_replications formes étendues de taille_replication échantillons proposent chacune une
+       première étape ;
+    2. chaque proposition distincte est évaluée sur nb_echantillons échantillons communs, résolus
+       séparément et répartis sur nb_processus processus ;
+    3. la proposition retenue maximise (1 - aversion) * espérance + aversion * CVaR sur l'échantillon d'évaluation.
+    Args:
+        scenario (dict): Scénario de référence (coefficients centraux, prix, coûts, salaires).
+        nb_echantillons (int): Taille de l'échantillon d'évaluation.
+        nb_replications (int): Nombre de formes étendues résolues.
+        taille_replication (int): Nombre d'échantillons de chaque forme étendue.
+        dispersion, correlation (float): Loi des coefficients (voir tirer_coefficients).
+        alpha, aversion (float): Niveau et poids de la CVaR (voir ModeleStochastique).
+        graine (int): Graine des tirages.
+        donnees (DonneesUsine): Données de l'usine (usine de référence par défaut).
+        solveur (str): Nom du solveur (voir solveurs.creer_solveur).
+        delai (float): Temps maximal de chaque résolution, en secondes (None pour aucun).
+        ecart (float): Écart relatif d'optimalité accepté (None pour l'optimum exact).
+        mode (str): Mode de résolution, "exact" ou "rapide".
+        nb_processus (int): Nombre de processus (1 : tout est résolu dans le processus courant).
+    Returns:
+        dict: Statut, première étape retenue, espérance, erreur type, CVaR et quantiles du bénéfice,
+              borne supérieure et écart estimés (sans aversion au risque seulement) et évaluation
+              de chaque proposition.
+    """
+    donnees = donnees or donnees_reference()
+    nb_processus = nb_processus or os.cpu_count() or 1
+    reglage = (solveur, delai, ecart, mode)
+    replications = [tirer_coefficients(scenario, taille_replication, dispersion, correlation, graine + 1 + r, donnees)
+                    for r in range(nb_replications)]
+    evaluation = tirer_coefficients(scenario, nb_echantillons, dispersion, correlation, graine, donnees)
+
+    pool = ProcessPoolExecutor(nb_processus) if nb_processus > 1 else None
+    try:
+        if pool is None:
+            propositions = [_resoudre_forme_etendue(scenario, e, donnees, alpha, aversion, reglage) for e in replications]
+        else:
+            propositions = list(pool.map(_resoudre_forme_etendue, *zip(*[
+                (scenario, e, donnees, alpha, aversion, reglage) for e in replications])))
+        statuts = [p["statut"] for p in propositions]
+        solutions = [p for p in propositions if p["statut"] in ("Optimal", "Realisable")]
+        if not solutions:
+            return {"statut": statuts[0], "premiere_etape": None}
+
+        # Propositions distinctes, évaluées sur le même échantillon
+        candidates = []
+        for proposition in solutions:
+            if proposition["premiere_etape"] not in candidates:
+                candidates.append(proposition["premiere_etape"])
+        lots = _decouper(evaluation, 2 * nb_processus)
+        evaluations = []
+        for candidate in candidates:
+            if pool is None:
+                benefices = [b for lot in lots for b in evaluer_lot(scenario, candidate, lot, donnees, reglage)]
+            else:
+                futurs = [pool.submit(evaluer_lot, scenario, candidate, lot, donnees, reglage) for lot in lots]
+                benefices = [b for futur in futurs for b in futur.result()]
+            if any(b is None for b in benefices):
+                continue
+            evaluations.append({"premiere_etape": candidate, **resume_benefices(benefices, alpha)})
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    if not evaluations:
+        return {"statut": "Erreur", "premiere_etape": None}
+
+    def critere(e):
+        return (1 - aversion) * e["benefice_espere"] + aversion * e["cvar"]
+    meilleure = max(evaluations, key=critere)
+    # Moyenne des valeurs optimales des formes étendues : estimation d'une borne supérieure de
+    # l'espérance. La CVaR d'un petit échantillon étant biaisée, aucune borne n'est donnée avec aversion.
+    valeurs = np.array([p["objectif"] for p in solutions])
+    borne = float(valeurs.mean()) if aversion == 0 else None
+    return {
+        "statut": "Realisable" if "Realisable" in statuts or len(solutions) < len(statuts) else "Optimal",
+        **meilleure,
+        "alpha": alpha,
+        "borne_superieure": borne,
+        "erreur_type_borne": float(valeurs.std(ddof=1) / np.sqrt(len(valeurs))) if borne is not None and len(valeurs) > 1 else None,
+        "ecart_estime": None if borne is None else borne - critere(meilleure),
+        "propositions": evaluations,
+    }
+
+def main(arguments=None):
+    from .scenarios import normaliser_scenario
+    parser = argparse.ArgumentParser(prog="python -m optimisation stochastique",
+                                     description="Résolution à deux étapes sur l'incertitude de la demande (SAA)")
+    parser.add_argument("scenario", nargs="?", help="Fichier JSON du scénario (- pour l'entrée standard)")
+    parser.add_argument("--echantillons", type=int, default=200, help="Taille de l'échantillon d'évaluation")
+    parser.add_argument("--replications", type=int, default=4, help="Nombre de formes étendues résolues")
+    parser.add_argument("--taille", type=int, default=20, help="Nombre d'échantillons par forme étendue")
+    parser.add_argument("--dispersion", type=float, default=0.2, help="Écart type du logarithme des coefficients")
+    parser.add_argument("--correlation", type=float, default=0.5, help="Part de la variance commune aux produits")
+    parser.add_argument("--alpha", type=float, default=0.95, help="Niveau de la CVaR")
+    parser.add_argument("--aversion", type=float, default=0.0, help="Poids de la CVaR dans l'objectif, entre 0 et 1")
+    parser.add_argument("--graine", type=int, default=0, help="Graine des tirages")
+    parser.add_argument("-j", "--processus", type=int, default=0, help="Nombre de processus (0 : nombre de cœurs)")
+    parser.add_argument("--solveur", default="cbc", help="Solveur : cbc, highs, glpk ou nom d'un solveur PuLP installé")
+    parser.add_argument("--delai", type=float, help="Temps maximal de chaque résolution, en secondes")
+    parser.add_argument("--ecart", type=float, help="Écart relatif d'optimalité accepté par le solveur")
+    parser.add_argument("--mode", choices=MODES, default="exact", help="Résolution exacte ou rapide (relaxation arrondie)")
+    args = parser.parse_args(arguments)
+    if not 0 <= args.aversion <= 1 or not 0 < args.alpha < 1 or not 0 <= args.correlation <= 1:
+        parser.error("aversion et correlation doivent être entre 0 et 1, alpha strictement entre 0 et 1")
+    try:
+        creer_solveur(args.solveur)
+    except ValueError as erreur:
+        parser.error(str(erreur))
+
+    if args.scenario is None:
+        donnees = {}
+    elif args.scenario == "-":
+        donnees = json.load(sys.stdin)
+    else:
+        with open(args.scenario, encoding="utf-8") as f:
+            donnees = json.load(f)
+    try:
+        scenario = normaliser_scenario(donnees)
+    except ValueError as erreur:
+        parser.error(str(erreur))
+    resultats = resoudre_saa(scenario, args.echantillons, args.replications, args.taille, args.dispersion,
+                             args.correlation, args.alpha, args.aversion, args.graine, None, args.solveur,
+                             args.delai, args.ecart, args.mode, args.processus or None)
+    print(json.dumps({"id": scenario["id"], **resultats}, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()